@@ -1,23 +1,18 @@
+# first, so that MATRIX_STARTUP_TRACE=1 times every import after it
+from startup_trace import startup_trace
 import os
+import signal
 import sys
-import evdev
+import threading
 from matrix.matrix_display import MatrixDisplay
-from input_handlers.xbox_controller import Controller
-from input_handlers.keyboard import Keyboard
+from input_handlers.hotplug import HotplugInputHandler
+from input_handlers.recording import InputRecorder, ReplayInputHandler
 from applet_manager import AppletManager
 
-
-def find_xbox_controller() -> str:
-    """Find an xbox controller on the system"""
-    devices = [evdev.InputDevice(path) for path in evdev.list_devices()]
-    for device in devices:
-        if any(keyword in device.name.lower() for keyword in ["xbox", "x-box"]):
-            return device.path
-    return None
-
-
 if __name__ == "__main__":
-    if os.geteuid() != 0:
+    # MATRIX_BACKEND=headless runs everything against an in-memory matrix
+    backend = os.environ.get("MATRIX_BACKEND", "rgbmatrix")
+    if backend == "rgbmatrix" and os.geteuid() != 0:
         print("This script must be run as root!")
         sys.exit(1)
 
@@ -25,13 +20,63 @@ if __name__ == "__main__":
     current_script_directory = os.path.dirname(current_script_path)
     applets_root_directory = os.path.join(current_script_directory, "applets")
 
-    display = MatrixDisplay()
-    xbox_controller_path = find_xbox_controller()
-    input_handler = (
-        Controller(xbox_controller_path) if xbox_controller_path else Keyboard()
-    )
+    # MATRIX_COLOUR_MODE=indexed enables themes (MATRIX_THEME) and software dimming
+    colour_mode = os.environ.get("MATRIX_COLOUR_MODE", "rgb")
+    # frames are shown from a render thread unless MATRIX_RENDER_THREAD=0
+    threaded = os.environ.get("MATRIX_RENDER_THREAD", "1") != "0"
+    with startup_trace.phase("display"):
+        display = MatrixDisplay(
+            backend=backend, colour_mode=colour_mode, threaded=threaded
+        )
+        if colour_mode == "indexed":
+            display.set_theme(os.environ.get("MATRIX_THEME", "default"))
+    # MATRIX_REPLAY_INPUT=<recording> plays back recorded input (at
+    # MATRIX_REPLAY_SPEED times real time) rather than reading any devices
+    replay_path = os.environ.get("MATRIX_REPLAY_INPUT")
+    with startup_trace.phase("input"):
+        if replay_path:
+            replay_speed = float(os.environ.get("MATRIX_REPLAY_SPEED", "1"))
+            input_handler = ReplayInputHandler(replay_path, replay_speed)
+            input_handler.play()
+        else:
+            # the keyboard, plus an Xbox controller whenever one is connected
+            input_handler = HotplugInputHandler()
+    # MATRIX_RECORD_INPUT=<path> records all input, for replaying later
+    record_path = os.environ.get("MATRIX_RECORD_INPUT")
+    if record_path:
+        input_handler.recorder = InputRecorder(record_path)
+
+    # kill -USR1 <pid> prints input to photon latency of every applet so far. The
+    # handler runs on the main thread, which may be holding the tracker's lock, so
+    # the report is printed from a thread of its own
+    report_requested = threading.Event()
+
+    def print_latency_reports() -> None:
+        while True:
+            report_requested.wait()
+            report_requested.clear()
+            print(display.latency_tracker.report(), flush=True)
+
+    threading.Thread(target=print_latency_reports, daemon=True).start()
+    signal.signal(signal.SIGUSR1, lambda *_: report_requested.set())
 
-    display.show_message("Building Menu System...", "loading")
-    applet_manager = AppletManager(display, input_handler, applets_root_directory)
-    master_app = applet_manager.create_master_app()
-    applet_manager.launch_applet(master_app)
+    with startup_trace.phase("loading message"):
+        display.show_message("Building Menu System...", "loading")
+    # MATRIX_ISOLATE_APPLETS=1 runs each applet in its own process, which is
+    # restarted if it crashes or hangs
+    isolate_applets = os.environ.get("MATRIX_ISOLATE_APPLETS", "0") != "0"
+    with startup_trace.phase("applet manager"):
+        applet_manager = AppletManager(
+            display,
+            input_handler,
+            applets_root_directory,
+            isolate_applets=isolate_applets,
+        )
+    with startup_trace.phase("menu"):
+        master_app = applet_manager.create_master_app()
+    try:
+        applet_manager.launch_applet(master_app)
+    finally:
+        display.close()
+        if input_handler.recorder:
+            input_handler.recorder.close()
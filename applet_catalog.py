@@ -0,0 +1,103 @@
+"""Index of the applets in the applets directory, kept on disk between runs"""
+
+import json
+import os
+from typing import Dict
+
+CATALOG_VERSION = 1
+
+
+class AppletCatalog:
+    """Metadata of every applet, read from each applet's config.json.
+
+    Parsed configs are saved to an index file with the mtime and size of the file
+    they came from, so on startup only configs which changed are parsed again.
+    Applets with "hidden": true in their config (the menu, settings, etc.) aren't
+    listed in applets.
+    """
+
+    INDEX_FILENAME = ".catalog.json"
+
+    def __init__(self, applets_root_directory: str) -> None:
+        """Initialise the catalog, loading the applets in applets_root_directory"""
+        self.applets_root_directory = applets_root_directory
+        self.index_path = os.path.join(applets_root_directory, self.INDEX_FILENAME)
+        self.applets: Dict[str, Dict] = {}
+        self.refresh()
+
+    def _load_index(self) -> Dict[str, Dict]:
+        """directory name -> {"mtime_ns", "size", "config"} from the index file"""
+        try:
+            with open(self.index_path, "r") as file:
+                index = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if index.get("version") != CATALOG_VERSION:
+            return {}
+        return index.get("applets", {})
+
+    def _save_index(self, entries: Dict[str, Dict]) -> None:
+        """Write the index, via a temporary file so it's never half written"""
+        temp_path = self.index_path + ".tmp"
+        try:
+            with open(temp_path, "w") as file:
+                json.dump({"version": CATALOG_VERSION, "applets": entries}, file)
+            os.replace(temp_path, self.index_path)
+        except OSError as error:
+            # e.g. a read-only filesystem, everything is just parsed next time too
+            print(f"Could not save the applet catalog: {error}")
+
+    def refresh(self) -> None:
+        """Pick up applets which were added, changed or removed"""
+        cached_entries = self._load_index()
+        entries = {}
+        applets = {}
+        for directory in os.scandir(self.applets_root_directory):
+            if not directory.is_dir() or directory.name.startswith((".", "__")):
+                continue
+            config_path = os.path.join(directory.path, "config.json")
+            try:
+                config_stat = os.stat(config_path)
+            except FileNotFoundError:
+                print(f"Config file not found in {directory.path}")
+                continue
+            entry = cached_entries.get(directory.name)
+            if (
+                entry is None
+                or entry["mtime_ns"] != config_stat.st_mtime_ns
+                or entry["size"] != config_stat.st_size
+            ):
+                try:
+                    with open(config_path, "r") as file:
+                        config_data = json.load(file)
+                except json.JSONDecodeError:
+                    print(f"Error decoding JSON in {directory.path}")
+                    continue
+                entry = {
+                    "mtime_ns": config_stat.st_mtime_ns,
+                    "size": config_stat.st_size,
+                    "config": config_data,
+                }
+            entries[directory.name] = entry
+            config_data = entry["config"]
+            if config_data.get("hidden", False):
+                continue
+            name = config_data.get("name", "No Name Provided")
+            applets[name] = self._applet_information(directory.path, config_data)
+
+        if entries != cached_entries:
+            self._save_index(entries)
+        self.applets = {key: value for key, value in sorted(applets.items())}
+
+    @staticmethod
+    def _applet_information(applet_path: str, config_data: Dict) -> Dict:
+        """What the menu and the AppletManager need to know about an applet"""
+        return {
+            "description": config_data.get("description", "No Description Provided"),
+            "version": config_data.get("version", "No Version Provided"),
+            "author": config_data.get("author", "No Author Provided"),
+            "path": applet_path,
+            "options": config_data.get("options", {}),
+            "class_name": config_data.get("class_name", "No Classname Provided"),
+            "module_path": os.path.join(applet_path, "main.py"),
+        }
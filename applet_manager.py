@@ -1,66 +1,64 @@
+import gc
 import os
-import json
 import sys
+import time
+import threading
 import importlib.util
-from typing import Dict
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 from matrix.matrix_display import MatrixDisplay
 from input_handlers.base_input_handler import BaseInputHandler
 from applets.base_applet import Applet
 from applets.master_applet.main import MasterApp
+from frame_scheduler import FrameScheduler
+from applet_catalog import AppletCatalog
 
 
 class AppletManager:
+    # recently used applets are kept (imported, and constructed if cache_instances)
+    # so relaunching them is instant. The least recently used are dropped past this
+    # many, or while the process is using more memory than MAX_CACHE_RSS_BYTES
+    MAX_CACHED_APPLETS = 4
+    MAX_CACHE_RSS_BYTES = 192 * 1024 * 1024
+
     def __init__(
         self,
         display: MatrixDisplay,
         input_handler: BaseInputHandler,
         applets_root_directory: str,
+        cache_instances: bool = True,
+        isolate_applets: bool = False,
     ) -> None:
-        """Initialize the AppletManager with the provided display, input handler, and applets root directory."""
+        """Initialize the AppletManager with the provided display, input handler, and applets root directory.
+        With cache_instances, applets are reused between launches rather than only their modules.
+        With isolate_applets, applets from the catalog each run in a child process (see applet_process.py).
+        """
+        self.cache_instances = cache_instances
+        # applet name -> (module, instance or None), least recently used first
+        self.applet_cache = OrderedDict()
+        # applets can be preloaded in the background, see preload_applet
+        self.cache_lock = threading.Lock()
+        # (applet name, cancelled event, thread) of the preload in progress
+        self.preload: Optional[Tuple[str, threading.Event, threading.Thread]] = None
+        # applet name -> thread of a cancelled preload, which runs until the
+        # applet's next check. Its applet isn't built again until it has finished
+        self.cancelled_preloads: Dict[str, threading.Thread] = {}
         self.display = display
         self.input_handler = input_handler
         self.applets_root_directory = applets_root_directory
-        self.applets = self.get_applets_information()
-
-    def get_applets_information(self) -> Dict[str, Dict]:
-        """Retrieve information about applets from the config file in each applet's directory."""
-        applets = {}
-        for item in os.listdir(self.applets_root_directory):
-            full_path = os.path.join(self.applets_root_directory, item)
-            if os.path.isdir(full_path) and item not in [
-                "__pycache__",
-                "template_applet",
-                "applet_information_viewer",
-                "settings_applet",
-                "idle_applet",
-                "master_applet",
-            ]:
-                config_path = os.path.join(full_path, "config.json")
-                try:
-                    with open(config_path, "r") as file:
-                        config_data = json.load(file)
-                        name = config_data.get("name", "No Name Provided")
-                        applets[name] = {
-                            "description": config_data.get(
-                                "description", "No Description Provided"
-                            ),
-                            "version": config_data.get(
-                                "version", "No Version Provided"
-                            ),
-                            "author": config_data.get("author", "No Author Provided"),
-                            "path": full_path,
-                            "options": config_data.get("options", {}),
-                            "class_name": config_data.get(
-                                "class_name", "No Classname Provided"
-                            ),
-                            "module_path": os.path.join(full_path, "main.py"),
-                        }
-                except FileNotFoundError:
-                    print(f"Config file not found in {full_path}")
-                except json.JSONDecodeError:
-                    print(f"Error decoding JSON in {full_path}")
-        sorted_applets = {key: value for key, value in sorted(applets.items())}
-        return sorted_applets
+        # shared by everything which lists applets, e.g. the menu
+        self.catalog = AppletCatalog(applets_root_directory)
+        self.applets = self.catalog.applets
+        self.frame_scheduler = FrameScheduler(input_handler)
+        # isolated applets are never imported here, so aren't cached or preloaded
+        self.process_context = None
+        if isolate_applets:
+            # like psutil below, only imported when it's needed, to keep boot quick
+            from applet_process import create_process_context
+
+            self.process_context = create_process_context()
+        # presses are timed from the input queue through to the panel
+        self.input_handler.latency_tracker = self.display.latency_tracker
 
     def dynamic_import_applet(self, module_path: str, module_name: str) -> Applet:
         """Dynamically import a module given its file path and module name."""
@@ -76,31 +74,175 @@ class AppletManager:
             display=self.display, input_handler=self.input_handler, applet_manager=self
         )
 
+    def _build_applet(self, applet_name: str, module=None, **kwargs) -> Tuple:
+        """Construct an applet, importing its module unless given. Returns the module
+        and the applet, which is None if the module has no such class"""
+        module_path = self.applets[applet_name]["module_path"]
+        class_name = self.applets[applet_name]["class_name"]
+        options = self.applets[applet_name]["options"]
+        if module is None:
+            module = self.dynamic_import_applet(module_path, class_name)
+        if not hasattr(module, class_name):
+            return module, None
+        applet_type = getattr(module, class_name)
+        applet = applet_type(
+            display=self.display,
+            options=options,
+            input_handler=self.input_handler,
+            **kwargs,
+        )
+        return module, applet
+
+    def _cache_applet(
+        self, applet_name: str, module, applet: Applet, keep_instance: bool
+    ) -> None:
+        """(Re)insert an applet as the most recently used"""
+        with self.cache_lock:
+            self.applet_cache.pop(applet_name, None)
+            self.applet_cache[applet_name] = (
+                module,
+                applet if keep_instance else None,
+            )
+            self.evict_cached_applets()
+
+    def is_applet_ready(self, applet_name: str) -> bool:
+        """Whether the applet is already constructed, so launching it is instant"""
+        with self.cache_lock:
+            return self.applet_cache.get(applet_name, (None, None))[1] is not None
+
+    def preload_applet(self, applet_name: str) -> None:
+        """Start building an applet in the background, so selecting it doesn't have
+        to wait for its import and constructor (e.g. network requests). Cancels the
+        preload of any other applet"""
+        if self.process_context or (self.preload and self.preload[0] == applet_name):
+            return
+        self.cancel_preload()
+        if (
+            applet_name not in self.applets
+            or self.is_applet_ready(applet_name)
+            or self.is_preload_cancelling(applet_name)
+        ):
+            return
+        cancelled = threading.Event()
+        thread = threading.Thread(
+            target=self._preload, args=(applet_name, cancelled), daemon=True
+        )
+        self.preload = (applet_name, cancelled, thread)
+        thread.start()
+
+    def _preload(self, applet_name: str, cancelled: threading.Event) -> None:
+        with self.cache_lock:
+            module, _ = self.applet_cache.get(applet_name, (None, None))
+        try:
+            module, applet = self._build_applet(
+                applet_name, module, preload_cancelled=cancelled
+            )
+        except Exception as error:
+            # it'll be built (and fail properly) if it's selected
+            print(f"Preloading {applet_name} failed: {error}")
+            return
+        if applet is None or cancelled.is_set():
+            return
+        # kept until it's launched, even if instances aren't cached
+        self._cache_applet(applet_name, module, applet, keep_instance=True)
+        print(f"Preloaded {applet_name}")
+
+    def cancel_preload(self) -> None:
+        """Stop preloading (the applet stops at its next check, and is thrown away)"""
+        if self.preload:
+            applet_name, cancelled, thread = self.preload
+            cancelled.set()
+            self.cancelled_preloads[applet_name] = thread
+            self.preload = None
+
+    def is_preload_cancelling(self, applet_name: str) -> bool:
+        """Whether a cancelled preload of the applet is still running"""
+        thread = self.cancelled_preloads.get(applet_name)
+        if thread and not thread.is_alive():
+            del self.cancelled_preloads[applet_name]
+        return applet_name in self.cancelled_preloads
+
     def get_applet_instance_by_name(self, applet_name: str) -> Applet:
         """Retrieve an instance of the applet by its name, dynamically importing it if necessary."""
-        if applet_name in self.applets:
-            module_path = self.applets[applet_name]["module_path"]
-            class_name = self.applets[applet_name]["class_name"]
-            options = self.applets[applet_name]["options"]
-            AppletClass = self.dynamic_import_applet(module_path, class_name)
-            if hasattr(AppletClass, class_name):
-                applet_type = getattr(AppletClass, class_name)
-                return applet_type(
-                    display=self.display,
-                    options=options,
-                    input_handler=self.input_handler,
-                )
-        print(f"Applet {applet_name} not found!")
-        return None
+        if applet_name not in self.applets:
+            print(f"Applet {applet_name} not found!")
+            return None
+        if self.process_context:
+            from applet_process import AppletProcess
+
+            return AppletProcess(
+                applet_name,
+                self.applets[applet_name],
+                self.process_context,
+                display=self.display,
+                input_handler=self.input_handler,
+            )
+        load_start_time = time.perf_counter()
+        # most of the work of a preload of this applet has been done, wait for it
+        if self.preload and self.preload[0] == applet_name:
+            self.preload[2].join()
+            self.preload = None
+        self.cancel_preload()
+        # never two constructors of an applet at once, they'd share its resources
+        if self.is_preload_cancelling(applet_name):
+            self.cancelled_preloads.pop(applet_name).join()
+        with self.cache_lock:
+            module, applet = self.applet_cache.get(applet_name, (None, None))
+        if applet is None:
+            module, applet = self._build_applet(applet_name, module)
+            if applet is None:
+                print(f"Applet {applet_name} not found!")
+                return None
+        # launched for real now, so it can draw (e.g. errors) like normal
+        applet.preload_cancelled = None
+        self._cache_applet(applet_name, module, applet, self.cache_instances)
+        load_time_ms = (time.perf_counter() - load_start_time) * 1000
+        print(f"Loaded {applet_name} in {load_time_ms:.1f}ms")
+        return applet
+
+    def evict_cached_applets(self) -> None:
+        """Drop the least recently used applets past MAX_CACHED_APPLETS, and one more
+        (never the most recent) if the process is over MAX_CACHE_RSS_BYTES. Call
+        with cache_lock held"""
+        while len(self.applet_cache) > self.MAX_CACHED_APPLETS:
+            self._evict_least_recently_used()
+        import psutil
+
+        rss = psutil.Process().memory_info().rss
+        if rss > self.MAX_CACHE_RSS_BYTES and len(self.applet_cache) > 1:
+            print(f"Using {rss / 1024 / 1024:.0f}MiB, dropping a cached applet")
+            self._evict_least_recently_used()
+            gc.collect()
+
+    def _evict_least_recently_used(self) -> None:
+        _, (module, _) = self.applet_cache.popitem(last=False)
+        # let the module go too, unless it has been imported again since
+        if sys.modules.get(module.__name__) is module:
+            del sys.modules[module.__name__]
 
     def launch_applet(self, applet: Applet) -> None:
         """Launch the given applet, handling start and stop operations."""
+        # latency samples are kept per applet, back to the caller's once this exits
+        latency_tracker = self.display.latency_tracker
+        previous_applet_name = latency_tracker.current_applet
+        latency_tracker.current_applet = applet.name
         try:
+            # the caller's layers (e.g. the menu's page indicator) would show
+            # through, it recreates them the next time it draws
+            self.display.reset_layers()
             self.display.clear()
             applet.start()
+            # frame driven applets only do setup in start(), the scheduler does the rest
+            if applet.TARGET_FPS:
+                self.frame_scheduler.run(applet)
         except KeyboardInterrupt:
             pass
         finally:
             applet.stop()
+            # layers belong to the applet which made them
+            self.display.reset_layers()
             self.display.clear()
             self.input_handler.exit_requested = False
+            # presses meant for the applet shouldn't carry over to whatever is next
+            self.input_handler.clear_events()
+            latency_tracker.current_applet = previous_applet_name
@@ -0,0 +1,235 @@
+"""Running applets in child processes, so one which hangs or crashes can't take the wall down"""
+
+import importlib.util
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from multiprocessing import forkserver
+from multiprocessing.connection import Connection
+from multiprocessing.context import BaseContext
+from typing import Dict, Optional
+import numpy as np
+from applets.base_applet import Applet
+from matrix.matrix_display import MatrixDisplay
+from matrix.panel_config import PanelConfig
+from matrix.shared_frame import SharedFrame
+from input_handlers.pipe_input import PipeInputHandler
+from frame_scheduler import FrameScheduler
+
+# how often the applet process tells the parent how many times it has presented
+HEARTBEAT_SECONDS = 0.25
+
+
+def create_process_context() -> BaseContext:
+    """Start the fork server applet processes are forked from. It has already
+    imported the display, input and applet code, so each applet starts quickly,
+    and it has none of this process's threads or devices"""
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(["applet_process"])
+    forkserver.ensure_running()
+    return context
+
+
+class AppletProcess(Applet):
+    """Stands in for an applet running in a child process.
+
+    The child draws into a SharedFrame, and start() shows each new frame on the
+    display, forwarding input down a pipe in between - only this process touches
+    the matrix and the input devices. A child which crashes, or stops presenting
+    for too long, is killed and started again up to MAX_RESTARTS times, before
+    going back to the menu. One which doesn't exit when asked is killed.
+    """
+
+    # until its first present, as constructors often fetch data over the network
+    START_TIMEOUT_SECONDS = 30
+    HANG_TIMEOUT_SECONDS = 10
+    EXIT_TIMEOUT_SECONDS = 3
+    MAX_RESTARTS = 2
+    # frames are picked up this often, input is forwarded as soon as it arrives
+    POLL_SECONDS = 1 / 120
+
+    def __init__(
+        self, name: str, applet_information: Dict, context: BaseContext, **kwargs
+    ) -> None:
+        """Initialise the stand-in for the catalog applet with the given name,
+        processes are started from context (see create_process_context)"""
+        super().__init__(name, **kwargs)
+        self.applet_information = applet_information
+        self.context = context
+        self.process = None
+        self.connection = None
+        self.shared_frame = None
+        self.frame = np.zeros((self.display.height, self.display.width, 3), np.uint8)
+        self.frame_count = 0
+        self.controller_connected = None
+
+    def _start_process(self) -> None:
+        """Start a fresh child process running the applet"""
+        self.shared_frame = SharedFrame(
+            self.display.width, self.display.height, self.context.Lock()
+        )
+        receive_connection, self.connection = self.context.Pipe(duplex=False)
+        palette = self.display.palette
+        self.process = self.context.Process(
+            target=run_applet,
+            name=f"Applet: {self.name}",
+            args=(
+                self.applet_information,
+                self.shared_frame,
+                receive_connection,
+                self.display.colour_mode,
+                palette.theme if palette else None,
+            ),
+            daemon=True,
+        )
+        self.process.start()
+        receive_connection.close()
+        # a child which stops reading would otherwise block send() once the pipe
+        # fills up, messages to it are dropped instead
+        os.set_blocking(self.connection.fileno(), False)
+        self.frame_count = 0
+        self.controller_connected = None
+
+    def _send(self, message: tuple) -> None:
+        """Send a message to the child, if it's listening"""
+        try:
+            self.connection.send(message)
+        except OSError:
+            # full (not reading) or closed (exited), either way it's being watched
+            pass
+
+    def _stop_process(self) -> None:
+        """Make sure the child has exited, killing it if needs be, then free its
+        pipe and frame"""
+        if self.process is None:
+            return
+        self.connection.close()
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.shared_frame.close()
+        self.shared_frame.unlink()
+        self.process = None
+
+    def _supervise(self) -> Optional[str]:
+        """Forward input and show frames until the child exits. Returns what went
+        wrong if it has to be restarted, None if it's done"""
+        last_presents = 0
+        last_progress_time = time.monotonic()
+        exit_deadline = None
+        while True:
+            for event in self.input_handler.poll_events():
+                self._send(("event", event))
+                if event.button == "exit" and exit_deadline is None:
+                    exit_deadline = time.monotonic() + self.EXIT_TIMEOUT_SECONDS
+            controller_connected = self.input_handler.is_controller()
+            if controller_connected != self.controller_connected:
+                self._send(("controller", controller_connected))
+                self.controller_connected = controller_connected
+
+            frame_count = self.shared_frame.read(self.frame, self.frame_count)
+            if frame_count != self.frame_count:
+                self.frame_count = frame_count
+                self.display.draw_image(self.frame, 0, 0)
+                self.display.present()
+
+            now = time.monotonic()
+            if not self.process.is_alive():
+                exit_code = self.process.exitcode
+                if exit_code == 0 or exit_deadline is not None:
+                    return None
+                return f"crashed (exit code {exit_code})"
+            if exit_deadline is not None and now > exit_deadline:
+                self.log("Didn't exit when asked, killing it")
+                return None
+            presents = self.shared_frame.presents
+            if presents != last_presents:
+                last_presents = presents
+                last_progress_time = now
+            timeout = (
+                self.HANG_TIMEOUT_SECONDS if presents else self.START_TIMEOUT_SECONDS
+            )
+            if now - last_progress_time > timeout:
+                return f"stopped responding for {timeout}s"
+            self.input_handler.wait_for_input(self.POLL_SECONDS)
+
+    def start(self) -> None:
+        """Run the applet in a child process until it exits, restarting it if it
+        crashes or hangs"""
+        self.log("Starting in a child process")
+        restarts = 0
+        self._start_process()
+        while True:
+            problem = self._supervise()
+            self._stop_process()
+            if problem is None:
+                return
+            self.log(f"Applet process {problem}")
+            if restarts == self.MAX_RESTARTS:
+                self.display.show_message(f"{self.name} stopped working", "error")
+                time.sleep(2)
+                return
+            restarts += 1
+            self.display.show_message(f"Restarting {self.name}...", "loading")
+            self._start_process()
+
+    def stop(self) -> None:
+        """Make sure the child process has gone"""
+        self.log("Stopping")
+        self._stop_process()
+
+
+def _report_presents(display: MatrixDisplay, shared_frame: SharedFrame) -> None:
+    """Keep the parent up to date with how many times the applet has presented,
+    identical frames included, so it can tell a still frame from a hung applet"""
+    while True:
+        shared_frame.presents = display.frames_presented + display.frames_skipped
+        time.sleep(HEARTBEAT_SECONDS)
+
+
+def run_applet(
+    applet_information: Dict,
+    shared_frame: SharedFrame,
+    connection: Connection,
+    colour_mode: str,
+    theme: Optional[Dict],
+) -> None:
+    """Entry point of applet processes: build the applet and run it until it exits"""
+    # Ctrl+C reaches the whole process group, the parent decides what happens
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    display = MatrixDisplay(
+        backend="shared_memory",
+        colour_mode=colour_mode,
+        panel_config=PanelConfig(rows=shared_frame.height, cols=shared_frame.width),
+        shared_frame=shared_frame,
+    )
+    if theme:
+        display.palette.set_theme(theme)
+    input_handler = PipeInputHandler(connection)
+    threading.Thread(target=input_handler.listen, daemon=True).start()
+    threading.Thread(
+        target=_report_presents, args=(display, shared_frame), daemon=True
+    ).start()
+
+    class_name = applet_information["class_name"]
+    spec = importlib.util.spec_from_file_location(
+        class_name, applet_information["module_path"]
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    applet = getattr(module, class_name)(
+        display=display,
+        options=applet_information["options"],
+        input_handler=input_handler,
+    )
+    try:
+        applet.start()
+        if applet.TARGET_FPS:
+            FrameScheduler(input_handler).run(applet)
+    finally:
+        applet.stop()
@@ -9,11 +9,17 @@ from matrix.colours import Colours
 class AppletInformationViewer(Applet):
     """Template Applet Definition"""
 
+    # fast enough for long values (e.g. descriptions) to scroll smoothly
+    TARGET_FPS = 30
+
     def __init__(self, **kwargs) -> None:
         """Initialisation function"""
         super().__init__("Applet Information Viewer", **kwargs)
         self.applet_config = kwargs.get("applet_config", {})
         self.current_index = 0
+        self.shown_index = 0
+        self.keys = []
+        self.values = []
         self.last_switch_time = time.time() - 5
         self.keys_to_show = ["name", "description", "version", "author"]
 
@@ -23,30 +29,31 @@ class AppletInformationViewer(Applet):
         self.display.clear()
 
         # Filter the keys and values based on keys_to_show
-        keys = [key for key in self.keys_to_show if key in self.applet_config]
-        values = [self.applet_config[key] for key in keys]
-
-        while not self.input_handler.exit_requested:
-            current_time = time.time()
-            latest_inputs = self.input_handler.get_latest_inputs()
-            if current_time - self.last_switch_time >= 5 or latest_inputs.get(
-                "select_pressed"
-            ):
-                self.display.clear()
-                current_key = keys[self.current_index % len(keys)]
-                current_value = values[self.current_index % len(values)]
-                # Draw Title
-                self.display.draw_centered_text(
-                    current_key.title(), Colours.RED, start_y=7
-                )
-
-                # Draw Value
-                self.display.draw_centered_text(current_value, Colours.WHITE_MUTED)
-                self.display.offscreen_canvas = self.display.matrix.SwapOnVSync(
-                    self.display.offscreen_canvas
-                )
-                self.current_index += 1
-                self.last_switch_time = current_time
+        self.keys = [key for key in self.keys_to_show if key in self.applet_config]
+        self.values = [self.applet_config[key] for key in self.keys]
+
+    def update(self, dt: float) -> None:
+        """Move onto the next key every 5 seconds, or when select is pressed"""
+        current_time = time.time()
+        latest_inputs = self.input_handler.get_latest_inputs()
+        if current_time - self.last_switch_time >= 5 or latest_inputs.get(
+            "select_pressed"
+        ):
+            self.shown_index = self.current_index
+            self.current_index += 1
+            self.last_switch_time = current_time
+
+    def render(self) -> None:
+        """Draw the current key and value"""
+        self.display.clear()
+        current_key = self.keys[self.shown_index % len(self.keys)]
+        current_value = self.values[self.shown_index % len(self.values)]
+        # Draw Title
+        self.display.draw_centered_text(current_key.title(), Colours.RED, start_y=7)
+
+        # Draw Value, scrolling if it's too long to fit
+        self.display.draw_centered_marquee(current_value, Colours.WHITE_MUTED)
+        self.display.present()
 
     def stop(self) -> None:
         """Stop the applet"""
@@ -1,12 +1,20 @@
 """Base applet definition"""
 
 import os
+import time
 import inspect
+import threading
+from typing import Optional
 
 
 class Applet:
     """Base applet from which all others will inherit"""
 
+    # Applets which set a target FPS are driven by the FrameScheduler: start() does
+    # any setup and returns, then update()/render() are called once per frame.
+    # Applets which leave it at 0 run their own loop inside start().
+    TARGET_FPS = 0
+
     def __init__(self, name: str, **kwargs) -> None:
         self.name = name
         self.display = kwargs.get("display", None)
@@ -16,6 +24,31 @@ class Applet:
             os.path.dirname(inspect.getouterframes(inspect.currentframe())[1].filename),
             "resources",
         )
+        # given when the menu builds the applet in the background ahead of it being
+        # selected, and set if the user moves on before it's needed. Until the
+        # applet is launched it must not draw, sleep or exit
+        self.preload_cancelled: Optional[threading.Event] = kwargs.get(
+            "preload_cancelled"
+        )
+
+    @property
+    def preloading(self) -> bool:
+        """Whether the applet is being built in the background, not launched yet"""
+        return self.preload_cancelled is not None
+
+    def preload_was_cancelled(self) -> bool:
+        """Whether background work can stop, e.g. between network requests"""
+        return self.preloading and self.preload_cancelled.is_set()
+
+    def show_network_error(self) -> None:
+        """Tell the user the network is down and exit. While preloading nothing is
+        shown, the applet should fetch again from start() and report it then"""
+        if self.preloading:
+            self.log("Network error while preloading, leaving it until start")
+            return
+        self.display.show_message("Network error. Check your connection", "error")
+        time.sleep(2)
+        self.input_handler.exit_requested = True
 
     def log(self, message: str) -> None:
         """Display an identifiable logging message"""
@@ -27,6 +60,15 @@ class Applet:
             "This method should not be implemented directly - implement within subclass"
         )
 
+    def update(self, dt: float) -> None:
+        """Advance the applet state by dt seconds (frame driven applets only)"""
+
+    def render(self) -> None:
+        """Draw and present a frame (frame driven applets only)"""
+        raise NotImplementedError(
+            "This method should not be implemented directly - implement within subclass"
+        )
+
     def stop(self) -> None:
         """Stop the applet"""
         raise NotImplementedError(
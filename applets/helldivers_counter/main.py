@@ -3,6 +3,7 @@
 import time
 import os
 import requests
+import numpy as np
 from typing import Tuple, Optional
 from PIL import Image
 from matrix.matrix_display import graphics
@@ -13,15 +14,19 @@ from applets.base_applet import Applet
 class HelldiversKillCounter(Applet):
     """Helldivers Kill Counter Definition"""
 
+    # the screen only changes every few seconds, this keeps select responsive
+    TARGET_FPS = 10
+
     def __init__(self, *args, **kwargs) -> None:
         """Initialisation function"""
         super().__init__("Helldivers Kill Counter", *args, **kwargs)
-        self.image_bugs = self.load_and_convert_image("bugs.png")
-        self.image_bots = self.load_and_convert_image("bots.png")
+        # convert (and cache) the images up front rather than on the first draw
+        self.get_image("bugs.png")
+        self.get_image("bots.png")
         # intialise variables
         self.bugs, self.bots = self.fetch_data()
         # start displaying terminid kill count
-        self.current_image = self.image_bugs
+        self.current_image_name = "bugs.png"
         # add a -5 to hit the first conditinal in update_display()
         self.last_switch_time = time.time() - 5
         self.last_fetch_time = time.time()
@@ -77,6 +82,14 @@ class HelldiversKillCounter(Applet):
                 raise
         return image
 
+    def get_image(self, image_name: str) -> np.ndarray:
+        """Get an image, ready to blit, from the display's shared image cache"""
+        return self.display.image_cache.get(
+            os.path.join(self.resources_directory, image_name),
+            (32, 32),
+            loader=lambda: self.load_and_convert_image(image_name),
+        )
+
     def fetch_data(self) -> Tuple[Optional[str], Optional[str]]:
         """Fetch bug and bot kill data from API"""
         root = "https://api.helldivers2.dev"
@@ -90,27 +103,23 @@ class HelldiversKillCounter(Applet):
             )
             return bugs, bots
         except requests.exceptions.RequestException:
-            self.display.show_message("Network error. Check your connection", "error")
-            time.sleep(2)
-            self.input_handler.exit_requested = True
+            self.show_network_error()
             return None, None
 
-    def update_display(self, image: Image, text: str) -> None:
+    def update_display(self, image_name: str, text: str) -> None:
         """Update the matrix display"""
         self.display.clear()
         # Halfway accross the X axis, 1/4 down from the top on Y axis
-        x_offset = (self.display.matrix.width - 32) // 2
-        y_offset = (self.display.matrix.height - 32) // 4
-        self.display.offscreen_canvas.SetImage(image.convert("RGB"), x_offset, y_offset)
+        x_offset = (self.display.width - 32) // 2
+        y_offset = (self.display.height - 32) // 4
+        self.display.draw_image(self.get_image(image_name), x_offset, y_offset)
 
         # 75% down from the top (make room for image)
-        offset_y = (self.display.matrix.height // 4) * 3
+        offset_y = (self.display.height // 4) * 3
 
         self.display.draw_centered_text(text, Colours.WHITE_NORMAL, start_y=offset_y)
 
-        self.display.offscreen_canvas = self.display.matrix.SwapOnVSync(
-            self.display.offscreen_canvas
-        )
+        self.display.present()
 
     def start(self) -> None:
         """Start the applet"""
@@ -119,27 +128,26 @@ class HelldiversKillCounter(Applet):
         # to prevent this, I have added a presence check on self.bots / self.bugs
         if not self.bots or not self.bugs:
             self.bugs, self.bots = self.fetch_data()
-        while not self.input_handler.exit_requested:
-            current_time = time.time()
-            latest_inputs = self.input_handler.get_latest_inputs()
-            if current_time - self.last_fetch_time >= 10:
-                self.bugs, self.bots = self.fetch_data()
-                self.last_fetch_time = current_time
-
-            if (
-                current_time - self.last_switch_time >= 5
-                or latest_inputs["select_pressed"]
-            ):
-                self.current_image = (
-                    self.image_bots
-                    if self.current_image == self.image_bugs
-                    else self.image_bugs
-                )
-                current_text = (
-                    self.bugs if self.current_image == self.image_bugs else self.bots
-                )
-                self.update_display(self.current_image, current_text)
-                self.last_switch_time = current_time
+
+    def update(self, dt: float) -> None:
+        """Refetch the counts every 10 seconds, and switch between bugs and bots
+        every 5 seconds or when select is pressed"""
+        current_time = time.time()
+        latest_inputs = self.input_handler.get_latest_inputs()
+        if current_time - self.last_fetch_time >= 10:
+            self.bugs, self.bots = self.fetch_data()
+            self.last_fetch_time = current_time
+
+        if current_time - self.last_switch_time >= 5 or latest_inputs["select_pressed"]:
+            self.current_image_name = (
+                "bots.png" if self.current_image_name == "bugs.png" else "bugs.png"
+            )
+            self.last_switch_time = current_time
+
+    def render(self) -> None:
+        """Draw the current count, identical frames are skipped by present()"""
+        current_text = self.bugs if self.current_image_name == "bugs.png" else self.bots
+        self.update_display(self.current_image_name, current_text)
 
     def stop(self) -> None:
         """Stop the applet"""
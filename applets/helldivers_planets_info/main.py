@@ -8,12 +8,16 @@ from applets.helldivers_planets_info.planet import Planet
 class HelldiversPlanetsInfo(Applet):
     """Hell divers 2 planets info applet Definition"""
 
+    # fast enough for long planet names to scroll smoothly
+    TARGET_FPS = 30
+
     def __init__(self, **kwargs) -> None:
         """Initialisation function"""
         super().__init__("Template Applet", **kwargs)
         self.last_switch_time = time.time() - 5
         self.last_fetch_time = time.time()
         self.current_planet_index = 0
+        self.shown_planet = None
         self.planets = self.get_occupied_and_started_planets()
 
     def get_occupied_and_started_planets(self) -> List[Planet]:
@@ -30,19 +34,14 @@ class HelldiversPlanetsInfo(Applet):
             planets = [Planet.from_json(planet) for planet in planets]
             return planets
         except requests.exceptions.RequestException:
-            self.display.show_message("Network error. Check your connection", "error")
-            time.sleep(2)
-            self.input_handler.exit_requested = True
+            self.show_network_error()
             return None
 
     def display_planet(self, planet: Planet) -> None:
         """Update matrix display with planet information"""
-        self.log(
-            f"Updating display to show information of planet with name {planet.name}"
-        )
         self.display.clear()
-        # Draw the planet's name
-        self.display.draw_centered_text(planet.name, planet.colour, start_y=8)
+        # Draw the planet's name, scrolling if it's too long
+        self.display.draw_centered_marquee(planet.name, planet.colour, start_y=8)
 
         # Draw a progress bar
         self.display.draw_progress_bar(
@@ -62,9 +61,7 @@ class HelldiversPlanetsInfo(Applet):
             f"{planet.player_count} Active Helldivers", planet.colour, start_y=40
         )
 
-        self.display.offscreen_canvas = self.display.matrix.SwapOnVSync(
-            self.display.offscreen_canvas
-        )
+        self.display.present()
 
     def start(self) -> None:
         """Start the applet"""
@@ -74,22 +71,35 @@ class HelldiversPlanetsInfo(Applet):
         # to prevent this, I have added a presence check on self.planets
         if not self.planets:
             self.planets = self.get_occupied_and_started_planets()
-        while not self.input_handler.exit_requested:
-            current_time = time.time()
-            latest_inputs = self.input_handler.get_latest_inputs()
-            # Every 10 seconds refresh the data
-            if current_time - self.last_fetch_time >= 20:
-                self.planets = self.get_occupied_and_started_planets()
-                self.last_fetch_time = current_time
-            if (
-                current_time - self.last_switch_time >= 5
-                or latest_inputs["select_pressed"]
-            ):
-                self.display_planet(self.planets[self.current_planet_index])
-                self.current_planet_index = (self.current_planet_index + 1) % len(
-                    self.planets
-                )
-                self.last_switch_time = current_time
+
+    def update(self, dt: float) -> None:
+        """Refresh the data every so often and move onto the next planet every 5
+        seconds, or when select is pressed"""
+        current_time = time.time()
+        latest_inputs = self.input_handler.get_latest_inputs()
+        # Every 10 seconds refresh the data
+        if current_time - self.last_fetch_time >= 20:
+            self.planets = self.get_occupied_and_started_planets()
+            self.last_fetch_time = current_time
+        if not self.planets:
+            return
+        if current_time - self.last_switch_time >= 5 or latest_inputs["select_pressed"]:
+            self.shown_planet = self.planets[
+                self.current_planet_index % len(self.planets)
+            ]
+            self.log(
+                "Updating display to show information of planet with name "
+                f"{self.shown_planet.name}"
+            )
+            self.current_planet_index = (self.current_planet_index + 1) % len(
+                self.planets
+            )
+            self.last_switch_time = current_time
+
+    def render(self) -> None:
+        """Draw the planet currently being shown"""
+        if self.shown_planet:
+            self.display_planet(self.shown_planet)
 
     def stop(self) -> None:
         """Stop the applet"""
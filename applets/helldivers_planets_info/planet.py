@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from typing import Dict, Any
-from rgbmatrix import graphics
+from matrix.matrix_display import graphics
 from matrix.colours import Colours
 
 
@@ -1,27 +1,56 @@
+import os
 import time
 import psutil
 from matrix.matrix_display import MatrixDisplay
 from matrix.colours import Colours
+from matrix.animation import AnimationPlaylist
 from applets.base_applet import Applet
 
 
 class IdleApplet(Applet):
+    # quick enough for most GIFs, the clock itself only changes once a second
+    TARGET_FPS = 20
+
     def __init__(self, display: MatrixDisplay, **kwargs) -> None:
         super().__init__("IdleApplet", **kwargs)
         self.display = display
+        self.SECONDS_PER_ANIMATION = 30
+        # backgrounds are dimmed so the clock stays readable over them
+        self.ANIMATION_BRIGHTNESS = 0.4
+        # any GIFs in resources/animations are played behind the clock, they are
+        # decoded into resources/animations/.decoded the first time they're shown
+        animations_directory = os.path.join(self.resources_directory, "animations")
+        animation_paths = []
+        if os.path.isdir(animations_directory):
+            animation_paths = sorted(
+                os.path.join(animations_directory, file_name)
+                for file_name in os.listdir(animations_directory)
+                if file_name.lower().endswith(".gif")
+            )
+        self.animations = AnimationPlaylist(
+            animation_paths,
+            os.path.join(animations_directory, ".decoded"),
+            self.display.width,
+            self.display.height,
+            seconds_per_animation=self.SECONDS_PER_ANIMATION,
+            brightness=self.ANIMATION_BRIGHTNESS,
+        )
+        self.start_time = time.monotonic()
+        self.uptime_seconds = 0.0
 
     def draw_digital_clock(self):
         # Get the current time
         current_time = time.localtime()
         h, m, s = current_time.tm_hour, current_time.tm_min, current_time.tm_sec
-        self.display.clear()
         time_string = f"{h:02}:{m:02}:{s:02}"
 
         self.display.draw_centered_text(time_string, Colours.WHITE_MUTED, start_y=16)
-        # Swap the offscreen canvas to display the drawn clock
-        self.display.offscreen_canvas = self.display.matrix.SwapOnVSync(
-            self.display.offscreen_canvas
-        )
+
+    def draw_background(self) -> None:
+        """Draw the current frame of the background animation, if there is one"""
+        frame = self.animations.frame_at(time.monotonic() - self.start_time)
+        if frame is not None:
+            self.display.draw_image(frame, 0, 0)
 
     def start(self) -> None:
         self.log("Starting IdleApplet")
@@ -29,23 +58,28 @@ class IdleApplet(Applet):
         # More resource-friendly to call psutil.boot_time() once and increment rather than
         # calling the method every second.
         self.uptime_seconds = time.time() - psutil.boot_time()
-        while not self.input_handler.exit_requested:
-            latest_inputs = self.input_handler.get_latest_inputs()
-            if any(latest_inputs.values()):
-                self.input_handler.exit_requested = True
-            # draw a clock
-            self.draw_digital_clock()
-            # draw the system uptime
-            self.display.draw_centered_text(
-                f"System Uptime: {self.uptime_seconds:.0f}s", Colours.WHITE_MUTED
-            )
+        self.start_time = time.monotonic()
 
-            self.display.offscreen_canvas = self.display.matrix.SwapOnVSync(
-                self.display.offscreen_canvas
-            )
-            self.uptime_seconds += 1
-            time.sleep(1)
+    def update(self, dt: float) -> None:
+        """Exit on any input, otherwise just keep count of the uptime"""
+        latest_inputs = self.input_handler.get_latest_inputs()
+        if any(latest_inputs.values()):
+            self.input_handler.exit_requested = True
+        self.uptime_seconds += dt
+
+    def render(self) -> None:
+        """Draw the background animation with the clock and uptime over it"""
+        self.display.clear()
+        self.draw_background()
+        # draw a clock
+        self.draw_digital_clock()
+        # draw the system uptime
+        self.display.draw_centered_text(
+            f"System Uptime: {self.uptime_seconds:.0f}s", Colours.WHITE_MUTED
+        )
+        self.display.present()
 
     def stop(self) -> None:
         self.log("Stopping IdleApplet")
+        self.animations.close()
         self.display.clear()
@@ -1,15 +1,25 @@
 import urllib.request
 import time
 import threading
-from rgbmatrix import graphics
+from matrix.matrix_display import graphics
 from matrix.colours import Colours
 from applets.base_applet import Applet
 import signal
 
+# red - 0, green - 50, green - 50+, one colour per whole Mb/s made up front
+SPEED_COLOURS = [
+    graphics.Color(int((50 - speed) * 2.55), int(speed * 2.55), 0)
+    for speed in range(51)
+]
+FAST_SPEED_COLOUR = graphics.Color(0, 255, 0)
+
 
 class SpeedCheck(Applet):
     """SpeedCheck applet definition"""
 
+    # the speed is only measured every update_interval, redraw a bit faster
+    TARGET_FPS = 10
+
     def __init__(self, *args, **kwargs) -> None:
         """Initialisation function"""
         super().__init__("Internet Speed", *args, **kwargs)
@@ -53,12 +63,26 @@ class SpeedCheck(Applet):
     @staticmethod
     def get_speed_color(speed: float) -> graphics.Color:
         """Calculate color based on download speed"""
-        # red - 0, green - 50, green - 50+
         if speed > 50:
-            return graphics.Color(0, 255, 0)
-        red = int((50 - speed) * 2.55)
-        green = int(speed * 2.55)
-        return graphics.Color(red, green, 0)
+            return FAST_SPEED_COLOUR
+        return SPEED_COLOURS[max(0, int(speed))]
+
+    def display_speed(self) -> None:
+        """Draw the current download speed"""
+        # Calculate speed in megabits per second
+        speed_mbps = (self.download_speed / (1024 * 1024)) * 8
+        text = f"{speed_mbps:.2f} Mb/s"
+        self.display.clear()
+        # Calculate colour based on speed
+        colour = self.get_speed_color(speed_mbps)
+        text_width = self.display.get_text_width(text)
+
+        text_x = (self.display.width - text_width) // 2
+        text_y = self.display.height // 2
+
+        self.display.draw_text(text_x, text_y, text, colour)
+
+        self.display.present()
 
     def start(self) -> None:
         """Start the applet"""
@@ -77,23 +101,9 @@ class SpeedCheck(Applet):
 
         self.display.clear()
 
-        while self.test_running and not self.input_handler.exit_requested:
-            # Calculate speed in megabits per second
-            speed_mbps = (self.download_speed / (1024 * 1024)) * 8
-            text = f"{speed_mbps:.2f} Mb/s"
-            self.display.clear()
-            # Calculate colour based on speed
-            colour = self.get_speed_color(speed_mbps)
-            text_width = self.display.get_text_width(text)
-
-            text_x = (self.display.matrix.width - text_width) // 2
-            text_y = self.display.matrix.height // 2
-
-            self.display.draw_text(text_x, text_y, text, colour)
-
-            self.display.offscreen_canvas = self.display.matrix.SwapOnVSync(
-                self.display.offscreen_canvas
-            )
+    def render(self) -> None:
+        """Draw the latest measured speed"""
+        self.display_speed()
 
     def stop(self) -> None:
         """Stop the applet"""
@@ -1,13 +1,15 @@
 import time
-from textwrap import wrap
-from typing import List
+from typing import TYPE_CHECKING, Dict
 from applets.base_applet import Applet
 from matrix.matrix_display import MatrixDisplay
 from matrix.colours import Colours
 from input_handlers.base_input_handler import BaseInputHandler
-from applets.applet_information_viewer.main import AppletInformationViewer
-from applets.settings_applet.main import SettingsApplet
-from applets.idle_applet.main import IdleApplet
+from startup_trace import startup_trace
+
+# the applets the menu opens itself are imported when first opened, not at boot
+if TYPE_CHECKING:
+    from applets.applet_information_viewer.main import AppletInformationViewer
+    from applets.settings_applet.main import SettingsApplet
 
 
 class MasterApp(Applet):
@@ -17,9 +19,17 @@ class MasterApp(Applet):
         self.applet_manager = kwargs.get("applet_manager")
         self.MAX_ITEMS_PER_PAGE = 2
         self.IDLE_SCREEN_THRESHOLD_SECONDS = 300
-        self.applets = self.applet_manager.get_applets_information()
+        # the menu is redrawn this often (for scrolling titles), or on input
+        self.FRAME_SECONDS = 1 / 30
+        # the highlighted applet is built in the background once the cursor has
+        # rested on it this long, so scrolling past applets doesn't load them all
+        self.PRELOAD_DWELL_SECONDS = 0.75
+        self.highlighted_index = None
+        self.highlighted_since = 0.0
+        self.applets = self.applet_manager.applets
         self.current_index = 0
         self.page_index = 0
+        self.drawn_page_index = None
         self.last_input_time = time.time()
 
     @staticmethod
@@ -32,15 +42,19 @@ class MasterApp(Applet):
         """Display an identifiable error message."""
         print(f"[ERROR] [Menu] '{message}'")
 
-    @staticmethod
-    def wrap_menu_items_text(text: str, width: int) -> List[str]:
-        """Wrap text to a specified width and add a marker at the start of the first line."""
-        wrapped_lines = wrap(text, width)
-        if wrapped_lines:
-            wrapped_lines[0] = f"* {wrapped_lines[0]}"
-            for i in range(1, len(wrapped_lines)):
-                wrapped_lines[i] = f"  {wrapped_lines[i]}"
-        return wrapped_lines
+    def draw_menu_item(self, text: str, y: int, selected: bool) -> None:
+        """Draw a menu item on one line with a marker at the start. Titles too long
+        to fit scroll while they are selected, otherwise they are cut off"""
+        color = Colours.RED if selected else Colours.WHITE_MUTED
+        marker = "* "
+        self.display.draw_text(1, y, marker, color)
+        self.display.draw_marquee(
+            1 + self.display.get_text_width(marker),
+            y,
+            text,
+            color,
+            speed=None if selected else 0,
+        )
 
     def display_menu(self) -> None:
         """Display the menu system on the RGB Matrix."""
@@ -52,31 +66,37 @@ class MasterApp(Applet):
 
         for i, applet in enumerate(current_page_applets):
             i += start_index
-            color = Colours.RED if i == self.current_index else Colours.WHITE_MUTED
-            wrapped_text = self.wrap_menu_items_text(
-                applet, self.display.max_chars_per_line - 2
-            )
-            for line in wrapped_text:
-                self.display.draw_text(1, y_offset, line, color)
-                y_offset += 10
-            y_offset += 5
-
+            self.draw_menu_item(applet, y_offset, i == self.current_index)
+            y_offset += 15
+
+        # the page indicator only changes with the page, so it sits on its own
+        # static layer which is redrawn when the page changes
+        indicator_layer = self.display.create_layer("page_indicator", static=True)
+        if self.page_index != self.drawn_page_index:
+            indicator_layer.mark_dirty()
+        if indicator_layer.dirty:
+            with self.display.drawing_on(indicator_layer):
+                indicator_layer.clear()
+                self.draw_page_indicator()
+            self.drawn_page_index = self.page_index
+
+        self.display.present()
+
+    def draw_page_indicator(self) -> None:
+        """Draw the current page number out of the total at the bottom"""
         total_pages = (
             len(self.applets) + self.MAX_ITEMS_PER_PAGE - 1
         ) // self.MAX_ITEMS_PER_PAGE
         page_indicator_text = f"[{self.page_index + 1}/{total_pages}]"
         indicator_color = Colours.WHITE_MUTED
         text_length = self.display.get_text_width(page_indicator_text)
-        text_x = (self.display.matrix.width - text_length) // 2
-        text_y = self.display.matrix.height - 4
+        text_x = (self.display.width - text_length) // 2
+        text_y = self.display.height - 4
         self.display.draw_text(text_x, text_y, page_indicator_text, indicator_color)
 
-        self.display.offscreen_canvas = self.display.matrix.SwapOnVSync(
-            self.display.offscreen_canvas
-        )
-
-    def navigate_menu(self) -> None:
-        """Change the current index, representing menu navigation."""
+    def navigate_menu(self) -> Dict[str, bool]:
+        """Change the current index, representing menu navigation. Returns the
+        buttons pressed since the last call, for the caller to act on the rest"""
         latest_inputs = self.input_handler.get_latest_inputs()
         if any(latest_inputs.values()):
             self.last_input_time = time.time()
@@ -93,9 +113,24 @@ class MasterApp(Applet):
                 self.page_index += 1
                 self.current_index = self.page_index * self.MAX_ITEMS_PER_PAGE
         self.page_index = self.current_index // self.MAX_ITEMS_PER_PAGE
-
-    def create_applet_info_applet(self) -> AppletInformationViewer:
+        return latest_inputs
+
+    def preload_highlighted_applet(self) -> None:
+        """Preload the highlighted applet once the cursor has rested on it, and stop
+        preloading it as soon as the cursor moves on"""
+        now = time.monotonic()
+        if self.current_index != self.highlighted_index:
+            self.highlighted_index = self.current_index
+            self.highlighted_since = now
+            self.applet_manager.cancel_preload()
+        elif now - self.highlighted_since >= self.PRELOAD_DWELL_SECONDS:
+            applet_name = list(self.applets.keys())[self.current_index]
+            self.applet_manager.preload_applet(applet_name)
+
+    def create_applet_info_applet(self) -> "AppletInformationViewer":
         """Open the view applet with the selected applet information."""
+        from applets.applet_information_viewer.main import AppletInformationViewer
+
         selected_applet_name = list(self.applets.keys())[self.current_index]
         selected_applet_config_json = self.applets[selected_applet_name]
         selected_applet_config_json["name"] = selected_applet_name
@@ -105,47 +140,53 @@ class MasterApp(Applet):
             applet_config=selected_applet_config_json,
         )
 
-    def create_settings_applet(self) -> SettingsApplet:
+    def create_settings_applet(self) -> "SettingsApplet":
         """Open the settings applet."""
+        from applets.settings_applet.main import SettingsApplet
+
         return SettingsApplet(display=self.display, input_handler=self.input_handler)
 
     def launch_applet(self, applet: Applet) -> None:
         """Launch the given applet, handling start and stop operations."""
-        try:
-            self.display.clear()
-            applet.start()
-        except KeyboardInterrupt:
-            pass
-        finally:
-            applet.stop()
-            self.display.clear()
-            self.input_handler.exit_requested = False
-            self.last_input_time = time.time()
+        self.log(f"Text cache stats: {self.display.text_cache.stats()}")
+        self.log(f"Frame stats: {self.display.frame_stats()}")
+        self.applet_manager.launch_applet(applet)
+        self.last_input_time = time.time()
 
     def create_selected_applet(self) -> Applet:
         """Select and instantiate the applet based on the current index."""
         applet_name = list(self.applets.keys())[self.current_index]
-        self.display.show_message(f"Loading {applet_name}...", "loading")
+        if not self.applet_manager.is_applet_ready(applet_name):
+            self.display.show_message(f"Loading {applet_name}...", "loading")
         return self.applet_manager.get_applet_instance_by_name(applet_name)
 
     def start(self) -> None:
         """Run the master application, handling menu display and navigation."""
+        self.display_menu()
+        startup_trace.first_frame()
         while True:
             self.display_menu()
-            self.navigate_menu()
-            if self.input_handler.select_pressed:
+            latest_inputs = self.navigate_menu()
+            self.preload_highlighted_applet()
+            # presses since the last check, so quick taps (released before now)
+            # count, and buttons still held after an applet exits don't
+            if latest_inputs["select_pressed"]:
                 self.launch_applet(self.create_selected_applet())
-            if self.input_handler.x_pressed:
+            elif latest_inputs["x_pressed"]:
                 self.launch_applet(self.create_applet_info_applet())
-            if self.input_handler.y_pressed:
+            elif latest_inputs["y_pressed"]:
                 self.launch_applet(self.create_settings_applet())
 
             if time.time() - self.last_input_time > self.IDLE_SCREEN_THRESHOLD_SECONDS:
+                from applets.idle_applet.main import IdleApplet
+
                 idle_applet = IdleApplet(
                     display=self.display, input_handler=self.input_handler
                 )
                 self.launch_applet(idle_applet)
 
+            self.input_handler.wait_for_input(self.FRAME_SECONDS)
+
     def stop(self) -> None:
         """Stop the applet and clear the display."""
         self.log("Stopping")
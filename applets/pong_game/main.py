@@ -1,7 +1,7 @@
 import random
 import time
 import threading
-from rgbmatrix import graphics
+from matrix.matrix_display import graphics
 from matrix.colours import Colours
 from applets.base_applet import Applet
 
@@ -9,11 +9,14 @@ from applets.base_applet import Applet
 class PongGame(Applet):
     """PongGame applet definition"""
 
+    # speeds below are in pixels per 1/TARGET_FPS seconds
+    TARGET_FPS = 40
+
     def __init__(self, *args, **kwargs) -> None:
         """Initialization function"""
         super().__init__("Pong Game", *args, **kwargs)
-        self.width = self.display.matrix.width
-        self.height = self.display.matrix.height
+        self.width = self.display.width
+        self.height = self.display.height
         self.paddle_height = 10
         self.paddle_thickness = 2
         self.ball_size = 2
@@ -35,12 +38,12 @@ class PongGame(Applet):
         self.player1_pos = self.height // 2 - self.paddle_height // 2
         self.player2_pos = self.height // 2 - self.paddle_height // 2
 
-    def move_ball(self) -> None:
+    def move_ball(self, steps: float = 1.0) -> None:
         """Move the ball and handle collisions"""
         with self.lock:
             # Move the ball
-            self.ball_pos[0] += self.ball_dir[0]
-            self.ball_pos[1] += self.ball_dir[1]
+            self.ball_pos[0] += self.ball_dir[0] * steps
+            self.ball_pos[1] += self.ball_dir[1] * steps
 
             # Ball collision with top and bottom walls
             if (
@@ -72,91 +75,65 @@ class PongGame(Applet):
                     self.score[0] += 1
                     self.reset_game()
 
-    def move_paddles(self) -> None:
+    def move_paddles(self, steps: float = 1.0) -> None:
         """Move the paddles based on AI and player input"""
         with self.lock:
             # Move paddle1 (player) based on D-pad input
             if self.input_handler.up_pressed:
-                self.player1_pos = max(1, self.player1_pos - self.player_speed)
+                self.player1_pos = max(1, self.player1_pos - self.player_speed * steps)
             if self.input_handler.down_pressed:
                 self.player1_pos = min(
                     self.height - self.paddle_height - 1,
-                    self.player1_pos + self.player_speed,
+                    self.player1_pos + self.player_speed * steps,
                 )
 
             # Move paddle2 (AI) to follow the ball
             if self.ball_pos[1] < self.player2_pos + self.paddle_height // 2:
-                self.player2_pos = max(1, self.player2_pos - self.ai_speed)
+                self.player2_pos = max(1, self.player2_pos - self.ai_speed * steps)
             elif self.ball_pos[1] > self.player2_pos + self.paddle_height // 2:
                 self.player2_pos = min(
                     self.height - self.paddle_height - 1,
-                    self.player2_pos + self.ai_speed,
+                    self.player2_pos + self.ai_speed * steps,
                 )
 
     def display_game(self) -> None:
         """Display the game on the matrix"""
         self.display.clear()
 
-        # Draw the border
-        for x in range(self.width):
-            self.display.offscreen_canvas.SetPixel(
-                x,
-                0,
-                Colours.WHITE_NORMAL.red,
-                Colours.WHITE_NORMAL.green,
-                Colours.WHITE_NORMAL.blue,
-            )
-            self.display.offscreen_canvas.SetPixel(
-                x,
-                self.height - 1,
-                Colours.WHITE_NORMAL.red,
-                Colours.WHITE_NORMAL.green,
-                Colours.WHITE_NORMAL.blue,
-            )
-        for y in range(self.height):
-            self.display.offscreen_canvas.SetPixel(
-                0,
-                y,
-                Colours.WHITE_NORMAL.red,
-                Colours.WHITE_NORMAL.green,
-                Colours.WHITE_NORMAL.blue,
-            )
-            self.display.offscreen_canvas.SetPixel(
-                self.width - 1,
-                y,
-                Colours.WHITE_NORMAL.red,
-                Colours.WHITE_NORMAL.green,
-                Colours.WHITE_NORMAL.blue,
-            )
+        # The border never changes, so it lives on a static layer drawn once
+        border_layer = self.display.create_layer("border", z=-1, static=True)
+        if border_layer.dirty:
+            with self.display.drawing_on(border_layer):
+                border_layer.framebuffer.draw_rect(
+                    0, 0, self.width - 1, self.height - 1, Colours.WHITE_NORMAL
+                )
+
+        framebuffer = self.display.framebuffer
 
         # Draw the ball
-        for dx in range(self.ball_size):
-            for dy in range(self.ball_size):
-                self.display.offscreen_canvas.SetPixel(
-                    self.ball_pos[0] + dx,
-                    self.ball_pos[1] + dy,
-                    Colours.BLUE.red,
-                    Colours.BLUE.green,
-                    Colours.BLUE.blue,
-                )
+        framebuffer.fill_rect(
+            self.ball_pos[0],
+            self.ball_pos[1],
+            self.ball_size,
+            self.ball_size,
+            Colours.BLUE,
+        )
 
         # Draw the paddles
-        for dy in range(self.paddle_height):
-            for px in range(self.paddle_thickness):
-                self.display.offscreen_canvas.SetPixel(
-                    1 + px,
-                    self.player1_pos + dy,
-                    Colours.GREEN.red,
-                    Colours.GREEN.green,
-                    Colours.GREEN.blue,
-                )
-                self.display.offscreen_canvas.SetPixel(
-                    self.width - 2 - px,
-                    self.player2_pos + dy,
-                    Colours.GREEN.red,
-                    Colours.GREEN.green,
-                    Colours.GREEN.blue,
-                )
+        framebuffer.fill_rect(
+            1,
+            self.player1_pos,
+            self.paddle_thickness,
+            self.paddle_height,
+            Colours.GREEN,
+        )
+        framebuffer.fill_rect(
+            self.width - 1 - self.paddle_thickness,
+            self.player2_pos,
+            self.paddle_thickness,
+            self.paddle_height,
+            Colours.GREEN,
+        )
 
         # Draw the scores
         score_text = f"{self.score[0]} - {self.score[1]}"
@@ -164,10 +141,7 @@ class PongGame(Applet):
         text_x = (self.width - text_length) // 2  # Center the text horizontally
         self.display.draw_text(text_x, 8, score_text, Colours.WHITE_NORMAL)
 
-        self.display.offscreen_canvas = self.display.matrix.SwapOnVSync(
-            self.display.offscreen_canvas
-        )
-        time.sleep(0.025)
+        self.display.present()
 
     def start(self) -> None:
         """Start the applet"""
@@ -180,13 +154,17 @@ class PongGame(Applet):
             self.input_handler.exit_requested = True
 
         self.score = [0, 0]  # Initialize score
-        try:
-            while not self.input_handler.exit_requested:
-                self.move_ball()
-                self.move_paddles()
-                self.display_game()
-        except KeyboardInterrupt:
-            pass
+
+    def update(self, dt: float) -> None:
+        """Advance the game by however long the last frame took"""
+        # cap it so a stalled frame can't teleport the ball through a paddle
+        steps = min(dt * self.TARGET_FPS, 2.0)
+        self.move_ball(steps)
+        self.move_paddles(steps)
+
+    def render(self) -> None:
+        """Draw the current game state"""
+        self.display_game()
 
     def stop(self) -> None:
         """Stop the applet"""
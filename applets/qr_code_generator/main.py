@@ -1,19 +1,23 @@
 import os
 import qrcode
 import hashlib
-from PIL import Image
+from matrix.layout import centred
 from applets.base_applet import Applet
 
 
 class QRCodeGenerator(Applet):
     """QR Code Applet Definition"""
 
+    # nothing changes, only needs to keep up with the back button
+    TARGET_FPS = 5
+
     def __init__(self, **kwargs) -> None:
         """Initialisation function"""
         super().__init__("QR Code", **kwargs)
         self.data = self.options.get("data")
         self.qr_border_width = self.options.get("qr_border_width", 2)
         self.qr_box_size = self.options.get("qr_box_size", 8)
+        self.image = None
         self.log(
             f"Initialized QR code generator: border - {self.qr_border_width}, "
             f"box - {self.qr_box_size}, data - {self.data[:10]}..."
@@ -43,19 +47,19 @@ class QRCodeGenerator(Applet):
         """Start the applet"""
         self.log("Starting")
         self.display.clear()
-        # Generate QR code image and open it
+        # Generate QR code image and load it, I think it already will fit,
+        # but just in case size it to the matrix (kept square, and centred on
+        # displays which aren't)
         image_path = self.generate_qr_code(self.data)
-        image = Image.open(image_path)
-        # I think it already will fit, but just in case
-        image = image.resize((self.display.matrix.width, self.display.matrix.height))
-        image = image.convert("RGB")
-        self.display.offscreen_canvas.SetImage(image, 0, 0)
-        self.display.offscreen_canvas = self.display.matrix.SwapOnVSync(
-            self.display.offscreen_canvas
-        )
-        # still need this for interrupt handling
-        while not self.input_handler.exit_requested:
-            pass
+        size = min(self.display.width, self.display.height)
+        self.image = self.display.image_cache.get(image_path, (size, size))
+        self.image_x = centred(self.display.width, size)
+        self.image_y = centred(self.display.height, size)
+
+    def render(self) -> None:
+        """Draw the QR code, identical frames aren't re-sent to the matrix"""
+        self.display.draw_image(self.image, self.image_x, self.image_y)
+        self.display.present()
 
     def stop(self) -> None:
         """Stop the applet"""
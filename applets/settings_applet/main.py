@@ -1,11 +1,12 @@
 from matrix.colours import Colours
-import time
 from applets.base_applet import Applet
 
 
 class SettingsApplet(Applet):
     """Template Applet Definition"""
 
+    TARGET_FPS = 20
+
     def __init__(self, **kwargs) -> None:
         """Initialisation function"""
         super().__init__("Settings Applet", **kwargs)
@@ -16,32 +17,31 @@ class SettingsApplet(Applet):
         # don't know why this doesn't work but don't have time to check
         # normal .clear() doesn't remove menu items
         self.display.matrix.Clear()
-        while not self.input_handler.exit_requested:
-            latest_inputs = self.input_handler.get_latest_inputs()
-            if latest_inputs["right_pressed"]:
-                # ensure brightness never rises over 100
-                self.display.matrix.brightness = min(
-                    self.display.matrix.brightness + 10, 100
-                )
-            elif latest_inputs["left_pressed"]:
-                # ensure brightness never drops under 0
-                self.display.matrix.brightness = max(
-                    self.display.matrix.brightness - 10, 0
-                )
-
-            # Brightness title
-            self.display.draw_centered_text(
-                "Brightness", Colours.WHITE_BOLD, start_y=10
+        self.display.invalidate()
+
+    def update(self, dt: float) -> None:
+        """Adjust the brightness based on input"""
+        latest_inputs = self.input_handler.get_latest_inputs()
+        if latest_inputs["right_pressed"]:
+            # ensure brightness never rises over 100
+            self.display.matrix.brightness = min(
+                self.display.matrix.brightness + 10, 100
             )
+        elif latest_inputs["left_pressed"]:
+            # ensure brightness never drops under 0
+            self.display.matrix.brightness = max(self.display.matrix.brightness - 10, 0)
 
-            # Brightness bar
-            self.display.draw_progress_bar(
-                self.display.matrix.brightness, Colours.YELLOW, y=14
-            )
+    def render(self) -> None:
+        """Draw the brightness setting"""
+        # Brightness title
+        self.display.draw_centered_text("Brightness", Colours.WHITE_BOLD, start_y=10)
 
-            self.display.offscreen_canvas = self.display.matrix.SwapOnVSync(
-                self.display.offscreen_canvas
-            )
+        # Brightness bar
+        self.display.draw_progress_bar(
+            self.display.matrix.brightness, Colours.YELLOW, y=14
+        )
+
+        self.display.present()
 
     def stop(self) -> None:
         """Stop the applet"""
@@ -5,13 +5,25 @@ from matrix.matrix_display import graphics
 from matrix.colours import Colours
 from applets.base_applet import Applet
 
+# Usage 0 -> Green, 100 -> Red, one colour per whole percent made up front
+USAGE_COLOURS = [
+    graphics.Color(int(usage_percent * 2.55), int((100 - usage_percent) * 2.55), 0)
+    for usage_percent in range(101)
+]
+
 
 class SystemMonitor(Applet):
     """System Monitor Applet Definition"""
 
+    # stats are only refreshed once a second, no point drawing any faster
+    TARGET_FPS = 1
+
     def __init__(self, *args, **kwargs) -> None:
         """Initialisation function"""
         super().__init__("System Monitor", *args, **kwargs)
+        self.stats = {}
+        self.time_since_fetch = 0.0
+        self.drawn_labels = ()
 
     @staticmethod
     def fetch_stats() -> Dict[str, str]:
@@ -28,10 +40,7 @@ class SystemMonitor(Applet):
     @staticmethod
     def get_color_from_usage(usage_percent: float) -> graphics.Color:
         """Calculate colour based on usage percentage"""
-        # Usage 0 -> Green, 100 -> Red
-        green = int((100 - usage_percent) * 2.55)
-        red = int(usage_percent * 2.55)
-        return graphics.Color(red, green, 0)
+        return USAGE_COLOURS[min(100, max(0, int(usage_percent)))]
 
     def display_stats(self, stats: Dict[str, str]) -> None:
         """Display system statistics on the matrix"""
@@ -44,6 +53,19 @@ class SystemMonitor(Applet):
         longest_key = max(stats.keys(), key=len)
         key_offset = self.display.get_text_width(longest_key) + 5  # 5 padding
 
+        # the labels only change if the stats do, keep them on a static layer
+        labels_layer = self.display.create_layer("labels", z=-1, static=True)
+        if tuple(stats) != self.drawn_labels:
+            labels_layer.mark_dirty()
+        if labels_layer.dirty:
+            with self.display.drawing_on(labels_layer):
+                labels_layer.clear()
+                for i, stat_name in enumerate(stats):
+                    self.display.draw_text(
+                        1, y_offset + i * 10, stat_name, label_colour
+                    )
+            self.drawn_labels = tuple(stats)
+
         for stat_name, stat_value in stats.items():
             if "%" in stat_value:
                 cpu_percent = float(stat_value.strip("%"))
@@ -51,27 +73,32 @@ class SystemMonitor(Applet):
             else:
                 value_colour = Colours.WHITE_MUTED
 
-            # draw stat name
-            self.display.draw_text(1, y_offset, stat_name, label_colour)
-
             # draw stat value
             self.display.draw_text(key_offset, y_offset, stat_value, value_colour)
             y_offset += 10  # line height
 
-        self.display.offscreen_canvas = self.display.matrix.SwapOnVSync(
-            self.display.offscreen_canvas
-        )
-        time.sleep(1)
+        self.display.present()
 
     def start(self) -> None:
         """Start the applet"""
         self.log("Starting")
         self.display.clear()
-        while not self.input_handler.exit_requested:
-            stats = self.fetch_stats()
-            self.display_stats(stats)
+        self.stats = self.fetch_stats()
+        self.time_since_fetch = 0.0
+
+    def update(self, dt: float) -> None:
+        """Refetch the stats once a second"""
+        self.time_since_fetch += dt
+        if self.time_since_fetch >= 1:
+            self.stats = self.fetch_stats()
+            self.time_since_fetch = 0.0
+
+    def render(self) -> None:
+        """Draw the latest stats"""
+        self.display_stats(self.stats)
 
     def stop(self) -> None:
         """Stop the applet"""
         self.log("Stopping")
+        self.log(f"Text cache stats: {self.display.text_cache.stats()}")
         self.display.clear()
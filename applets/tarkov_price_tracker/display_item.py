@@ -5,13 +5,20 @@ class DisplayItem:
     """Represent a 64x16 row on the matrix"""
 
     def __init__(
-        self, name: str, price: int, icon_link: str, change_last_48h_percent: float
+        self,
+        name: str,
+        price: int,
+        icon_link: str,
+        change_last_48h_percent: float,
+        image_name: str = "",
     ) -> None:
         """Initialise a DisplayItem"""
         self.name = name
         self.price = price
         self.icon_link = icon_link
         self.change_last_48h_percent = change_last_48h_percent
+        # file name of the icon in the applet's resources directory
+        self.image_name = image_name
 
     @staticmethod
     def get_highest_trader_price(data: Dict) -> int:
@@ -1,10 +1,12 @@
 import time
 import os
 import requests
+import numpy as np
 from typing import List, Optional, Dict
 from PIL import Image
 from matrix.matrix_display import graphics
 from matrix.colours import Colours
+from matrix.layout import grid_cells
 from applets.base_applet import Applet
 from applets.tarkov_price_tracker.display_item import DisplayItem
 
@@ -12,15 +14,26 @@ from applets.tarkov_price_tracker.display_item import DisplayItem
 class TarkovPriceTracker(Applet):
     """TarkovPriceTracker applet definition"""
 
+    # pages only change every few seconds, this keeps select responsive
+    TARGET_FPS = 10
+
     def __init__(self, **kwargs) -> None:
         """Initialization function"""
         super().__init__("Tarkov Price Tracker", **kwargs)
         self.item_names = self.options.get("item_names")
         self.items = []
-        self.images = {}
         self.last_switch_time = time.time() - 5
         self.last_fetch_time = time.time()
         self.current_page_index = 0
+        self.shown_items: List[DisplayItem] = []
+        # each item is an icon and its price on a 64x16 row, as many as fit
+        self.ROW_WIDTH = 64
+        self.ROW_HEIGHT = 16
+        self.ICON_SIZE = 16
+        self.item_cells = grid_cells(
+            self.display.width, self.display.height, self.ROW_WIDTH, self.ROW_HEIGHT
+        )
+        self.items_per_page = len(self.item_cells)
         self.fetch_items()
 
     def run_query(self, query: str) -> Optional[Dict]:
@@ -33,9 +46,7 @@ class TarkovPriceTracker(Applet):
             return response.json()
         except requests.exceptions.RequestException as e:
             self.log(f"Network error: {e}")
-            self.display.show_message("Network error. Check your connection", "error")
-            time.sleep(2)
-            self.input_handler.exit_requested = True
+            self.show_network_error()
             return None
 
     def load_and_convert_image(self, image_name: str, icon_link: str) -> Image:
@@ -52,15 +63,28 @@ class TarkovPriceTracker(Applet):
             image_data = requests.get(icon_link, stream=True)
             image = Image.open(image_data.raw)
             image = image.convert("RGBA")
-            image = image.resize((16, 16))
+            image = image.resize((self.ICON_SIZE, self.ICON_SIZE))
             image.save(bmp_path)
         return image
 
+    def get_item_image(self, item: DisplayItem) -> np.ndarray:
+        """Get an item's icon, ready to blit, from the display's shared image cache"""
+        image_path = os.path.join(self.resources_directory, item.image_name)
+        return self.display.image_cache.get(
+            image_path.replace(".png", ".bmp"),
+            (self.ICON_SIZE, self.ICON_SIZE),
+            loader=lambda: self.load_and_convert_image(item.image_name, item.icon_link),
+        )
+
     def fetch_items(self) -> None:
         """Fetch all the selected items' information from the API"""
         self.log("Fetching items from the Tarkov API")
         self.items = []
         for item_name in self.item_names:
+            # the menu moved on while this was preloading, don't fetch the rest
+            if self.preload_was_cancelled():
+                self.items = []
+                return
             query = generate_query(item_name)
             result = self.run_query(query)
             if not result:
@@ -70,21 +94,18 @@ class TarkovPriceTracker(Applet):
                 return
             display_item = DisplayItem.from_graphql(result)
             if display_item:
+                display_item.image_name = f"{item_name.lower().replace(' ', '_')}.png"
                 self.items.append(display_item)
-                if display_item.name not in self.images.keys():
-                    image_path = f"{item_name.lower().replace(' ', '_')}.png"
-                    self.images[display_item.name] = self.load_and_convert_image(
-                        image_path, display_item.icon_link
-                    )
+                # warm the cache now, rather than downloading in the draw loop
+                self.get_item_image(display_item)
             else:
                 self.log(f"No item found for {item_name}.")
 
     def display_items(self, items: List[DisplayItem]) -> None:
         """Update matrix display with multiple items' information"""
         self.display.clear()
-        for index, item in enumerate(items):
-            image = self.images[item.name]
-            self.display.offscreen_canvas.SetImage(image.convert("RGB"), 0, index * 16)
+        for (x, y), item in zip(self.item_cells, items):
+            self.display.draw_image(self.get_item_image(item), x, y)
             short_price = shorten_price(item.price)
             if item.change_last_48h_percent is not None:
                 change_text = f"{abs(item.change_last_48h_percent):.1f}%"
@@ -96,11 +117,9 @@ class TarkovPriceTracker(Applet):
                 text = f"{short_price} TR."
                 color = Colours.GREEN
 
-            self.display.draw_text(18, (index * 16) + 12, text, color)
+            self.display.draw_text(x + self.ICON_SIZE + 2, y + 12, text, color)
 
-        self.display.offscreen_canvas = self.display.matrix.SwapOnVSync(
-            self.display.offscreen_canvas
-        )
+        self.display.present()
 
     def start(self) -> None:
         """Start the applet"""
@@ -108,23 +127,35 @@ class TarkovPriceTracker(Applet):
         self.display.clear()
         if not self.items:
             self.fetch_items()
-        while not self.input_handler.exit_requested:
-            current_time = time.time()
-            latest_inputs = self.input_handler.get_latest_inputs()
-            if current_time - self.last_fetch_time >= 10:
-                self.fetch_items()
-                self.last_fetch_time = current_time
-
-            if current_time - self.last_switch_time >= 5 or latest_inputs.get(
-                "select_pressed"
-            ):
-                start_index = self.current_page_index * 4
-                end_index = start_index + 4
-                self.display_items(self.items[start_index:end_index])
-                self.current_page_index = (self.current_page_index + 1) % (
-                    (len(self.items) + 3) // 4
-                )
-                self.last_switch_time = current_time
+
+    def update(self, dt: float) -> None:
+        """Refetch the prices every 10 seconds, and turn the page every 5 seconds
+        or when select is pressed"""
+        current_time = time.time()
+        latest_inputs = self.input_handler.get_latest_inputs()
+        if current_time - self.last_fetch_time >= 10:
+            self.fetch_items()
+            self.last_fetch_time = current_time
+
+        if not self.items:
+            self.shown_items = []
+            return
+        if current_time - self.last_switch_time >= 5 or latest_inputs.get(
+            "select_pressed"
+        ):
+            page_count = (
+                len(self.items) + self.items_per_page - 1
+            ) // self.items_per_page
+            self.current_page_index %= page_count
+            start_index = self.current_page_index * self.items_per_page
+            end_index = start_index + self.items_per_page
+            self.shown_items = self.items[start_index:end_index]
+            self.current_page_index = (self.current_page_index + 1) % page_count
+            self.last_switch_time = current_time
+
+    def render(self) -> None:
+        """Draw the current page, identical frames are skipped by present()"""
+        self.display_items(self.shown_items)
 
     def stop(self) -> None:
         """Stop the applet"""
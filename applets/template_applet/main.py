@@ -1,12 +1,15 @@
 import random
-import time
 from matrix.matrix_display import graphics
+from matrix.layout import centred
 from applets.base_applet import Applet
 
 
 class TemplateApplet(Applet):
     """Template Applet Definition"""
 
+    # update() and render() will be called (at most) this many times a second
+    TARGET_FPS = 1
+
     def __init__(self, **kwargs) -> None:
         """Initialisation function"""
         super().__init__("Template Applet", **kwargs)
@@ -16,25 +19,32 @@ class TemplateApplet(Applet):
         """Start the applet"""
         self.log("Starting")
         self.display.clear()
-        text = "Template"
         # Initial values
-        while not self.input_handler.exit_requested:
-            self.display.clear()
-            self.display.draw_text(
-                18,
-                32,
-                text,
-                graphics.Color(
-                    random.randint(0, 255),
-                    random.randint(0, 255),
-                    random.randint(0, 255),
-                ),
-            )
-            text = "Applet" if text == "Template" else "Template"
-            self.display.offscreen_canvas = self.display.matrix.SwapOnVSync(
-                self.display.offscreen_canvas
-            )
-            time.sleep(1)
+        self.text = "Template"
+        self.colour = graphics.Color(255, 255, 255)
+        self.time_since_switch = 0.0
+
+    def update(self, dt: float) -> None:
+        """Update the applet state, called once per frame with the seconds since the last"""
+        # input can wake the scheduler early, so don't assume dt is 1 / TARGET_FPS
+        self.time_since_switch += dt
+        if self.time_since_switch < 1:
+            return
+        self.time_since_switch = 0.0
+        self.text = "Applet" if self.text == "Template" else "Template"
+        self.colour = graphics.Color(
+            random.randint(0, 255),
+            random.randint(0, 255),
+            random.randint(0, 255),
+        )
+
+    def render(self) -> None:
+        """Draw a frame"""
+        self.display.clear()
+        # centred, whatever size the display is
+        text_x = centred(self.display.width, self.display.get_text_width(self.text))
+        self.display.draw_text(text_x, self.display.height // 2, self.text, self.colour)
+        self.display.present()
 
     def stop(self) -> None:
         """Stop the applet"""
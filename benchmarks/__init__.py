@@ -0,0 +1 @@
+"""Applet render benchmarks, see run_benchmarks.py"""
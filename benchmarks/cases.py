@@ -0,0 +1,253 @@
+"""The render path of each applet, set up so one call draws and presents one frame"""
+
+import os
+import random
+from typing import Dict
+from PIL import Image
+from matrix.matrix_display import MatrixDisplay
+from input_handlers.base_input_handler import BaseInputHandler
+from input_handlers.recording import ReplayInputHandler
+from benchmarks.stubs import scripted_recording
+
+APPLETS_ROOT_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "applets"
+)
+
+
+def system_monitor(display: MatrixDisplay, input_handler: BaseInputHandler):
+    from applets.system_monitor.main import SystemMonitor
+
+    applet = SystemMonitor(display=display, input_handler=input_handler, options={})
+    stats = [
+        {
+            "CPU": f"{cpu}%",
+            "RAM": "41.2%",
+            "Disk": "63.0%",
+            "Uptime": f"{1000 + cpu}s",
+            "Procs.": "142",
+        }
+        for cpu in (3.1, 12.5, 55.0, 97.9)
+    ]
+    return lambda frame: applet.display_stats(stats[(frame // 30) % len(stats)])
+
+
+def pong_game(display: MatrixDisplay, input_handler: BaseInputHandler):
+    from applets.pong_game.main import PongGame
+
+    applet = PongGame(display=display, input_handler=input_handler, options={})
+    applet.start()
+
+    def frame(frame: int) -> None:
+        applet.update(1 / applet.TARGET_FPS)
+        applet.display_game()
+
+    return frame
+
+
+def pong_game_input(display: MatrixDisplay, input_handler: BaseInputHandler):
+    from applets.pong_game.main import PongGame
+
+    applet = PongGame(display=display, input_handler=input_handler, options={})
+    # the player moves the paddle up and down, replayed on the same frames every run
+    recording = scripted_recording(
+        os.path.join(applet.resources_directory, "input.rec"),
+        [(0.5 * press, ("up", "down")[press % 2]) for press in range(40)],
+        hold_seconds=0.3,
+    )
+    applet.input_handler = replay = ReplayInputHandler(recording)
+    random.seed(0)
+    applet.start()
+
+    def frame(frame: int) -> None:
+        replay.advance(1 / applet.TARGET_FPS)
+        applet.update(1 / applet.TARGET_FPS)
+        applet.display_game()
+
+    return frame
+
+
+def tarkov_price_tracker(display: MatrixDisplay, input_handler: BaseInputHandler):
+    from applets.tarkov_price_tracker.main import TarkovPriceTracker
+
+    applet = TarkovPriceTracker(
+        display=display,
+        input_handler=input_handler,
+        options={
+            "item_names": ["Milk", "Goldenstar", "Physical Bitcoin", "LEDX", "Parrot"]
+        },
+    )
+    pages = [applet.items[:4], applet.items[4:]]
+    return lambda frame: applet.display_items(pages[(frame // 30) % len(pages)])
+
+
+def helldivers_planets_info(display: MatrixDisplay, input_handler: BaseInputHandler):
+    from applets.helldivers_planets_info.main import HelldiversPlanetsInfo
+
+    applet = HelldiversPlanetsInfo(
+        display=display, input_handler=input_handler, options={}
+    )
+    # display_planet logs every call, which would mostly be measuring print()
+    applet.log = lambda message: None
+    planets = applet.planets
+    return lambda frame: applet.display_planet(planets[(frame // 30) % len(planets)])
+
+
+def helldivers_counter(display: MatrixDisplay, input_handler: BaseInputHandler):
+    from applets.helldivers_counter.main import HelldiversKillCounter
+
+    applet = HelldiversKillCounter(
+        display=display, input_handler=input_handler, options={}
+    )
+    screens = [("bugs.png", applet.bugs), ("bots.png", applet.bots)]
+    return lambda frame: applet.update_display(*screens[(frame // 30) % 2])
+
+
+def master_app(display: MatrixDisplay, input_handler: BaseInputHandler):
+    from applet_manager import AppletManager
+
+    applet_manager = AppletManager(display, input_handler, APPLETS_ROOT_DIRECTORY)
+    applet = applet_manager.create_master_app()
+
+    def frame(frame: int) -> None:
+        # move the cursor every so often, like someone browsing the menu
+        applet.current_index = (frame // 30) % len(applet.applets)
+        applet.page_index = applet.current_index // applet.MAX_ITEMS_PER_PAGE
+        applet.display_menu()
+
+    return frame
+
+
+def master_app_input(display: MatrixDisplay, input_handler: BaseInputHandler):
+    from applet_manager import AppletManager
+
+    applet_manager = AppletManager(display, input_handler, APPLETS_ROOT_DIRECTORY)
+    applet = applet_manager.create_master_app()
+    # scroll down the menu, turning the page now and then
+    recording = scripted_recording(
+        os.path.join(applet.resources_directory, "input.rec"),
+        [(0.4 * press, "right" if press % 8 == 7 else "down") for press in range(60)],
+    )
+    applet.input_handler = replay = ReplayInputHandler(recording)
+
+    def frame(frame: int) -> None:
+        replay.advance(1 / 30)
+        applet.navigate_menu()
+        applet.display_menu()
+
+    return frame
+
+
+def internet_speed_checker(display: MatrixDisplay, input_handler: BaseInputHandler):
+    from applets.internet_speed_checker.main import SpeedCheck
+
+    applet = SpeedCheck(display=display, input_handler=input_handler, options={})
+
+    def frame(frame: int) -> None:
+        applet.download_speed = (frame % 100) * 65536
+        applet.display_speed()
+
+    return frame
+
+
+def qr_code_generator(display: MatrixDisplay, input_handler: BaseInputHandler):
+    from applets.qr_code_generator.main import QRCodeGenerator
+
+    applet = QRCodeGenerator(
+        display=display,
+        input_handler=input_handler,
+        options={"data": "I love 0xBC", "qr_border_width": 1, "qr_box_size": 4},
+    )
+    applet.start()
+    return lambda frame: applet.render()
+
+
+def settings_applet(display: MatrixDisplay, input_handler: BaseInputHandler):
+    from applets.settings_applet.main import SettingsApplet
+
+    applet = SettingsApplet(display=display, input_handler=input_handler)
+    applet.start()
+
+    def frame(frame: int) -> None:
+        display.matrix.brightness = 10 * (frame // 30 % 11)
+        applet.render()
+
+    return frame
+
+
+def applet_information_viewer(display: MatrixDisplay, input_handler: BaseInputHandler):
+    from applets.applet_information_viewer.main import AppletInformationViewer
+
+    applet = AppletInformationViewer(
+        display=display,
+        input_handler=input_handler,
+        applet_config={
+            "name": "Helldivers Statistics",
+            "description": "Displays the global statistics for Bugs and Bots killed",
+            "version": "1.0",
+            "author": "Owen Throup",
+        },
+    )
+    applet.start()
+
+    def frame(frame: int) -> None:
+        applet.shown_index = frame // 30
+        applet.render()
+
+    return frame
+
+
+def idle_applet(display: MatrixDisplay, input_handler: BaseInputHandler):
+    from applets.idle_applet.main import IdleApplet
+
+    applet = IdleApplet(display=display, input_handler=input_handler)
+    # play a generated GIF behind the clock, resources are a throwaway copy
+    animations_directory = os.path.join(applet.resources_directory, "animations")
+    os.makedirs(animations_directory, exist_ok=True)
+    gif_path = os.path.join(animations_directory, "bench.gif")
+    frames = [
+        Image.new("RGB", (96, 96), (shade, 40, 255 - shade))
+        for shade in range(0, 256, 16)
+    ]
+    frames[0].save(gif_path, save_all=True, append_images=frames[1:], duration=50)
+    applet.animations.source_paths = [gif_path]
+    applet.start()
+    return lambda frame: applet.render()
+
+
+def template_applet(display: MatrixDisplay, input_handler: BaseInputHandler):
+    from applets.template_applet.main import TemplateApplet
+
+    applet = TemplateApplet(
+        display=display,
+        input_handler=input_handler,
+        options={"example_option": "example_value"},
+    )
+    applet.start()
+
+    def frame(frame: int) -> None:
+        applet.update(1 / applet.TARGET_FPS)
+        applet.render()
+
+    return frame
+
+
+# benchmark name -> (applet directory, function setting up the frame function)
+CASES: Dict[str, tuple] = {
+    "system_monitor": ("system_monitor", system_monitor),
+    "pong_game": ("pong_game", pong_game),
+    "pong_game_input": ("pong_game", pong_game_input),
+    "tarkov_price_tracker": ("tarkov_price_tracker", tarkov_price_tracker),
+    "helldivers_planets_info": ("helldivers_planets_info", helldivers_planets_info),
+    "helldivers_counter": ("helldivers_counter", helldivers_counter),
+    "master_app": ("master_applet", master_app),
+    "master_app_input": ("master_applet", master_app_input),
+    "internet_speed_checker": ("internet_speed_checker", internet_speed_checker),
+    "qr_code_generator": ("qr_code_generator", qr_code_generator),
+    "settings_applet": ("settings_applet", settings_applet),
+    "applet_information_viewer": (
+        "applet_information_viewer",
+        applet_information_viewer,
+    ),
+    "idle_applet": ("idle_applet", idle_applet),
+    "template_applet": ("template_applet", template_applet),
+}
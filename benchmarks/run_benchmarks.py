@@ -0,0 +1,222 @@
+"""Benchmark the render path of every applet and compare against a stored baseline.
+
+Usage (from the repository root):
+    python -m benchmarks.run_benchmarks                    # run and compare
+    python -m benchmarks.run_benchmarks pong_game          # just some applets
+    python -m benchmarks.run_benchmarks --update-baseline  # record a new baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+from matrix.matrix_display import MatrixDisplay
+from benchmarks.cases import CASES, APPLETS_ROOT_DIRECTORY
+from benchmarks.stubs import StubInputHandler, stub_network, temporary_resources
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+# metrics which are compared against the baseline, lower is better for all of them
+COMPARED_METRICS = ["p50_ms", "p95_ms", "cpu_ms_per_frame", "alloc_kib_per_frame"]
+# most frames take well under a millisecond, where scheduling noise alone can move
+# a metric by more than the tolerance. Changes smaller than these never count
+MIN_REGRESSIONS = {
+    "p50_ms": 0.1,
+    "p95_ms": 0.1,
+    "cpu_ms_per_frame": 0.1,
+    "alloc_kib_per_frame": 1.0,
+}
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, int(round(percent / 100 * len(sorted_values))))
+    return sorted_values[max(0, index)]
+
+
+def run_case(
+    name: str, frames: int, warmup_frames: int, colour_mode: str = "rgb"
+) -> Dict[str, float]:
+    """Run a single benchmark, returning its metrics"""
+    applet_directory, setup = CASES[name]
+    with stub_network(), temporary_resources(
+        os.path.join(APPLETS_ROOT_DIRECTORY, applet_directory)
+    ):
+        display = MatrixDisplay(backend="headless", colour_mode=colour_mode)
+        # identical frames normally sleep in place of the vsync, don't time that
+        display.SKIPPED_FRAME_SLEEP_SECONDS = 0
+        input_handler = StubInputHandler()
+        frame_function = setup(display, input_handler)
+
+        for frame in range(warmup_frames):
+            frame_function(frame)
+
+        frame_times = []
+        cpu_start = time.process_time()
+        for frame in range(warmup_frames, warmup_frames + frames):
+            start = time.perf_counter()
+            frame_function(frame)
+            frame_times.append(time.perf_counter() - start)
+        cpu_time = time.process_time() - cpu_start
+
+        # allocations are measured in a separate pass, tracemalloc skews timings
+        peak_allocations = []
+        tracemalloc.start()
+        for frame in range(warmup_frames, warmup_frames + frames):
+            tracemalloc.reset_peak()
+            baseline_size, _ = tracemalloc.get_traced_memory()
+            frame_function(frame)
+            peak_allocations.append(tracemalloc.get_traced_memory()[1] - baseline_size)
+        tracemalloc.stop()
+
+    frame_times.sort()
+    return {
+        "frames": frames,
+        "p50_ms": percentile(frame_times, 50) * 1000,
+        "p95_ms": percentile(frame_times, 95) * 1000,
+        "p99_ms": percentile(frame_times, 99) * 1000,
+        "max_ms": frame_times[-1] * 1000,
+        "cpu_ms_per_frame": cpu_time / frames * 1000,
+        "alloc_kib_per_frame": sum(peak_allocations) / frames / 1024,
+        "frames_presented": display.frames_presented,
+        "frames_skipped": display.frames_skipped,
+    }
+
+
+def machine_description() -> Dict[str, str]:
+    """Where the numbers came from, baselines only really compare on like hardware"""
+    return {
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "system": platform.system(),
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """List every metric which got worse than the baseline by more than tolerance,
+    and by more than its MIN_REGRESSIONS"""
+    regressions = []
+    for name, metrics in results.items():
+        baseline_metrics = baseline.get("results", {}).get(name)
+        if not baseline_metrics:
+            continue
+        for metric in COMPARED_METRICS:
+            previous, current = baseline_metrics.get(metric), metrics[metric]
+            if (
+                previous
+                and current > previous * (1 + tolerance)
+                and current - previous > MIN_REGRESSIONS[metric]
+            ):
+                regressions.append(
+                    f"{name}: {metric} {previous:.3f} -> {current:.3f} "
+                    f"(+{(current / previous - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def print_results(results: Dict[str, Dict], baseline: Dict) -> None:
+    """Print a table of the results, with the change against the baseline"""
+    print(
+        f"{'applet':<28}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'cpu ms':>9}{'KiB/frm':>9}{'skipped':>9}{'vs base':>9}"
+    )
+    for name, metrics in results.items():
+        baseline_p95 = baseline.get("results", {}).get(name, {}).get("p95_ms")
+        change = (
+            f"{(metrics['p95_ms'] / baseline_p95 - 1) * 100:+.0f}%"
+            if baseline_p95
+            else "-"
+        )
+        print(
+            f"{name:<28}{metrics['p50_ms']:>9.3f}{metrics['p95_ms']:>9.3f}"
+            f"{metrics['p99_ms']:>9.3f}{metrics['cpu_ms_per_frame']:>9.3f}"
+            f"{metrics['alloc_kib_per_frame']:>9.1f}"
+            f"{metrics['frames_skipped']:>9}{change:>9}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("applets", nargs="*", help=f"any of {', '.join(CASES)}")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup-frames", type=int, default=30)
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="runs per applet, the best of each metric is kept to filter out noise",
+    )
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH)
+    parser.add_argument(
+        "--colour-mode", choices=MatrixDisplay.COLOUR_MODES, default="rgb"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="fraction a metric may grow by before it counts as a regression",
+    )
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.applets if name not in CASES]
+    if unknown:
+        parser.error(f"unknown applet(s): {', '.join(unknown)}")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r") as file:
+            baseline = json.load(file)
+
+    # applets log through print(), keep that out of the report
+    stdout = sys.stdout
+    results = {}
+    for name in args.applets or CASES:
+        sys.stdout = open(os.devnull, "w")
+        try:
+            runs = [
+                run_case(name, args.frames, args.warmup_frames, args.colour_mode)
+                for _ in range(args.repeats)
+            ]
+            results[name] = {
+                metric: min(run[metric] for run in runs) for metric in runs[0]
+            }
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+
+    print_results(results, baseline)
+
+    if args.update_baseline:
+        baseline_results = baseline.get("results", {}) if baseline else {}
+        baseline_results.update(results)
+        with open(args.baseline, "w") as file:
+            json.dump(
+                {"environment": machine_description(), "results": baseline_results},
+                file,
+                indent=4,
+                sort_keys=True,
+            )
+            file.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"No baseline at {args.baseline}, run with --update-baseline to make one")
+        return 0
+    if baseline.get("environment") != machine_description():
+        print(
+            f"Warning: baseline was recorded on {baseline.get('environment')}, "
+            f"this is {machine_description()}"
+        )
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
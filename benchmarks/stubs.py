@@ -0,0 +1,139 @@
+"""Stand-ins for the input handler and network layer, so applets can be benchmarked"""
+
+import io
+import os
+import re
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Any, List, Tuple
+from unittest import mock
+from PIL import Image
+from applets.base_applet import Applet
+from input_handlers.base_input_handler import BaseInputHandler, InputEvent
+from input_handlers.recording import InputRecorder
+
+
+class StubInputHandler(BaseInputHandler):
+    """Input handler which never receives any input (but claims to be a controller)"""
+
+    def listen(self) -> None:
+        pass
+
+    @staticmethod
+    def is_controller() -> bool:
+        return True
+
+
+def scripted_recording(
+    path: str, presses: List[Tuple[float, str]], hold_seconds: float = 0.1
+) -> str:
+    """Write a recording of each (seconds, button) press, held for hold_seconds"""
+    recorder = InputRecorder(path, start_time=0.0)
+    for seconds, button in presses:
+        recorder.record(InputEvent(seconds, button, True))
+        recorder.record(InputEvent(seconds + hold_seconds, button, False))
+    recorder.close()
+    return path
+
+
+class StubResponse:
+    """Just enough of requests.Response for the applets"""
+
+    def __init__(self, json_data: Any = None, content: bytes = b"") -> None:
+        self.json_data = json_data
+        self.raw = io.BytesIO(content)
+
+    def json(self) -> Any:
+        return self.json_data
+
+
+def _icon_png(size: int = 64) -> bytes:
+    """A plain PNG to stand in for item icons"""
+    buffer = io.BytesIO()
+    Image.new("RGBA", (size, size), (200, 120, 40, 255)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+HELLDIVERS_SUMMARY = {
+    "galaxy_stats": {"bugKills": 123456789012, "automatonKills": 98765432109}
+}
+
+HELLDIVERS_PLANETS = [
+    {
+        "name": name,
+        "currentOwner": owner,
+        "health": health,
+        "maxHealth": 1000000,
+        "statistics": {"playerCount": players},
+    }
+    for name, owner, health, players in [
+        ("Malevelon Creek", "Automaton", 412345, 31234),
+        ("Hellmire", "Terminids", 800123, 8765),
+        ("Draupnir", "Terminids", 150000, 1200),
+        ("Vernen Wells", "Automaton", 990000, 2),
+    ]
+]
+
+
+def tarkov_item(item_name: str) -> Dict:
+    """A GraphQL response for a single Tarkov item, derived from its name"""
+    seed = sum(map(ord, item_name))
+    return {
+        "data": {
+            "items": [
+                {
+                    "shortName": item_name[:8],
+                    "iconLink": f"https://assets.example/{seed}.png",
+                    "changeLast48hPercent": (seed % 21) - 10.5,
+                    "avg24hPrice": seed * 997,
+                    "sellFor": [{"price": seed * 500, "source": "trader"}],
+                }
+            ]
+        }
+    }
+
+
+def _stub_get(url: str, *args, **kwargs) -> StubResponse:
+    if url.endswith("/summary"):
+        return StubResponse(HELLDIVERS_SUMMARY)
+    if url.endswith("/planets"):
+        return StubResponse(HELLDIVERS_PLANETS)
+    return StubResponse(content=_icon_png())
+
+
+def _stub_post(url: str, *args, json: Dict = None, **kwargs) -> StubResponse:
+    item_name = re.search(r'name: "(.*?)"', json["query"]).group(1)
+    return StubResponse(tarkov_item(item_name))
+
+
+@contextmanager
+def stub_network():
+    """Answer the applets' HTTP requests with canned data"""
+    with mock.patch("requests.get", _stub_get), mock.patch("requests.post", _stub_post):
+        yield
+
+
+@contextmanager
+def temporary_resources(applet_directory: str):
+    """Point applets at a throwaway copy of their resources directory, so nothing
+    generated from stub data (e.g. cached item icons) ends up in the real one"""
+    temp_directory = tempfile.mkdtemp(prefix="applet-bench-")
+    resources_directory = os.path.join(temp_directory, "resources")
+    source_directory = os.path.join(applet_directory, "resources")
+    if os.path.isdir(source_directory):
+        shutil.copytree(source_directory, resources_directory)
+    else:
+        os.makedirs(resources_directory)
+
+    original_init = Applet.__init__
+
+    def init_with_temporary_resources(self, name: str, **kwargs) -> None:
+        original_init(self, name, **kwargs)
+        self.resources_directory = resources_directory
+
+    try:
+        with mock.patch.object(Applet, "__init__", init_with_temporary_resources):
+            yield resources_directory
+    finally:
+        shutil.rmtree(temp_directory, ignore_errors=True)
@@ -0,0 +1,34 @@
+"""Drives frame based applets at their declared frame rate"""
+
+import time
+from applets.base_applet import Applet
+from input_handlers.base_input_handler import BaseInputHandler
+
+
+class FrameScheduler:
+    def __init__(self, input_handler: BaseInputHandler) -> None:
+        """Initialise the FrameScheduler with the input handler it wakes up on."""
+        self.input_handler = input_handler
+
+    def run(self, applet: Applet) -> None:
+        """Call the applet's update/render callbacks at (most) its target FPS until exit is requested.
+        Between frames the thread sleeps until the next deadline, or until input arrives.
+        """
+        frame_interval = 1 / applet.TARGET_FPS
+        last_update_time = time.monotonic()
+        next_frame_deadline = last_update_time
+        while not self.input_handler.exit_requested:
+            now = time.monotonic()
+            applet.update(now - last_update_time)
+            last_update_time = now
+            if self.input_handler.exit_requested:
+                break
+            applet.render()
+
+            next_frame_deadline += frame_interval
+            if next_frame_deadline < now:
+                # running behind (slow frame), don't try and catch up with a burst
+                next_frame_deadline = now + frame_interval
+            self.input_handler.wait_for_input(
+                max(0.0, next_frame_deadline - time.monotonic())
+            )
@@ -1,8 +1,30 @@
-from typing import Dict
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class InputEvent:
+    """A button going down or up. timestamp is time.monotonic() seconds"""
+
+    timestamp: float
+    button: str
+    pressed: bool
 
 
 class BaseInputHandler:
-    def __init__(self) -> None:
+    # every button has a "<button>_pressed" attribute holding its current state
+    BUTTONS = ("up", "down", "left", "right", "select", "x", "y", "back")
+    # events nobody reads (e.g. while an applet only checks the state attributes)
+    # are dropped oldest first past this many
+    MAX_QUEUED_EVENTS = 256
+
+    def __init__(self, forward_to: "BaseInputHandler" = None) -> None:
+        """forward_to makes this handler a source of input for another one, which
+        gets all of its events"""
+        self.forward_to = forward_to
         self.up_pressed = False
         self.down_pressed = False
         self.left_pressed = False
@@ -13,20 +35,19 @@ class BaseInputHandler:
         self.back_pressed = False
         self.exit_requested = False
 
-        # Track previous states
-        self.previous_states = {
-            "up_pressed": self.up_pressed,
-            "down_pressed": self.down_pressed,
-            "left_pressed": self.left_pressed,
-            "right_pressed": self.right_pressed,
-            "select_pressed": self.select_pressed,
-            "x_pressed": self.x_pressed,
-            "y_pressed": self.y_pressed,
-            "back_pressed": self.back_pressed,
-            "exit_requested": self.exit_requested,
-        }
+        # listener threads post events, applets take them off the queue. Presses
+        # stay queued until read, so short ones can't fall between two polls
+        self.events = deque(maxlen=self.MAX_QUEUED_EVENTS)
+        self.event_condition = threading.Condition()
+        # Set by the listener threads whenever something happens, so the frame
+        # scheduler can sleep until the next frame but wake up early on input
+        self.input_event = threading.Event()
+        # set by the AppletManager, records when presses are taken off the queue
+        self.latency_tracker = None
+        # an InputRecorder (see recording.py) which every posted event is written to
+        self.recorder = None
 
-        # Track state changes
+        # Track state changes, reused by get_latest_inputs rather than rebuilt
         self.state_changes = {
             "up_pressed": False,
             "down_pressed": False,
@@ -42,30 +63,88 @@ class BaseInputHandler:
     def listen(self) -> None:
         raise NotImplementedError("This method should be overridden by subclasses")
 
-    def get_latest_inputs(self) -> Dict[str, bool]:
-        # Current states
-        current_states = {
-            "up_pressed": self.up_pressed,
-            "down_pressed": self.down_pressed,
-            "left_pressed": self.left_pressed,
-            "right_pressed": self.right_pressed,
-            "select_pressed": self.select_pressed,
-            "back_pressed": self.back_pressed,
-            "x_pressed": self.x_pressed,
-            "y_pressed": self.y_pressed,
-            "exit_requested": self.exit_requested,
-        }
+    def post_event(
+        self, button: str, pressed: bool, timestamp: Optional[float] = None
+    ) -> None:
+        """Record a button going down or up (ignored if it already was), called from
+        the listener threads. The "exit" button only has presses, see request_exit"""
+        if self.forward_to:
+            self.forward_to.post_event(button, pressed, timestamp)
+            return
+        if button != "exit":
+            if getattr(self, f"{button}_pressed") == pressed:
+                return
+            setattr(self, f"{button}_pressed", pressed)
+        event = InputEvent(
+            time.monotonic() if timestamp is None else timestamp, button, pressed
+        )
+        if self.recorder:
+            self.recorder.record(event)
+        with self.event_condition:
+            self.events.append(event)
+            self.event_condition.notify_all()
+        self.notify_input()
 
-        # Determine if states have changed and update state changes
-        for key in current_states:
-            if current_states[key] and current_states[key] != self.previous_states[key]:
-                self.state_changes[key] = True
-            else:
-                self.state_changes[key] = False
+    def request_exit(self, timestamp: Optional[float] = None) -> None:
+        """Ask the running applet to exit"""
+        if self.forward_to:
+            self.forward_to.request_exit(timestamp)
+            return
+        self.exit_requested = True
+        self.post_event("exit", True, timestamp)
 
-        # Update previous states to current states
-        self.previous_states = current_states.copy()
+    def notify_input(self) -> None:
+        """Wake up anything waiting for input"""
+        self.input_event.set()
 
+    def wait_for_input(self, timeout: float) -> bool:
+        """Sleep until input arrives or the timeout expires, True if input arrived.
+        Unlike wait_for_event this leaves the event queued"""
+        woken = self.input_event.wait(timeout)
+        self.input_event.clear()
+        return woken
+
+    def wait_for_event(self, timeout: Optional[float] = None) -> Optional[InputEvent]:
+        """Take the oldest event off the queue, waiting up to timeout seconds (forever
+        if None) for one to arrive. None if there wasn't one in time"""
+        with self.event_condition:
+            if not self.event_condition.wait_for(lambda: self.events, timeout):
+                return None
+            event = self.events.popleft()
+        self._track_taken([event])
+        return event
+
+    def poll_events(self) -> List[InputEvent]:
+        """Take every queued event off the queue, oldest first, without waiting"""
+        with self.event_condition:
+            events = list(self.events)
+            self.events.clear()
+        self._track_taken(events)
+        return events
+
+    def _track_taken(self, events: List[InputEvent]) -> None:
+        """Let the latency tracker know the applet now has these presses"""
+        if self.latency_tracker and events:
+            self.latency_tracker.events_taken(
+                (event.timestamp for event in events if event.pressed),
+                time.monotonic(),
+            )
+
+    def clear_events(self) -> None:
+        """Forget any queued events, e.g. presses meant for an applet which exited"""
+        with self.event_condition:
+            self.events.clear()
+
+    def get_latest_inputs(self) -> Dict[str, bool]:
+        """Which buttons were pressed (went down) since the last call. Built from the
+        event queue, so it takes the queued events"""
+        for key in self.state_changes:
+            self.state_changes[key] = False
+        for event in self.poll_events():
+            if event.button == "exit":
+                self.state_changes["exit_requested"] = True
+            elif event.pressed:
+                self.state_changes[f"{event.button}_pressed"] = True
         return self.state_changes
 
     # this is overridden in the controller.
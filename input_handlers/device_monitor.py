@@ -0,0 +1,104 @@
+"""Watches /dev/input with inotify, keeping an index of the input devices present"""
+
+import ctypes
+import ctypes.util
+import os
+import struct
+import threading
+from typing import Callable, Dict, Iterable, Optional
+from evdev import InputDevice, list_devices
+
+INPUT_DIRECTORY = "/dev/input"
+
+# from <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_CLOEXEC = 0o2000000
+# struct inotify_event, followed by a name of len bytes
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class DeviceMonitor:
+    """Keeps devices (path -> name) up to date as devices come and go.
+
+    Each device is opened once, when it appears, to read its name and is closed
+    straight away. on_change is called from the monitor thread with a copy of the
+    index whenever it changes.
+    """
+
+    def __init__(self, on_change: Callable[[Dict[str, str]], None]) -> None:
+        """Initialise the monitor, start() begins watching"""
+        self.on_change = on_change
+        self.devices: Dict[str, str] = {}
+        self.lock = threading.Lock()
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.inotify_fd = libc.inotify_init1(IN_CLOEXEC)
+        if self.inotify_fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # devices appear (IN_CREATE) before udev gives them their permissions
+        # (IN_ATTRIB), so both are watched
+        watch = libc.inotify_add_watch(
+            self.inotify_fd, INPUT_DIRECTORY.encode(), IN_CREATE | IN_DELETE | IN_ATTRIB
+        )
+        if watch < 0:
+            raise OSError(ctypes.get_errno(), f"Can't watch {INPUT_DIRECTORY}")
+        self.thread = threading.Thread(target=self._watch, daemon=True)
+
+    def start(self) -> None:
+        """Index the devices already present, then watch for changes"""
+        self._update(added=list_devices())
+        self.thread.start()
+
+    def find(self, keywords: Iterable[str]) -> Optional[str]:
+        """Path of the first device with any of the keywords in its name"""
+        with self.lock:
+            for path, name in sorted(self.devices.items()):
+                if any(keyword in name.lower() for keyword in keywords):
+                    return path
+        return None
+
+    def _watch(self) -> None:
+        while True:
+            data = os.read(self.inotify_fd, 4096)
+            added, removed = [], []
+            offset = 0
+            while offset < len(data):
+                _, mask, _, name_length = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                name = data[offset : offset + name_length].rstrip(b"\0").decode()
+                offset += name_length
+                if not name.startswith("event"):
+                    continue
+                path = os.path.join(INPUT_DIRECTORY, name)
+                (removed if mask & IN_DELETE else added).append(path)
+            self._update(added, removed)
+
+    def _update(self, added: Iterable[str] = (), removed: Iterable[str] = ()) -> None:
+        """Add/remove devices from the index, calling on_change if it changed"""
+        changed = False
+        with self.lock:
+            for path in removed:
+                changed |= self.devices.pop(path, None) is not None
+            for path in added:
+                if path in self.devices:
+                    continue
+                name = self._read_name(path)
+                if name is not None:
+                    self.devices[path] = name
+                    changed = True
+            devices = dict(self.devices)
+        if changed:
+            self.on_change(devices)
+
+    @staticmethod
+    def _read_name(path: str) -> Optional[str]:
+        """The name of a device, or None if it can't be opened (yet)"""
+        try:
+            device = InputDevice(path)
+        except OSError:
+            return None
+        try:
+            return device.name
+        finally:
+            device.close()
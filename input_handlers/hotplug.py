@@ -0,0 +1,45 @@
+import sys
+import threading
+from typing import Dict
+from input_handlers.base_input_handler import BaseInputHandler
+from input_handlers.device_monitor import DeviceMonitor
+from input_handlers.keyboard import Keyboard
+from input_handlers.xbox_controller import Controller
+
+
+class HotplugInputHandler(BaseInputHandler):
+    """Input from the keyboard (if there's a terminal) and whichever Xbox controller
+    is plugged in, picked up or dropped as it connects and disconnects"""
+
+    CONTROLLER_KEYWORDS = ["xbox", "x-box"]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.controller = None
+        self.controller_lock = threading.Lock()
+        self.keyboard = Keyboard(forward_to=self) if sys.stdin.isatty() else None
+        # starting the monitor reports the devices already there
+        self.device_monitor = DeviceMonitor(self._devices_changed)
+        self.device_monitor.start()
+
+    def _devices_changed(self, devices: Dict[str, str]) -> None:
+        """Connect to a controller as one appears, forget it once it's gone"""
+        with self.controller_lock:
+            if self.is_controller() and self.controller.device.path in devices:
+                return
+            if self.controller:
+                print("Controller disconnected")
+                self.controller = None
+            controller_path = self.device_monitor.find(self.CONTROLLER_KEYWORDS)
+            if controller_path is None:
+                return
+            try:
+                self.controller = Controller(controller_path, forward_to=self)
+            except OSError as error:
+                # tried again the next time the devices change
+                print(f"Could not open controller {controller_path}: {error}")
+                return
+            print(f"Controller connected: {controller_path}")
+
+    def is_controller(self) -> bool:
+        return self.controller is not None and self.controller.connected
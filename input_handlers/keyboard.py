@@ -1,46 +1,103 @@
+import atexit
+import os
+import selectors
+import sys
+import termios
 import threading
 import time
+import tty
 from input_handlers.base_input_handler import BaseInputHandler
 
 
 class Keyboard(BaseInputHandler):
-    def __init__(self) -> None:
-        super().__init__()
+    # bytes sent by the terminal and the button they press, escape sequences are
+    # the arrow keys (the second form is what terminals send in application mode)
+    KEY_BUTTONS = {
+        b"\x1b[A": "up",
+        b"\x1bOA": "up",
+        b"\x1b[B": "down",
+        b"\x1bOB": "down",
+        b"\x1b[C": "right",
+        b"\x1bOC": "right",
+        b"\x1b[D": "left",
+        b"\x1bOD": "left",
+        b"w": "up",
+        b"s": "down",
+        b"a": "left",
+        b"d": "right",
+        b"\r": "select",
+        b"\n": "select",
+        b" ": "select",
+        b"x": "x",
+        b"y": "y",
+        b"\x1b": "back",  # escape
+        b"\x7f": "back",  # backspace
+        b"b": "back",
+    }
+    # terminals only send key presses, so a button is released once its key hasn't
+    # been seen (or auto-repeated) for this long
+    RELEASE_SECONDS = 0.15
+
+    def __init__(self, forward_to: BaseInputHandler = None) -> None:
+        super().__init__(forward_to)
+        self.fd = sys.stdin.fileno()
+        # cbreak rather than raw, so CTRL+C still goes back from an applet
+        self.original_settings = termios.tcgetattr(self.fd)
+        tty.setcbreak(self.fd)
+        atexit.register(self.restore_terminal)
+        self.release_deadlines = {}
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.fd, selectors.EVENT_READ)
+        print("Keys: arrows/WASD, Enter/Space select, X, Y, Esc/B back, Q quit")
         self.listener_thread = threading.Thread(target=self._input_listener)
         self.listener_thread.daemon = True
         self.listener_thread.start()
 
     def _input_listener(self) -> None:
         while True:
-            self.reset_inputs()
-            key = (
-                input("up/down/left/right/select (CTRL+C to go back) : ")
-                .strip()
-                .lower()
-            )
-            if key == "up":
-                self.up_pressed = True
-            elif key == "down":
-                self.down_pressed = True
-            elif key == "left":
-                self.left_pressed = True
-            elif key == "right":
-                self.right_pressed = True
-            elif key == "select":
-                self.select_pressed = True
-            elif key == "x":
-                self.x_pressed = True
-            elif key == "y":
-                self.y_pressed = True
-            elif key == "q":
-                self.exit_requested = True
-                break
-            time.sleep(0.1)
-
-    def reset_inputs(self):
-        self.up_pressed = False
-        self.down_pressed = False
-        self.left_pressed = False
-        self.right_pressed = False
-        self.select_pressed = False
-        self.back_pressed = False
+            timeout = None
+            if self.release_deadlines:
+                timeout = max(
+                    0.0, min(self.release_deadlines.values()) - time.monotonic()
+                )
+            if self.selector.select(timeout):
+                data = os.read(self.fd, 64)
+                now = time.monotonic()
+                for key in self._split_keys(data):
+                    if key == b"q":
+                        self.request_exit(now)
+                    elif key in self.KEY_BUTTONS:
+                        self._press(self.KEY_BUTTONS[key], now)
+            self._release_expired(time.monotonic())
+
+    def _split_keys(self, data: bytes):
+        """Split what was read into single keys, keeping escape sequences whole"""
+        index = 0
+        while index < len(data):
+            length = 3 if data[index : index + 1] == b"\x1b" else 1
+            if length == 3 and data[index + 1 : index + 2] not in (b"[", b"O"):
+                # escape on its own
+                length = 1
+            key = data[index : index + length]
+            yield key if length > 1 else key.lower()
+            index += length
+
+    def _press(self, button: str, now: float) -> None:
+        """Press the button (if it isn't already held), and hold it a bit longer"""
+        if button not in self.release_deadlines:
+            self.post_event(button, True, now)
+            # like the controller's B button
+            if button == "back":
+                self.request_exit(now)
+        self.release_deadlines[button] = now + self.RELEASE_SECONDS
+
+    def _release_expired(self, now: float) -> None:
+        """Release every button whose key hasn't been seen for RELEASE_SECONDS"""
+        for button, deadline in list(self.release_deadlines.items()):
+            if deadline <= now:
+                del self.release_deadlines[button]
+                self.post_event(button, False, deadline)
+
+    def restore_terminal(self) -> None:
+        """Put the terminal back how it was"""
+        termios.tcsetattr(self.fd, termios.TCSADRAIN, self.original_settings)
@@ -0,0 +1,36 @@
+"""Input handler of applets running in a child process, fed by the parent over a pipe"""
+
+from multiprocessing.connection import Connection
+from input_handlers.base_input_handler import BaseInputHandler
+
+
+class PipeInputHandler(BaseInputHandler):
+    """Posts the events the parent forwards from its devices (see applet_process.py).
+
+    Messages are ("event", InputEvent) for every event the parent takes off its
+    queue, and ("controller", connected) whenever a controller comes or goes.
+    """
+
+    def __init__(self, connection: Connection) -> None:
+        super().__init__()
+        self.connection = connection
+        self.controller_connected = False
+
+    def listen(self) -> None:
+        """Post the events sent down the pipe until the parent closes it"""
+        while True:
+            try:
+                kind, value = self.connection.recv()
+            except (EOFError, OSError):
+                # the parent has gone, so has all input
+                self.request_exit()
+                return
+            if kind == "controller":
+                self.controller_connected = value
+            elif value.button == "exit":
+                self.request_exit(value.timestamp)
+            else:
+                self.post_event(value.button, value.pressed, value.timestamp)
+
+    def is_controller(self) -> bool:
+        return self.controller_connected
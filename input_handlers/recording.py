@@ -0,0 +1,128 @@
+"""Recording input events to a compact binary file, and replaying them.
+
+A recording is a header (magic, version) followed by one 10 byte record per event:
+microseconds since the recording started, button number and pressed (0 or 1).
+Version 1 recordings, with 32 bit offsets (so at most 71 minutes long), still play.
+"""
+
+import struct
+import threading
+import time
+from typing import List, Optional
+from input_handlers.base_input_handler import BaseInputHandler, InputEvent
+
+MAGIC = b"INPT"
+VERSION = 2
+HEADER = struct.Struct("<4sB")
+RECORD = struct.Struct("<QBB")
+# version -> record format
+RECORDS = {1: struct.Struct("<IBB"), VERSION: RECORD}
+# buttons are stored by their position in this, never reorder it
+RECORDED_BUTTONS = BaseInputHandler.BUTTONS + ("exit",)
+
+
+class InputRecorder:
+    """Writes every event posted to an input handler to a recording file"""
+
+    def __init__(self, path: str, start_time: Optional[float] = None) -> None:
+        """Start a recording at path, event times are kept relative to start_time
+        (by default now)"""
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION))
+        self.start_time = time.monotonic() if start_time is None else start_time
+        # events can be posted from more than one listener thread
+        self.lock = threading.Lock()
+        self.failed = False
+
+    def record(self, event: InputEvent) -> None:
+        """Append an event to the recording. This is called as input is posted, so
+        it never raises - if writing fails the recording stops instead"""
+        if self.failed:
+            return
+        try:
+            offset_microseconds = max(
+                0, round((event.timestamp - self.start_time) * 1e6)
+            )
+            record = RECORD.pack(
+                offset_microseconds, RECORDED_BUTTONS.index(event.button), event.pressed
+            )
+            with self.lock:
+                self.file.write(record)
+        except (struct.error, ValueError, OSError) as error:
+            self.failed = True
+            print(f"Input recording stopped, couldn't record {event}: {error}")
+
+    def close(self) -> None:
+        """Finish the recording"""
+        with self.lock:
+            self.file.close()
+
+
+def read_recording(path: str) -> List[InputEvent]:
+    """The events in a recording, timestamped in seconds since it started"""
+    with open(path, "rb") as file:
+        data = file.read()
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC or version not in RECORDS:
+        raise ValueError(f"{path} is not a version {VERSION} input recording")
+    return [
+        InputEvent(offset_microseconds / 1e6, RECORDED_BUTTONS[button], bool(pressed))
+        for offset_microseconds, button, pressed in RECORDS[version].iter_unpack(
+            data[HEADER.size :]
+        )
+    ]
+
+
+class ReplayInputHandler(BaseInputHandler):
+    """Input handler which plays back a recording, so runs can be repeated exactly.
+
+    Either play() it in real time (or faster, with speed), or step through it with
+    advance() for runs which should get the same input on the same frame every time.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0) -> None:
+        super().__init__()
+        self.recorded_events = read_recording(path)
+        self.speed = speed
+        self.position = 0.0
+        self.next_event_index = 0
+
+    @property
+    def finished(self) -> bool:
+        """Whether every event has been played"""
+        return self.next_event_index >= len(self.recorded_events)
+
+    def advance(self, seconds: float) -> None:
+        """Move seconds (of recording time) further on, posting the events passed"""
+        self.position += seconds
+        while (
+            not self.finished
+            and self.recorded_events[self.next_event_index].timestamp <= self.position
+        ):
+            self._post_recorded(self.recorded_events[self.next_event_index])
+            self.next_event_index += 1
+
+    def _post_recorded(self, event: InputEvent) -> None:
+        if event.button == "exit":
+            self.request_exit()
+        else:
+            self.post_event(event.button, event.pressed)
+
+    def listen(self) -> None:
+        """Play the rest of the recording in real time (divided by speed)"""
+        start_time = time.monotonic() - self.position / self.speed
+        while not self.finished:
+            event = self.recorded_events[self.next_event_index]
+            time.sleep(
+                max(0.0, start_time + event.timestamp / self.speed - time.monotonic())
+            )
+            self.advance(event.timestamp - self.position)
+
+    def play(self) -> None:
+        """Play the recording in the background"""
+        threading.Thread(target=self.listen, daemon=True).start()
+
+    # recordings are mostly made with a controller, and Pong won't start without one
+    @staticmethod
+    def is_controller() -> bool:
+        return True
@@ -1,48 +1,90 @@
 # controller.py
 
+import selectors
 import threading
+import time
 from evdev import InputDevice, categorize, ecodes, KeyEvent, AbsEvent
 from input_handlers.base_input_handler import BaseInputHandler
 
 
 class Controller(BaseInputHandler):
     DEAD_ZONE = 8000  # Define a dead zone threshold
+    # face buttons and the button they press, see _handle_key_event
+    KEY_BUTTONS = {
+        "BTN_SOUTH": "select",  # A button
+        "BTN_EAST": "back",  # B button
+        # B button is east, OK. A button is south, OK, makes sense.
+        # surely X button is west, right? Nope, it's north :clown:
+        "BTN_NORTH": "x",  # X button
+        "BTN_WEST": "y",  # Y button
+    }
 
-    def __init__(self, device_path: str) -> None:
-        super().__init__()
+    def __init__(self, device_path: str, forward_to: BaseInputHandler = None) -> None:
+        super().__init__(forward_to)
         self.device = InputDevice(device_path)
+        self.connected = True
+        self.left_joystick_x = 0
+        self.left_joystick_y = 0
+        # epoll on Linux, the listener sleeps until the kernel has events for it
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.device, selectors.EVENT_READ)
         self.listener_thread = threading.Thread(target=self._input_listener)
         self.listener_thread.daemon = True
         self.listener_thread.start()
-        self.left_joystick_x = 0
-        self.left_joystick_y = 0
 
     def _input_listener(self) -> None:
-        for event in self.device.read_loop():
-            if event.type == ecodes.EV_KEY:
-                key_event = categorize(event)
-                if isinstance(key_event, KeyEvent):
-                    self._handle_key_event(key_event)
-            elif event.type == ecodes.EV_ABS:
-                abs_event = categorize(event)
-                if isinstance(abs_event, AbsEvent):
-                    self._handle_abs_event(abs_event)
+        while True:
+            for key, _ in self.selector.select():
+                try:
+                    events = list(key.fileobj.read())
+                except BlockingIOError:
+                    continue
+                except OSError:
+                    # unplugged, or the batteries died
+                    self._disconnect()
+                    return
+                for event in events:
+                    self._handle_event(event)
 
-    def _handle_key_event(self, key_event: KeyEvent) -> None:
-        if "BTN_SOUTH" in key_event.keycode:  # A button
-            self.select_pressed = key_event.keystate == KeyEvent.key_down
-        elif "BTN_EAST" in key_event.keycode:  # B button
-            self.back_pressed = key_event.keystate == KeyEvent.key_down
-            if key_event.keystate == KeyEvent.key_down:
-                self.exit_requested = True
-        # B button is east, OK. A button is south, OK, makes sense.
-        # surely X button is west, right? Nope, it's north :clown:
-        elif "BTN_NORTH" in key_event.keycode:  # X button
-            self.x_pressed = key_event.keystate == KeyEvent.key_down
-        elif "BTN_WEST" in key_event.keycode:  # Y button
-            self.y_pressed = key_event.keystate == KeyEvent.key_down
+    def _disconnect(self) -> None:
+        """Let go of the device, releasing anything that was held down on it"""
+        self.connected = False
+        self.selector.close()
+        self.device.close()
+        for button in self.BUTTONS:
+            self.post_event(button, False)
+
+    def _handle_event(self, event) -> None:
+        """Turn a raw evdev event into button events"""
+        # the kernel stamps events with the wall clock, input events use monotonic
+        timestamp = event.timestamp() + time.monotonic() - time.time()
+        if event.type == ecodes.EV_KEY:
+            key_event = categorize(event)
+            if isinstance(key_event, KeyEvent):
+                self._handle_key_event(key_event, timestamp)
+        elif event.type == ecodes.EV_ABS:
+            abs_event = categorize(event)
+            if isinstance(abs_event, AbsEvent):
+                self._handle_abs_event(abs_event, timestamp)
+
+    def _handle_key_event(self, key_event: KeyEvent, timestamp: float) -> None:
+        # keycode is a list when a key has more than one name
+        keycodes = key_event.keycode
+        if isinstance(keycodes, str):
+            keycodes = [keycodes]
+        button = next(
+            (self.KEY_BUTTONS[code] for code in keycodes if code in self.KEY_BUTTONS),
+            None,
+        )
+        # key_hold repeats are neither a press nor a release
+        if button is None or key_event.keystate == KeyEvent.key_hold:
+            return
+        pressed = key_event.keystate == KeyEvent.key_down
+        self.post_event(button, pressed, timestamp)
+        if button == "back" and pressed:
+            self.request_exit(timestamp)
 
-    def _handle_abs_event(self, abs_event: AbsEvent) -> None:
+    def _handle_abs_event(self, abs_event: AbsEvent, timestamp: float) -> None:
         if abs_event.event.code == ecodes.ABS_X:  # Left joystick horizontal movement
             self.left_joystick_x = abs_event.event.value
         elif abs_event.event.code == ecodes.ABS_Y:  # Left joystick vertical movement
@@ -54,11 +96,11 @@ class Controller(BaseInputHandler):
         if abs(self.left_joystick_y) < self.DEAD_ZONE:
             self.left_joystick_y = 0
 
-        # Update navigation flags based on joystick position
-        self.up_pressed = self.left_joystick_y < -self.DEAD_ZONE
-        self.down_pressed = self.left_joystick_y > self.DEAD_ZONE
-        self.left_pressed = self.left_joystick_x < -self.DEAD_ZONE
-        self.right_pressed = self.left_joystick_x > self.DEAD_ZONE
+        # Update navigation buttons based on joystick position, only changes are posted
+        self.post_event("up", self.left_joystick_y < -self.DEAD_ZONE, timestamp)
+        self.post_event("down", self.left_joystick_y > self.DEAD_ZONE, timestamp)
+        self.post_event("left", self.left_joystick_x < -self.DEAD_ZONE, timestamp)
+        self.post_event("right", self.left_joystick_x > self.DEAD_ZONE, timestamp)
 
     @staticmethod
     def is_controller() -> bool:
@@ -0,0 +1,181 @@
+"""Animations (GIFs) decoded once into raw frame files which are memory-mapped to play.
+
+A decoded file is a small header, the delay of every frame, then every frame as
+height x width x 3 RGB bytes. Playing one is just picking a slice of the mapped
+file, so only the pages of frames actually shown are read in, and any number of
+animations can be rotated through without holding them in memory.
+"""
+
+import os
+import struct
+from typing import List, Optional
+import numpy as np
+from PIL import Image, ImageOps, ImageSequence
+
+MAGIC = b"ANIM"
+VERSION = 1
+# magic, version, width, height, frame count, brightness (percent)
+HEADER = struct.Struct("<4sBHHIB")
+DELAY_DTYPE = np.dtype("<u4")
+# like browsers, treat tiny (or missing) frame delays as 100ms
+MINIMUM_DELAY_MS = 20
+DEFAULT_DELAY_MS = 100
+
+
+def decode_animation(
+    source_path: str,
+    destination_path: str,
+    width: int,
+    height: int,
+    brightness: float = 1.0,
+) -> None:
+    """Decode every frame of an animated image, scaled to fill width x height and
+    dimmed by brightness (0-1), into a raw frame file"""
+    delays = []
+    frames = []
+    with Image.open(source_path) as image:
+        for frame in ImageSequence.Iterator(image):
+            delay = frame.info.get("duration") or 0
+            delays.append(delay if delay >= MINIMUM_DELAY_MS else DEFAULT_DELAY_MS)
+            frame = ImageOps.fit(frame.convert("RGB"), (width, height))
+            pixels = np.asarray(frame, dtype=np.uint8)
+            if brightness < 1:
+                pixels = (pixels * brightness).astype(np.uint8)
+            frames.append(pixels)
+
+    # written to a temporary file first so a half written file is never mapped
+    temporary_path = f"{destination_path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(
+            HEADER.pack(
+                MAGIC, VERSION, width, height, len(frames), round(brightness * 100)
+            )
+        )
+        file.write(np.asarray(delays, dtype=DELAY_DTYPE).tobytes())
+        for pixels in frames:
+            file.write(pixels.tobytes())
+    os.replace(temporary_path, destination_path)
+
+
+def read_header(path: str) -> Optional[tuple]:
+    """The (width, height, frame count, brightness percent) of a decoded file, or
+    None if it isn't one (or is from an older version)"""
+    try:
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+    except OSError:
+        return None
+    if len(header) < HEADER.size:
+        return None
+    magic, version, width, height, frame_count, brightness = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return width, height, frame_count, brightness
+
+
+class Animation:
+    """A decoded animation, memory-mapped from disk"""
+
+    def __init__(self, path: str) -> None:
+        """Map the decoded file at path"""
+        header = read_header(path)
+        if header is None:
+            raise ValueError(f"{path} is not a decoded animation")
+        self.path = path
+        self.width, self.height, self.frame_count, _ = header
+        self.delays_ms = np.fromfile(
+            path, dtype=DELAY_DTYPE, count=self.frame_count, offset=HEADER.size
+        )
+        # end time of each frame, to find the frame showing at a given time
+        self.frame_ends_ms = np.cumsum(self.delays_ms)
+        self.duration_ms = int(self.frame_ends_ms[-1]) if self.frame_count else 0
+        self.frames = np.memmap(
+            path,
+            dtype=np.uint8,
+            mode="r",
+            offset=HEADER.size + self.delays_ms.nbytes,
+            shape=(self.frame_count, self.height, self.width, 3),
+        )
+
+    def frame_at(self, seconds: float) -> np.ndarray:
+        """The frame showing the given number of seconds in, looping forever"""
+        if self.frame_count == 1 or not self.duration_ms:
+            return self.frames[0]
+        position_ms = int(seconds * 1000) % self.duration_ms
+        index = int(np.searchsorted(self.frame_ends_ms, position_ms, side="right"))
+        return self.frames[index]
+
+    def close(self) -> None:
+        """Unmap the file (once nothing else holds on to a frame)"""
+        self.frames = None
+
+
+def load_animation(
+    source_path: str,
+    decoded_directory: str,
+    width: int,
+    height: int,
+    brightness: float = 1.0,
+) -> Animation:
+    """Map the decoded version of an animated image, decoding it first if it hasn't
+    been yet, or the source / wanted size has changed since"""
+    os.makedirs(decoded_directory, exist_ok=True)
+    decoded_path = os.path.join(
+        decoded_directory, f"{os.path.basename(source_path)}.{width}x{height}.anim"
+    )
+    header = read_header(decoded_path)
+    if (
+        header is None
+        or header[0:2] != (width, height)
+        or header[3] != round(brightness * 100)
+        or os.path.getmtime(decoded_path) < os.path.getmtime(source_path)
+    ):
+        decode_animation(source_path, decoded_path, width, height, brightness)
+    return Animation(decoded_path)
+
+
+class AnimationPlaylist:
+    """Rotates through a list of animations, only one of which is mapped at a time"""
+
+    def __init__(
+        self,
+        source_paths: List[str],
+        decoded_directory: str,
+        width: int,
+        height: int,
+        seconds_per_animation: float = 30,
+        brightness: float = 1.0,
+    ) -> None:
+        """Initialise the playlist, animations are decoded when first played"""
+        self.source_paths = source_paths
+        self.decoded_directory = decoded_directory
+        self.width = width
+        self.height = height
+        self.seconds_per_animation = seconds_per_animation
+        self.brightness = brightness
+        self.current_index = None
+        self.current_animation: Optional[Animation] = None
+
+    def frame_at(self, seconds: float) -> Optional[np.ndarray]:
+        """The frame showing the given number of seconds into the playlist"""
+        if not self.source_paths:
+            return None
+        index = int(seconds // self.seconds_per_animation) % len(self.source_paths)
+        if index != self.current_index:
+            self.close()
+            self.current_animation = load_animation(
+                self.source_paths[index],
+                self.decoded_directory,
+                self.width,
+                self.height,
+                self.brightness,
+            )
+            self.current_index = index
+        return self.current_animation.frame_at(seconds % self.seconds_per_animation)
+
+    def close(self) -> None:
+        """Unmap the current animation"""
+        if self.current_animation:
+            self.current_animation.close()
+        self.current_animation = None
+        self.current_index = None
@@ -0,0 +1,131 @@
+"""Pure Python BDF font loader which rasterises every glyph into a single atlas"""
+
+import os
+from dataclasses import dataclass
+from typing import Dict
+import numpy as np
+
+REPLACEMENT_CODEPOINT = 0xFFFD
+
+
+@dataclass
+class GlyphMetrics:
+    # Where the glyph lives in the atlas and how far it advances the pen
+    atlas_x: int
+    width: int
+    device_width: int
+
+
+class BDFFont:
+    """A BDF font, rasterised once into a boolean glyph atlas.
+
+    Glyphs are placed in the atlas vertically aligned to a shared baseline, so
+    rendering a string is just copying column slices of the atlas side by side.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Load and rasterise the font at the given path"""
+        self.path = path
+        self.name = os.path.basename(path)
+        self.height = 0
+        self.baseline = 0
+        self.glyphs: Dict[int, GlyphMetrics] = {}
+        self._load(path)
+
+    def _load(self, path: str) -> None:
+        """Parse the BDF file and build the atlas"""
+        raw_glyphs = []
+        with open(path, "r", encoding="latin-1") as file:
+            lines = iter(file.read().splitlines())
+        for line in lines:
+            parts = line.split()
+            if not parts:
+                continue
+            if parts[0] == "FONTBOUNDINGBOX":
+                self.height = int(parts[2])
+                self.baseline = self.height + int(parts[4])
+            elif parts[0] == "STARTCHAR":
+                raw_glyphs.append(self._parse_glyph(lines))
+
+        # rows of the atlas are relative to the top of the font bounding box, but
+        # some glyphs poke outside of it so extend the atlas to fit everything
+        self.top = min(
+            [0]
+            + [self.baseline - h - y_offset for _, _, h, y_offset, _, _ in raw_glyphs]
+        )
+        bottom = max(
+            [self.height]
+            + [self.baseline - y_offset for _, _, _, y_offset, _, _ in raw_glyphs]
+        )
+        self.atlas_height = bottom - self.top
+
+        glyphs = [glyph for glyph in raw_glyphs if glyph[0] >= 0]
+        self.atlas = np.zeros(
+            (self.atlas_height, sum(glyph[1] for glyph in glyphs)), dtype=bool
+        )
+        atlas_x = 0
+        for codepoint, width, height, y_offset, device_width, rows in glyphs:
+            row = self.baseline - height - y_offset - self.top
+            self.atlas[row : row + height, atlas_x : atlas_x + width] = rows
+            self.glyphs[codepoint] = GlyphMetrics(atlas_x, width, device_width)
+            atlas_x += width
+
+    @staticmethod
+    def _parse_glyph(lines) -> tuple:
+        """Parse a single STARTCHAR ... ENDCHAR block"""
+        codepoint, device_width = -1, 0
+        width = height = y_offset = 0
+        rows = np.zeros((0, 0), dtype=bool)
+        for line in lines:
+            parts = line.split()
+            if not parts:
+                continue
+            if parts[0] == "ENCODING":
+                codepoint = int(parts[1])
+            elif parts[0] == "DWIDTH":
+                device_width = int(parts[1])
+            elif parts[0] == "BBX":
+                width, height, y_offset = int(parts[1]), int(parts[2]), int(parts[4])
+            elif parts[0] == "BITMAP":
+                rows = np.zeros((height, width), dtype=bool)
+                for y in range(height):
+                    hex_row = next(lines).strip()
+                    value, bits = int(hex_row, 16), len(hex_row) * 4
+                    for x in range(width):
+                        rows[y, x] = (value >> (bits - 1 - x)) & 1
+            elif parts[0] == "ENDCHAR":
+                break
+        # like rgbmatrix, the glyph x offset is not applied when drawing
+        return codepoint, width, height, y_offset, device_width, rows
+
+    def find_glyph(self, codepoint: int) -> GlyphMetrics:
+        """Find a glyph, falling back to the replacement character (or None)"""
+        glyph = self.glyphs.get(codepoint)
+        if glyph is None:
+            glyph = self.glyphs.get(REPLACEMENT_CODEPOINT)
+        return glyph
+
+    def CharacterWidth(self, codepoint: int) -> int:
+        """How far the given character advances the pen (same API as graphics.Font)"""
+        glyph = self.find_glyph(codepoint)
+        return glyph.device_width if glyph else 0
+
+    def render(self, text: str) -> np.ndarray:
+        """Render a string into a boolean mask, atlas_height rows high.
+
+        Row 0 of the mask is self.top rows relative to the top of the font box.
+        """
+        glyphs = [self.find_glyph(ord(char)) for char in text]
+        glyphs = [glyph for glyph in glyphs if glyph]
+        x, width = 0, 0
+        for glyph in glyphs:
+            width = max(width, x + glyph.width)
+            x += glyph.device_width
+        mask = np.zeros((self.atlas_height, max(width, x)), dtype=bool)
+        x = 0
+        for glyph in glyphs:
+            mask[:, x : x + glyph.width] |= self.atlas[
+                :, glyph.atlas_x : glyph.atlas_x + glyph.width
+            ]
+            x += glyph.device_width
+        return mask
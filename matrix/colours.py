@@ -1,4 +1,7 @@
-from rgbmatrix import graphics
+try:
+    from rgbmatrix import graphics
+except ImportError:
+    from matrix import headless_graphics as graphics
 
 
 # Define some preset colors
@@ -0,0 +1,96 @@
+"""Per-font width lookup table and pixel accurate (memoised) word wrapping"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import List
+import numpy as np
+from matrix.bdf_font import BDFFont, REPLACEMENT_CODEPOINT
+
+# a word and the whitespace before it
+WORD_PATTERN = re.compile(r"(\s*)(\S+)")
+
+
+class FontMetrics:
+    """Advance widths of every glyph in a font, precomputed into an array indexed
+    by codepoint, so measuring a string never goes near the glyph dictionary.
+    Safe to share between threads"""
+
+    def __init__(self, font: BDFFont, cache_size: int = 1024) -> None:
+        """Build the width table for the given font"""
+        self.font_name = font.name
+        replacement = font.glyphs.get(REPLACEMENT_CODEPOINT)
+        fallback_width = replacement.device_width if replacement else 0
+        # the extra slot at the end is the width of anything past the table
+        size = max(font.glyphs, default=0) + 2
+        self.widths = np.full(size, fallback_width, dtype=np.int32)
+        for codepoint, glyph in font.glyphs.items():
+            self.widths[codepoint] = glyph.device_width
+        self.cache_size = cache_size
+        self.text_widths = OrderedDict()
+        self.wrapped_lines = OrderedDict()
+        # guards both memos, measuring and wrapping happen outside of it
+        self.lock = threading.Lock()
+
+    def _codepoints(self, text: str) -> np.ndarray:
+        """Codepoints of the string, clamped into the width table"""
+        codepoints = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        return np.minimum(codepoints, len(self.widths) - 1)
+
+    def _recall(self, cache: OrderedDict, key):
+        with self.lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _remember(self, cache: OrderedDict, key, value) -> None:
+        with self.lock:
+            cache[key] = value
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+
+    def text_width(self, text: str) -> int:
+        """Width of the string in pixels"""
+        width = self._recall(self.text_widths, text)
+        if width is None:
+            width = int(self.widths[self._codepoints(text)].sum())
+            self._remember(self.text_widths, text, width)
+        return width
+
+    def _fitting_characters(self, text: str, max_width: int) -> int:
+        """How many characters from the start of text fit in max_width (at least 1)"""
+        advances = np.cumsum(self.widths[self._codepoints(text)])
+        return max(1, int(np.searchsorted(advances, max_width, side="right")))
+
+    def wrap(self, text: str, max_width: int) -> List[str]:
+        """Break text into lines no wider than max_width pixels, on whitespace where
+        possible. Words which are too long by themselves are split"""
+        key = (text, max_width)
+        lines = self._recall(self.wrapped_lines, key)
+        if lines is not None:
+            return list(lines)
+
+        lines = []
+        line, line_width = "", 0
+        for match in WORD_PATTERN.finditer(text):
+            # like textwrap, any whitespace character counts as a space
+            space, word = " " * len(match.group(1)), match.group(2)
+            word_width = self.text_width(word)
+            if line:
+                candidate_width = line_width + self.text_width(space) + word_width
+                if candidate_width <= max_width:
+                    line, line_width = line + space + word, candidate_width
+                    continue
+                lines.append(line)
+            while word_width > max_width and len(word) > 1:
+                split = self._fitting_characters(word, max_width)
+                lines.append(word[:split])
+                word = word[split:]
+                word_width = self.text_width(word)
+            line, line_width = word, word_width
+        if line:
+            lines.append(line)
+
+        self._remember(self.wrapped_lines, key, tuple(lines))
+        return lines
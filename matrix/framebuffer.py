@@ -0,0 +1,134 @@
+"""NumPy backed framebuffer which is pushed to the matrix canvas once per frame"""
+
+from typing import Optional, Tuple
+import numpy as np
+
+
+def pixel_view(pixels: np.ndarray) -> np.ndarray:
+    """View a height x width x 3 array as height x width 3 byte values, so masked
+    copies move whole pixels (much faster than broadcasting a mask over RGB)"""
+    return pixels.view("V3")[..., 0]
+
+
+class FrameBuffer:
+    """Height x width x 3 uint8 pixel buffer with vectorised drawing primitives"""
+
+    def __init__(self, width: int = 64, height: int = 64) -> None:
+        """Initialise an empty (black) framebuffer"""
+        self.width = width
+        self.height = height
+        self.pixels = np.zeros((height, width, 3), dtype=np.uint8)
+
+    @staticmethod
+    def _rgb(colour) -> Tuple[int, int, int]:
+        """Turn a graphics.Color (or anything with red/green/blue) into a tuple"""
+        return colour.red, colour.green, colour.blue
+
+    def _clip(
+        self, x1: int, y1: int, x2: int, y2: int
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """Clip a half-open rectangle to the buffer, None if nothing is left"""
+        x1, y1 = max(0, int(x1)), max(0, int(y1))
+        x2, y2 = min(self.width, int(x2)), min(self.height, int(y2))
+        if x1 >= x2 or y1 >= y2:
+            return None
+        return x1, y1, x2, y2
+
+    def _clip_source(self, x: int, y: int, width: int, height: int) -> Optional[tuple]:
+        """Clip a width x height source placed at x,y to the buffer, returning the
+        (buffer region, source region) slices, None if nothing is left"""
+        x, y = int(x), int(y)
+        clipped = self._clip(x, y, x + width, y + height)
+        if not clipped:
+            return None
+        x1, y1, x2, y2 = clipped
+        return (
+            (slice(y1, y2), slice(x1, x2)),
+            (slice(y1 - y, y2 - y), slice(x1 - x, x2 - x)),
+        )
+
+    def _paint(self, region, rgb: Tuple[int, int, int]) -> None:
+        """Set the pixels at region (anything that indexes rows, columns) to rgb"""
+        self.pixels[region] = rgb
+
+    def fill(self, colour) -> None:
+        """Fill the whole buffer with a single colour"""
+        self._paint((slice(None), slice(None)), self._rgb(colour))
+
+    def fill_rect(self, x: int, y: int, width: int, height: int, colour) -> None:
+        """Fill a width x height rectangle with its top left corner at x,y"""
+        clipped = self._clip(x, y, x + width, y + height)
+        if clipped:
+            x1, y1, x2, y2 = clipped
+            self._paint((slice(y1, y2), slice(x1, x2)), self._rgb(colour))
+
+    def draw_rect(self, x1: int, y1: int, x2: int, y2: int, colour) -> None:
+        """Draw a rectangle outline, corners are inclusive"""
+        self.draw_line(x1, y1, x2, y1, colour)
+        self.draw_line(x1, y2, x2, y2, colour)
+        self.draw_line(x1, y1, x1, y2, colour)
+        self.draw_line(x2, y1, x2, y2, colour)
+
+    def draw_line(self, x1: int, y1: int, x2: int, y2: int, colour) -> None:
+        """Draw a line between two (inclusive) points"""
+        x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
+        if y1 == y2 or x1 == x2:
+            # axis aligned lines are just a one pixel wide rectangle
+            self.fill_rect(
+                min(x1, x2), min(y1, y2), abs(x2 - x1) + 1, abs(y2 - y1) + 1, colour
+            )
+            return
+        steps = max(abs(x2 - x1), abs(y2 - y1)) + 1
+        xs = np.rint(np.linspace(x1, x2, steps)).astype(np.intp)
+        ys = np.rint(np.linspace(y1, y2, steps)).astype(np.intp)
+        visible = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        self._paint((ys[visible], xs[visible]), self._rgb(colour))
+
+    def blit(
+        self, source: np.ndarray, x: int, y: int, mask: Optional[np.ndarray] = None
+    ) -> None:
+        """Copy a height x width x 3 array into the buffer with its top left at x,y.
+        If a boolean mask is given, only pixels where it is set are copied"""
+        regions = self._clip_source(x, y, source.shape[1], source.shape[0])
+        if regions:
+            region, source_region = regions
+            source = source[source_region][..., :3]
+            if mask is None:
+                self.pixels[region] = source
+            else:
+                np.copyto(
+                    self.pixels[region], source, where=mask[source_region][..., None]
+                )
+            self._blitted(region, None if mask is None else mask[source_region])
+
+    def _blitted(self, region, mask: Optional[np.ndarray]) -> None:
+        """Called after pixels have been copied in from an image"""
+
+    def draw_text_bitmap(self, rendered, x: int, y: int, colour) -> None:
+        """Draw text from the text cache with its top left at x,y"""
+        self.blit(rendered.pixels, x, y, mask=rendered.mask)
+
+    def resolve(self) -> np.ndarray:
+        """The RGB pixels to show"""
+        return self.pixels
+
+    # The methods below mirror the rgbmatrix canvas API so that code which draws
+    # straight onto display.offscreen_canvas keeps working against the buffer
+
+    def SetPixel(self, x: int, y: int, red: int, green: int, blue: int) -> None:
+        """Set a single pixel, out of bounds pixels are ignored like on the canvas"""
+        x, y = int(x), int(y)
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self._paint((y, x), (red, green, blue))
+
+    def SetImage(self, image, offset_x: int = 0, offset_y: int = 0, *args) -> None:
+        """Blit a PIL image into the buffer"""
+        self.blit(np.asarray(image.convert("RGB")), offset_x, offset_y)
+
+    def Fill(self, red: int, green: int, blue: int) -> None:
+        """Fill the buffer with a single colour"""
+        self._paint((slice(None), slice(None)), (red, green, blue))
+
+    def Clear(self) -> None:
+        """Set every pixel to black"""
+        self.pixels.fill(0)
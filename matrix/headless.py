@@ -0,0 +1,97 @@
+"""In-memory matrix backend, so rendering can run (and be measured) off the Pi"""
+
+import os
+from collections import deque
+from typing import Optional
+import numpy as np
+from PIL import Image
+
+
+class RGBMatrixOptions:
+    """The subset of rgbmatrix.RGBMatrixOptions the headless matrix cares about"""
+
+    def __init__(self) -> None:
+        self.rows = 32
+        self.cols = 32
+        self.chain_length = 1
+        self.parallel = 1
+
+
+class HeadlessCanvas:
+    """NumPy backed canvas with the same drawing API as an rgbmatrix FrameCanvas"""
+
+    def __init__(self, matrix: "HeadlessMatrix") -> None:
+        self.matrix = matrix
+        self.width = matrix.width
+        self.height = matrix.height
+        self.pixels = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+
+    def _scale(self, values):
+        """Like the real thing, brightness is applied as pixels are written"""
+        return (np.asarray(values, dtype=np.uint16) * self.matrix.brightness) // 100
+
+    def SetPixel(self, x: int, y: int, red: int, green: int, blue: int) -> None:
+        x, y = int(x), int(y)
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.pixels[y, x] = self._scale((red, green, blue))
+
+    def SetImage(self, image, offset_x: int = 0, offset_y: int = 0, *args) -> None:
+        source = np.asarray(image.convert("RGB"))
+        x1, y1 = max(0, offset_x), max(0, offset_y)
+        x2 = min(self.width, offset_x + source.shape[1])
+        y2 = min(self.height, offset_y + source.shape[0])
+        if x1 < x2 and y1 < y2:
+            self.pixels[y1:y2, x1:x2] = self._scale(
+                source[y1 - offset_y : y2 - offset_y, x1 - offset_x : x2 - offset_x]
+            )
+
+    def Fill(self, red: int, green: int, blue: int) -> None:
+        self.pixels[:, :] = self._scale((red, green, blue))
+
+    def Clear(self) -> None:
+        self.pixels.fill(0)
+
+
+class HeadlessMatrix:
+    """Stand-in for rgbmatrix.RGBMatrix which keeps the presented frames in memory"""
+
+    def __init__(
+        self, options: RGBMatrixOptions = None, capture_limit: int = 0
+    ) -> None:
+        """Initialise the matrix, keeping copies of the last capture_limit frames"""
+        options = options or RGBMatrixOptions()
+        self.width = options.cols * options.chain_length
+        self.height = options.rows * options.parallel
+        self.brightness = 100
+        self.frame_count = 0
+        self.front_canvas = HeadlessCanvas(self)
+        self.captured_frames = deque(maxlen=capture_limit or None)
+        self.capture_enabled = capture_limit > 0
+        self.capture_directory: Optional[str] = None
+
+    def CreateFrameCanvas(self) -> HeadlessCanvas:
+        return HeadlessCanvas(self)
+
+    def SwapOnVSync(self, canvas: HeadlessCanvas, *args) -> HeadlessCanvas:
+        """Show the canvas, handing back the previously shown one to draw on"""
+        previous_canvas, self.front_canvas = self.front_canvas, canvas
+        self.frame_count += 1
+        if self.capture_enabled:
+            self.captured_frames.append(canvas.pixels.copy())
+        if self.capture_directory:
+            self.save_png(
+                os.path.join(self.capture_directory, f"frame_{self.frame_count:06}.png")
+            )
+        return previous_canvas
+
+    def Clear(self) -> None:
+        self.front_canvas.Clear()
+
+    @property
+    def last_frame(self) -> np.ndarray:
+        """The frame currently 'on the panel'"""
+        return self.front_canvas.pixels
+
+    def save_png(self, path: str, frame: np.ndarray = None) -> None:
+        """Save a frame (by default the one currently shown) as a PNG"""
+        Image.fromarray(self.last_frame if frame is None else frame).save(path)
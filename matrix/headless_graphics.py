@@ -0,0 +1,41 @@
+"""Pure Python stand-in for rgbmatrix.graphics, used when rgbmatrix isn't installed"""
+
+from matrix.bdf_font import BDFFont
+
+
+class Color:
+    def __init__(self, red: int = 0, green: int = 0, blue: int = 0) -> None:
+        self.red = red
+        self.green = green
+        self.blue = blue
+
+
+class Font:
+    """Same API as graphics.Font, backed by the BDF glyph atlas"""
+
+    def __init__(self) -> None:
+        self.bdf_font = None
+
+    def LoadFont(self, path: str) -> None:
+        self.bdf_font = BDFFont(path)
+
+    @property
+    def height(self) -> int:
+        return self.bdf_font.height
+
+    @property
+    def baseline(self) -> int:
+        return self.bdf_font.baseline
+
+    def CharacterWidth(self, codepoint: int) -> int:
+        return self.bdf_font.CharacterWidth(codepoint)
+
+
+def DrawText(canvas, font, x: int, y: int, color: Color, text: str) -> int:
+    """Draw text with its baseline at y, returning the width drawn"""
+    bdf_font = font.bdf_font if isinstance(font, Font) else font
+    mask = bdf_font.render(text)
+    top = y - bdf_font.baseline + bdf_font.top
+    for row, column in zip(*mask.nonzero()):
+        canvas.SetPixel(x + column, top + row, color.red, color.green, color.blue)
+    return sum(bdf_font.CharacterWidth(ord(char)) for char in text)
@@ -0,0 +1,83 @@
+"""Process-wide cache of images already converted into ready-to-blit RGB arrays"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+import numpy as np
+from PIL import Image
+
+
+class ImageCache:
+    """Converted images keyed by (path or URL, size), LRU evicted under a byte budget.
+
+    Safe to share between threads, e.g. an applet being preloaded in the background
+    and the one on the panel. Images are loaded outside of the lock, as loaders can
+    be slow (downloads).
+    """
+
+    def __init__(self, max_bytes: int = 2 * 1024 * 1024) -> None:
+        """Initialise an empty cache which holds at most max_bytes of pixels"""
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.entries: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(
+        self,
+        source: str,
+        size: Optional[Tuple[int, int]] = None,
+        loader: Callable[[], Image.Image] = None,
+    ) -> np.ndarray:
+        """Get a height x width x 3 uint8 array for the image at source, resized to
+        size (width, height) if given. On a miss the image comes from loader(),
+        or is opened from disk if there is no loader"""
+        key = (source, size)
+        with self.lock:
+            pixels = self.entries.get(key)
+            if pixels is not None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return pixels
+            self.misses += 1
+
+        image = loader() if loader else Image.open(source)
+        image = image.convert("RGB")
+        if size and image.size != size:
+            image = image.resize(size)
+        pixels = np.ascontiguousarray(np.asarray(image, dtype=np.uint8))
+        # cached arrays are shared, so make sure nobody draws on them by accident
+        pixels.setflags(write=False)
+
+        with self.lock:
+            # another thread may have loaded it meanwhile, it's replaced
+            replaced = self.entries.pop(key, None)
+            if replaced is not None:
+                self.current_bytes -= replaced.nbytes
+            self.entries[key] = pixels
+            self.current_bytes += pixels.nbytes
+            # never evict the entry we've just added, even if it is huge by itself
+            while self.current_bytes > self.max_bytes and len(self.entries) > 1:
+                _, evicted = self.entries.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+                self.evictions += 1
+        return pixels
+
+    def clear(self) -> None:
+        """Drop every cached image (counters are kept)"""
+        with self.lock:
+            self.entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size, handy for logging"""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.current_bytes,
+            }
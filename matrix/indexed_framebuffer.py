@@ -0,0 +1,81 @@
+"""Framebuffer which stores drawn colours as palette indices, expanded at present time"""
+
+from typing import Optional
+import numpy as np
+from matrix.framebuffer import FrameBuffer, pixel_view
+from matrix.palette import Palette
+
+
+class IndexedFrameBuffer(FrameBuffer):
+    """A FrameBuffer with an 8-bit index plane on top of the RGB one.
+
+    Shapes and text are drawn as palette indices, so their colours follow the
+    palette (theme, dimming) without being redrawn. Images don't fit in a palette,
+    so they still go to the RGB plane and their pixels get index 0. resolve()
+    expands the indices through the palette and fills in the index 0 pixels from
+    the RGB plane.
+    """
+
+    def __init__(self, width: int, height: int, palette: Palette) -> None:
+        """Initialise an empty (black) framebuffer using the given palette"""
+        super().__init__(width, height)
+        self.palette = palette
+        self.indices = np.zeros((height, width), dtype=np.uint8)
+        self.resolved = np.zeros_like(self.pixels)
+        self.direct = np.zeros((height, width), dtype=bool)
+        # np.take converts its indices to intp, so keep intp copies around rather
+        # than have it allocate new ones every frame
+        self.index_scratch = np.zeros((height, width), dtype=np.intp)
+        self.pixel_scratch = np.zeros(self.pixels.shape, dtype=np.intp)
+        # images are dimmed through a byte lookup table when the palette is dimmed
+        self.dimmed_pixels = np.zeros_like(self.pixels)
+        self.dim_lut = np.arange(256, dtype=np.uint8)
+        self.dim_lut_brightness = 1.0
+
+    def _paint(self, region, rgb) -> None:
+        self.indices[region] = self.palette.index(rgb)
+
+    def _blitted(self, region, mask: Optional[np.ndarray]) -> None:
+        if mask is None:
+            self.indices[region] = 0
+        else:
+            np.copyto(self.indices[region], 0, where=mask)
+
+    def draw_text_bitmap(self, rendered, x: int, y: int, colour) -> None:
+        """Draw text from the text cache as the palette index of its colour"""
+        regions = self._clip_source(
+            x, y, rendered.mask.shape[1], rendered.mask.shape[0]
+        )
+        if regions:
+            region, source_region = regions
+            np.copyto(
+                self.indices[region],
+                self.palette.index(self._rgb(colour)),
+                where=rendered.mask[source_region],
+            )
+
+    def _direct_pixels(self) -> np.ndarray:
+        """The RGB plane, dimmed to match the palette"""
+        brightness = self.palette.brightness
+        if brightness >= 1:
+            return self.pixels
+        if brightness != self.dim_lut_brightness:
+            self.dim_lut = (np.arange(256) * brightness).astype(np.uint8)
+            self.dim_lut_brightness = brightness
+        np.copyto(self.pixel_scratch, self.pixels)
+        np.take(self.dim_lut, self.pixel_scratch, out=self.dimmed_pixels, mode="clip")
+        return self.dimmed_pixels
+
+    def resolve(self) -> np.ndarray:
+        """Expand the index plane through the palette into RGB"""
+        resolved = pixel_view(self.resolved)
+        np.copyto(self.index_scratch, self.indices)
+        np.take(self.palette.lut_view, self.index_scratch, out=resolved, mode="clip")
+        np.equal(self.indices, 0, out=self.direct)
+        np.copyto(resolved, pixel_view(self._direct_pixels()), where=self.direct)
+        return self.resolved
+
+    def Clear(self) -> None:
+        """Set every pixel to black"""
+        super().Clear()
+        self.indices.fill(0)
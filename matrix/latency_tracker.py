@@ -0,0 +1,113 @@
+"""Input to photon latency: from the kernel timestamp of an input event to the swap of
+the first frame presented after an applet read it"""
+
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List
+import numpy as np
+
+
+class LatencyTracker:
+    """Per applet latency samples, split into stages.
+
+    poll: the event happening until the applet took it off the input queue
+    render: the applet taking it until it presented a frame
+    vsync: the frame being presented until the swap finished (and it was shown)
+    """
+
+    STAGES = ("poll", "render", "vsync", "total")
+    # upper bounds (in ms) of the buckets in the total latency histogram
+    HISTOGRAM_BUCKETS_MS = (8, 16, 33, 50, 100, 250)
+
+    def __init__(self, max_samples: int = 1000) -> None:
+        """Initialise the tracker, keeping the latest max_samples per applet"""
+        self.max_samples = max_samples
+        self.current_applet = "none"
+        # accessed from the input, applet and render threads
+        self.lock = threading.Lock()
+        # (event time, taken time) of events read since the last frame
+        self.taken = []
+        # (event time, taken time, presented time, applet) waiting to be shown
+        self.presented = []
+        self.samples: Dict[str, Dict[str, deque]] = defaultdict(
+            lambda: {stage: deque(maxlen=self.max_samples) for stage in self.STAGES}
+        )
+
+    def events_taken(self, event_times: Iterable[float], now: float) -> None:
+        """Record input events (by their timestamps) being taken off the queue"""
+        with self.lock:
+            self.taken.extend((event_time, now) for event_time in event_times)
+
+    def frame_presented(self, now: float) -> None:
+        """Record a frame being presented, it reflects every event taken so far"""
+        if not self.taken:
+            return
+        with self.lock:
+            self.presented.extend(
+                (event_time, taken_time, now, self.current_applet)
+                for event_time, taken_time in self.taken
+            )
+            self.taken.clear()
+
+    def frame_shown(self, presented_time: float, now: float) -> None:
+        """Record the frame presented at presented_time finishing its swap. Frames
+        which were dropped for it are counted as shown by it"""
+        if not self.presented:
+            return
+        with self.lock:
+            waiting = []
+            for event_time, taken_time, frame_time, applet in self.presented:
+                if frame_time > presented_time:
+                    waiting.append((event_time, taken_time, frame_time, applet))
+                    continue
+                samples = self.samples[applet]
+                samples["poll"].append(taken_time - event_time)
+                samples["render"].append(frame_time - taken_time)
+                samples["vsync"].append(now - frame_time)
+                samples["total"].append(now - event_time)
+            self.presented = waiting
+
+    def percentiles(self, applet: str) -> Dict[str, List[float]]:
+        """p50/p95/p99 of each stage for an applet, in milliseconds"""
+        with self.lock:
+            samples = {
+                stage: list(self.samples[applet][stage]) for stage in self.STAGES
+            }
+        return {
+            stage: list(np.percentile(np.array(values) * 1000, [50, 95, 99]))
+            for stage, values in samples.items()
+            if values
+        }
+
+    def histogram(self, applet: str) -> List[int]:
+        """Counts of total latencies in each of HISTOGRAM_BUCKETS_MS, and above it"""
+        with self.lock:
+            totals = np.array(self.samples[applet]["total"]) * 1000
+        bucket_indices = np.searchsorted(self.HISTOGRAM_BUCKETS_MS, totals)
+        return list(
+            np.bincount(bucket_indices, minlength=len(self.HISTOGRAM_BUCKETS_MS) + 1)
+        )
+
+    def report(self) -> str:
+        """Latency percentiles and histogram of every applet, as text"""
+        lines = []
+        with self.lock:
+            applets = [
+                applet for applet in self.samples if self.samples[applet]["total"]
+            ]
+        for applet in sorted(applets):
+            lines.append(f"{applet} ({len(self.samples[applet]['total'])} samples)")
+            for stage, (p50, p95, p99) in self.percentiles(applet).items():
+                lines.append(
+                    f"  {stage:<7} p50 {p50:7.1f} ms  p95 {p95:7.1f} ms  p99 {p99:7.1f} ms"
+                )
+            bucket_names = [f"<{bucket}" for bucket in self.HISTOGRAM_BUCKETS_MS]
+            bucket_names.append(f">={self.HISTOGRAM_BUCKETS_MS[-1]}")
+            counts = self.histogram(applet)
+            lines.append(
+                "  total ms "
+                + " ".join(
+                    f"{name}: {count}" for name, count in zip(bucket_names, counts)
+                )
+            )
+        return "\n".join(lines) or "No input latency samples yet"
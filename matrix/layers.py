@@ -0,0 +1,120 @@
+"""Named framebuffer layers which are composited into the frame at present time"""
+
+from typing import List, Optional
+import numpy as np
+from matrix.framebuffer import FrameBuffer, pixel_view
+from matrix.occupancy_grid import OccupancyGrid
+from matrix.palette import Palette
+
+
+class Layer:
+    """A framebuffer with a z-order. Black pixels are transparent.
+
+    Static layers keep their content between frames (clear() doesn't touch them),
+    so they only need drawing when they are dirty - when first created, or after
+    mark_dirty() is called because whatever is on them has changed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        z: int,
+        width: int,
+        height: int,
+        static: bool = False,
+        framebuffer: FrameBuffer = None,
+    ) -> None:
+        """Initialise an empty layer, drawing into a plain FrameBuffer unless another
+        (e.g. an IndexedFrameBuffer) is given"""
+        self.name = name
+        self.z = z
+        self.static = static
+        self.framebuffer = framebuffer or FrameBuffer(width, height)
+        # scratch space for working out which pixels are lit, reused every frame
+        self.channels_or = np.empty((height, width), dtype=np.uint8)
+        self.lit = np.empty((height, width), dtype=bool)
+        # text overlap is checked per layer, static text is only placed once
+        self.bounding_boxes = {}
+        self.occupancy = OccupancyGrid(width, height)
+        self.dirty = True
+        # bumped whenever the content changes, so cached composites can tell
+        self.version = 0
+
+    def mark_dirty(self) -> None:
+        """Flag that the layer needs re-rendering"""
+        self.dirty = True
+
+    def mark_clean(self) -> None:
+        """Flag that the layer has just been (re-)rendered"""
+        self.dirty = False
+        self.version += 1
+
+    def clear(self) -> None:
+        """Remove everything drawn on the layer"""
+        self.framebuffer.Clear()
+        self.bounding_boxes.clear()
+        self.occupancy.clear()
+        self.version += 1
+
+
+def blend(destination: np.ndarray, layer: Layer) -> None:
+    """Draw the lit (non-black) pixels of a layer over the destination"""
+    pixels = layer.framebuffer.resolve()
+    np.bitwise_or(pixels[..., 0], pixels[..., 1], out=layer.channels_or)
+    np.bitwise_or(layer.channels_or, pixels[..., 2], out=layer.channels_or)
+    np.not_equal(layer.channels_or, 0, out=layer.lit)
+    np.copyto(pixel_view(destination), pixel_view(pixels), where=layer.lit)
+
+
+class Compositor:
+    """Composites layers bottom to top. The static layers underneath the main one
+    are flattened once and cached until one of them changes."""
+
+    def __init__(self, main_layer: Layer, palette: Palette = None) -> None:
+        self.main_layer = main_layer
+        # in indexed mode a palette change recolours the cached background too
+        self.palette = palette
+        self.layers: List[Layer] = [main_layer]
+        self.output = np.zeros_like(main_layer.framebuffer.pixels)
+        self.static_background: Optional[np.ndarray] = None
+        self.static_background_versions = None
+
+    def add(self, layer: Layer) -> None:
+        self.layers.append(layer)
+        self.layers.sort(key=lambda layer: layer.z)
+
+    def remove(self, layer: Layer) -> None:
+        self.layers.remove(layer)
+
+    def _background_layers(self) -> List[Layer]:
+        """Static layers underneath the main layer"""
+        return [
+            layer
+            for layer in self.layers
+            if layer.static and layer.z < self.main_layer.z
+        ]
+
+    def _static_background(self) -> np.ndarray:
+        """The flattened static background, rebuilt only if a layer in it changed"""
+        background_layers = self._background_layers()
+        versions = [(id(layer), layer.version) for layer in background_layers]
+        if self.palette:
+            versions.append(("palette", self.palette.version))
+        if versions != self.static_background_versions:
+            background = np.zeros_like(self.output)
+            for layer in background_layers:
+                blend(background, layer)
+            self.static_background = background
+            self.static_background_versions = versions
+        return self.static_background
+
+    def compose(self) -> np.ndarray:
+        """The final frame, every visible layer blended in z order"""
+        if len(self.layers) == 1:
+            return self.main_layer.framebuffer.resolve()
+        np.copyto(self.output, self._static_background())
+        background_layers = self._background_layers()
+        for layer in self.layers:
+            if layer not in background_layers:
+                blend(self.output, layer)
+        return self.output
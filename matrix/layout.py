@@ -0,0 +1,24 @@
+"""Helpers for laying things out relative to the display size rather than 64x64"""
+
+from typing import List, Tuple
+
+
+def centred(outer_size: int, inner_size: int) -> int:
+    """Offset which centres something inner_size long within outer_size"""
+    return (outer_size - inner_size) // 2
+
+
+def grid_cells(
+    width: int, height: int, cell_width: int, cell_height: int
+) -> List[Tuple[int, int]]:
+    """Top left corners of as many cell_width x cell_height cells as fit in width x
+    height, column by column (so lists read down, then across). Leftover space is
+    shared out as a gap between columns"""
+    columns = max(1, width // cell_width)
+    rows = max(1, height // cell_height)
+    column_gap = (width - columns * cell_width) // columns if columns > 1 else 0
+    return [
+        (column * (cell_width + column_gap), row * cell_height)
+        for column in range(columns)
+        for row in range(rows)
+    ]
@@ -0,0 +1,59 @@
+"""Scrolling text, rendered once into a strip which a fixed size window moves over"""
+
+from typing import Tuple
+import numpy as np
+from matrix.text_cache import RenderedText
+
+
+class Marquee:
+    """A line of text scrolling right to left within width pixels.
+
+    The text is rendered once, followed by a gap, and the strip is repeated so the
+    window at any offset is a single contiguous slice - drawing a frame is one
+    blit no matter how long the text is. Text which fits in the width doesn't
+    scroll at all.
+    """
+
+    def __init__(
+        self,
+        rendered: RenderedText,
+        width: int,
+        speed: float,
+        gap: int,
+        pause_seconds: float,
+        start_time: float,
+    ) -> None:
+        """Build the strip for already rendered text, speed is in pixels a second"""
+        self.text_width = rendered.pixels.shape[1]
+        self.width = width
+        self.speed = speed
+        self.pause_seconds = pause_seconds
+        self.start_time = start_time
+        self.scrolling = self.text_width > width and speed > 0
+        if not self.scrolling:
+            self.period = self.text_width
+            self.pixels = rendered.pixels[:, :width]
+            self.mask = rendered.mask[:, :width]
+            return
+        self.period = self.text_width + gap
+        padding = ((0, 0), (0, gap))
+        pixels = np.pad(rendered.pixels, padding + ((0, 0),))
+        mask = np.pad(rendered.mask, padding)
+        self.pixels = np.concatenate((pixels, pixels), axis=1)
+        self.mask = np.concatenate((mask, mask), axis=1)
+
+    def offset(self, now: float) -> int:
+        """How many pixels the text has scrolled at the given time. It holds still
+        for pause_seconds first so the start can be read"""
+        if not self.scrolling:
+            return 0
+        elapsed = max(0.0, now - self.start_time - self.pause_seconds)
+        return int(elapsed * self.speed) % self.period
+
+    def window(self, now: float) -> Tuple[np.ndarray, np.ndarray]:
+        """The pixels and mask visible at the given time"""
+        offset = self.offset(now)
+        return (
+            self.pixels[:, offset : offset + self.width],
+            self.mask[:, offset : offset + self.width],
+        )
@@ -1,52 +1,262 @@
 """Contains the code for handling the matrix display - interaction with library"""
 
-import textwrap
-from typing import Tuple, List
-from rgbmatrix import RGBMatrix, RGBMatrixOptions, graphics
+import os
+import time
+import hashlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Tuple, List, Dict
+import numpy as np
+from PIL import Image
+
+try:
+    from rgbmatrix import RGBMatrix, RGBMatrixOptions, graphics
+except ImportError:
+    # not on a Pi, only the headless backend is available
+    RGBMatrix = None
+    from matrix.headless import RGBMatrixOptions
+    from matrix import headless_graphics as graphics
 from matrix.colours import Colours
 from matrix.bounding_box import BoundingBox
+from matrix.framebuffer import FrameBuffer
+from matrix.bdf_font import BDFFont
+from matrix.font_metrics import FontMetrics
+from matrix.text_cache import TextCache, RenderedText
+from matrix.image_cache import ImageCache
+from matrix.text_layout import TextLayout
+from matrix.marquee import Marquee
+from matrix.layers import Layer, Compositor
+from matrix.palette import Palette
+from matrix.indexed_framebuffer import IndexedFrameBuffer
+from matrix.themes import theme_colours
+from matrix.headless import HeadlessMatrix
+from matrix.panel_config import PanelConfig, TileMapper
+from matrix.render_thread import RenderThread
+from matrix.latency_tracker import LatencyTracker
+
+# only applet processes use shared frames, which pull in multiprocessing
+if TYPE_CHECKING:
+    from matrix.shared_frame import SharedFrame
 
 
 class MatrixDisplay:
-    def __init__(self) -> None:
-        """Initialise the MatrixDisplay"""
-        # eventually we could pass "config" object in - is it going to
-        # change for each applet? unlikely, but possibly.
+    BACKENDS = ["rgbmatrix", "headless", "shared_memory"]
+    COLOUR_MODES = ["rgb", "indexed"]
+
+    def __init__(
+        self,
+        backend: str = "rgbmatrix",
+        colour_mode: str = "rgb",
+        panel_config: PanelConfig = None,
+        threaded: bool = False,
+        shared_frame: "SharedFrame" = None,
+    ) -> None:
+        """Initialise the MatrixDisplay, backend is "rgbmatrix" or "headless" (in memory).
+        In the "indexed" colour mode shapes and text are stored as palette indices,
+        which allows themes and dimming without redrawing. The panel geometry comes
+        from panel_config, or matrix/panel_config.json if not given. If threaded,
+        frames are shown by a render thread and present() never waits on vsync.
+        The "shared_memory" backend (applets in a child process) writes frames to
+        shared_frame, for the parent to show"""
+        self.panel_config = panel_config or PanelConfig.load()
         options = RGBMatrixOptions()
-        options.rows = 64
-        options.cols = 64
-        options.chain_length = 1
-        options.parallel = 1
-        options.hardware_mapping = "adafruit-hat-pwm"
+        options.rows = self.panel_config.rows
+        options.cols = self.panel_config.cols
+        options.chain_length = self.panel_config.chain_length
+        options.parallel = self.panel_config.parallel
+        options.hardware_mapping = self.panel_config.hardware_mapping
         options.drop_privileges = False
-        options.gpio_slowdown = 1
+        options.gpio_slowdown = self.panel_config.gpio_slowdown
         options.show_refresh_rate = 0
+        # applets draw on the logical display (width x height), which is remapped
+        # onto however the panels are actually chained when presented
+        self.tile_mapper = TileMapper(self.panel_config)
+        self.width = self.tile_mapper.width
+        self.height = self.tile_mapper.height
         self.LINE_SPACING = 2
         self.DRAW_BOUNDING_BOXES = False
+        # when a frame is skipped there is no vsync to wait on, so loops which
+        # redraw as fast as they can sleep for this long instead
+        self.SKIPPED_FRAME_SLEEP_SECONDS = 1 / 60
+        self.TEXT_CACHE_MAX_BYTES = 256 * 1024
+        self.text_cache = TextCache(max_bytes=self.TEXT_CACHE_MAX_BYTES)
+        self.IMAGE_CACHE_MAX_BYTES = 2 * 1024 * 1024
+        self.image_cache = ImageCache(max_bytes=self.IMAGE_CACHE_MAX_BYTES)
         self.load_font()
-        self.matrix = RGBMatrix(options=options)
-        self.max_chars_per_line = self._get_max_chars_per_line()
-        self.offscreen_canvas = self.matrix.CreateFrameCanvas()
-        self.bounding_boxes = {}
+        self.backend = backend
+        self.shared_frame = shared_frame
+        if colour_mode not in self.COLOUR_MODES:
+            raise ValueError(
+                f"Unknown colour mode {colour_mode}, expected one of {self.COLOUR_MODES}"
+            )
+        self.colour_mode = colour_mode
+        self.palette = Palette() if colour_mode == "indexed" else None
+        # derived colours (e.g. the empty part of progress bars) are made only once
+        self.dimmed_colours = {}
+        self.matrix = self._create_matrix(options)
+        # threaded presents are limited to this rate, as there's no vsync to wait on
+        self.REFRESH_RATE = 60
+        self.latency_tracker = LatencyTracker()
+        self.render_thread = None
+        if threaded:
+            self.render_thread = RenderThread(
+                self.matrix,
+                self.tile_mapper.physical_width,
+                self.tile_mapper.physical_height,
+                self.REFRESH_RATE,
+                self.latency_tracker,
+            )
+            self.render_thread.start()
+        else:
+            self.canvas = self.matrix.CreateFrameCanvas()
+        self.next_present_time = 0.0
+        # everything is drawn onto layers, composited into one frame on present()
+        # the main layer is the one cleared every frame, drawing goes to it unless
+        # drawing_on() redirects it to another layer
+        self.main_layer = self._create_layer("main", 0, static=False)
+        self.layers = {"main": self.main_layer}
+        self.target_layer = self.main_layer
+        self.compositor = Compositor(self.main_layer, self.palette)
+        # layouts outlive clear() and are only rebuilt when text/position changes
+        self.TEXT_LAYOUT_CACHE_SIZE = 256
+        self.text_layouts = OrderedDict()
+        # scrolling text, kept for as long as it's drawn every frame
+        self.MARQUEE_SPEED = 20  # pixels per second
+        self.MARQUEE_GAP = 16
+        self.MARQUEE_PAUSE_SECONDS = 1.0
+        self.marquees = {}
+        self.drawn_marquees = set()
+        self.last_frame_fingerprint = None
+        self.frames_presented = 0
+        self.frames_skipped = 0
+
+    @property
+    def framebuffer(self) -> FrameBuffer:
+        """The framebuffer of the layer currently being drawn on"""
+        return self.target_layer.framebuffer
+
+    @property
+    def offscreen_canvas(self) -> FrameBuffer:
+        """Applets which draw straight onto offscreen_canvas now draw into the
+        framebuffer, which is pushed to the real canvas once per frame"""
+        return self.target_layer.framebuffer
+
+    @property
+    def bounding_boxes(self) -> Dict:
+        """Boxes placed on the current layer since it was last cleared"""
+        return self.target_layer.bounding_boxes
+
+    @property
+    def occupancy(self):
+        """Occupancy grid of the current layer, overlap tests go via the grid"""
+        return self.target_layer.occupancy
+
+    def _create_layer(self, name: str, z: int, static: bool) -> Layer:
+        """Make a layer with the right kind of framebuffer for the colour mode"""
+        width, height = self.width, self.height
+        framebuffer = None
+        if self.palette:
+            framebuffer = IndexedFrameBuffer(width, height, self.palette)
+        return Layer(name, z, width, height, static, framebuffer=framebuffer)
+
+    def set_theme(self, theme_name: str) -> None:
+        """Switch colour theme (see matrix/themes.py), indexed colour mode only"""
+        if not self.palette:
+            raise RuntimeError("Themes need the indexed colour mode")
+        self.palette.set_theme(theme_colours(theme_name))
+
+    def dim(self, brightness: float) -> None:
+        """Dim everything in software, brightness is from 0 to 1. Unlike
+        matrix.brightness this works on any frame already drawn, but needs the
+        indexed colour mode"""
+        if not self.palette:
+            raise RuntimeError("Software dimming needs the indexed colour mode")
+        self.palette.set_brightness(brightness)
+
+    def create_layer(self, name: str, z: int = -1, static: bool = True) -> Layer:
+        """Get the named layer, creating it if needed. Layers with a z below 0 are
+        drawn under the main layer, above 0 over it. Static layers are not
+        cleared by clear(), only redraw them when they are dirty"""
+        layer = self.layers.get(name)
+        if layer is None:
+            layer = self._create_layer(name, z, static)
+            self.layers[name] = layer
+            self.compositor.add(layer)
+        return layer
+
+    def remove_layer(self, name: str) -> None:
+        """Remove a layer, the main layer can't be removed"""
+        layer = self.layers.get(name)
+        if layer is None or layer is self.main_layer:
+            return
+        del self.layers[name]
+        self.compositor.remove(layer)
+        if self.target_layer is layer:
+            self.target_layer = self.main_layer
+
+    def reset_layers(self) -> None:
+        """Remove every layer apart from main, e.g. when an applet exits"""
+        for name in list(self.layers):
+            self.remove_layer(name)
+
+    @contextmanager
+    def drawing_on(self, layer: Layer):
+        """Send all drawing to the given layer for the duration of the with block,
+        after which the layer counts as rendered (no longer dirty)"""
+        previous_layer = self.target_layer
+        self.target_layer = layer
+        try:
+            yield layer
+        finally:
+            self.target_layer = previous_layer
+            layer.mark_clean()
+
+    def _create_matrix(self, options: RGBMatrixOptions):
+        """Create the matrix for the selected backend"""
+        if self.backend == "headless":
+            return HeadlessMatrix(options=options)
+        if self.backend == "shared_memory":
+            from matrix.shared_frame import SharedMemoryMatrix
 
-    def _get_max_chars_per_line(self) -> int:
-        """Calculate the maximum number of characters per line that fit in the matrix width"""
-        max_char_width = self.font.CharacterWidth(ord("W"))
-        return self.matrix.width // max_char_width
+            return SharedMemoryMatrix(options, self.shared_frame)
+        if self.backend == "rgbmatrix":
+            if RGBMatrix is None:
+                raise RuntimeError(
+                    "rgbmatrix is not installed - use the headless backend instead"
+                )
+            return RGBMatrix(options=options)
+        raise ValueError(
+            f"Unknown backend {self.backend}, expected one of {self.BACKENDS}"
+        )
 
     def get_text_width(self, text: str) -> int:
-        """Calculate pixel width of given string.
-        This is currently not utilised but may be used later on so leaving it in for now"""
-        width = 0
-        for char in text:
-            width += self.font.CharacterWidth(ord(char))
-        return width
-
-    def load_font(self, font_name: str = "5x5.bdf") -> graphics.Font:
-        """Load a font, given the font name"""
-        font = graphics.Font()
-        font.LoadFont(f"matrix/fonts/{font_name}")
+        """Calculate pixel width of given string, via the font's width table"""
+        return self.font_metrics.text_width(text)
+
+    def wrap_text(self, text: str, max_width: int) -> List[str]:
+        """Word wrap text into lines at most max_width pixels wide"""
+        return self.font_metrics.wrap(text, max_width)
+
+    def load_font(self, font_name: str = "5x5.bdf") -> BDFFont:
+        """Load a font, given the font name, rasterising it into a glyph atlas and
+        precomputing its width table"""
+        font = BDFFont(os.path.join(os.path.dirname(__file__), "fonts", font_name))
         self.font = font
+        self.font_metrics = FontMetrics(font)
+        return font
+
+    def _draw_text_line(
+        self, x: int, y: int, line: str, colour: graphics.Color
+    ) -> None:
+        """Blit a single line of text with its baseline at y, using the text cache"""
+        rendered = self.text_cache.get(line, self.font, colour)
+        self.framebuffer.draw_text_bitmap(
+            rendered, x, y - self.font.baseline + self.font.top, colour
+        )
+
+    def draw_image(self, image: np.ndarray, x: int, y: int) -> None:
+        """Draw an image (e.g. from the image cache) with its top left at x,y"""
+        self.framebuffer.blit(image, x, y)
 
     def draw_progress_bar(
         self,
@@ -54,60 +264,51 @@ class MatrixDisplay:
         colour: graphics.Color,
         x: int = 4,
         y: int = 4,
-        width: int = 56,
+        width: int = None,
         height: int = 4,
     ) -> None:
-        """Draw a progress bar to the canvas"""
+        """Draw a progress bar to the canvas, by default as wide as the display
+        apart from an x pixel margin either side"""
+        if width is None:
+            width = self.width - 2 * x
         filled_section_width = int(width * progress_percentage / 100)
         # draw the filled bit of the bar
-        for dx in range(filled_section_width):
-            for dy in range(height):
-                self.offscreen_canvas.SetPixel(
-                    x + dx, y + dy, colour.red, colour.green, colour.blue
-                )
+        self.framebuffer.fill_rect(x, y, filled_section_width, height, colour)
         # now draw the empty part of hte bar
-        for dx in range(filled_section_width, width):
-            for dy in range(height):
-                self.offscreen_canvas.SetPixel(
-                    x + dx,
-                    y + dy,
-                    max(0, colour.red - 175),
-                    max(0, colour.green - 175),
-                    max(0, colour.blue - 175),
-                )
+        self.framebuffer.fill_rect(
+            x + filled_section_width,
+            y,
+            width - filled_section_width,
+            height,
+            self._dimmed_colour(colour),
+        )
+
+    def _dimmed_colour(self, colour: graphics.Color) -> graphics.Color:
+        """A darker version of a colour, e.g. for the empty part of progress bars"""
+        rgb = (colour.red, colour.green, colour.blue)
+        dimmed = self.dimmed_colours.get(rgb)
+        if dimmed is None:
+            dimmed = graphics.Color(*(max(0, channel - 175) for channel in rgb))
+            self.dimmed_colours[rgb] = dimmed
+        return dimmed
 
     def _draw_bounding_box(self, bounding_box: BoundingBox, **kwargs) -> None:
         """Draw a bounding box on the matrix display."""
         colour = kwargs.get("colour", Colours.WHITE_MUTED)
-        for x in range(bounding_box.x1, bounding_box.x2 + 1):
-            self.offscreen_canvas.SetPixel(
-                x, bounding_box.y1, colour.red, colour.green, colour.blue
-            )
-            self.offscreen_canvas.SetPixel(
-                x, bounding_box.y2, colour.red, colour.green, colour.blue
-            )
-
-        # Draw the left and right vertical lines
-        for y in range(bounding_box.y1, bounding_box.y2 + 1):
-            self.offscreen_canvas.SetPixel(
-                bounding_box.x1, y, colour.red, colour.green, colour.blue
-            )
-            self.offscreen_canvas.SetPixel(
-                bounding_box.x2, y, colour.red, colour.green, colour.blue
-            )
+        self.framebuffer.draw_rect(
+            bounding_box.x1, bounding_box.y1, bounding_box.x2, bounding_box.y2, colour
+        )
 
     def calculate_bounding_box(
         self, text: str, x: int, y: int, centered: bool = False, line_spacing: int = 2
     ) -> Tuple[BoundingBox, List[str], int]:
         """Calculate the bounding box for the given text."""
         if centered:
-            width_available = self.max_chars_per_line
+            width_available = self.width
         else:
-            width_available = (self.matrix.width - x) // self.font.CharacterWidth(
-                ord("W")
-            )
+            width_available = self.width - x
 
-        wrapped_text = textwrap.wrap(text, width=width_available)
+        wrapped_text = self.wrap_text(text, width_available)
         total_height = (
             len(wrapped_text) * self.font.height
             + (len(wrapped_text) - 1) * line_spacing
@@ -115,7 +316,7 @@ class MatrixDisplay:
         max_text_width = max(self.get_text_width(line) for line in wrapped_text)
 
         if centered:
-            x = (self.matrix.width - max_text_width) // 2
+            x = (self.width - max_text_width) // 2
 
         bounding_box = BoundingBox(
             x1=x - 1,
@@ -130,77 +331,218 @@ class MatrixDisplay:
         self, bounding_box: BoundingBox, box_key: Tuple[int, int, str]
     ) -> bool:
         """Check for overlaps and store the bounding box if valid."""
-        if any(
-            bounding_box.overlaps(existing_box)
-            for existing_box in self.bounding_boxes.values()
-        ) or not bounding_box.is_within_screen_bounds(
-            self.matrix.width, self.matrix.height
-        ):
+        if box_key in self.bounding_boxes:
+            # already placed this frame, e.g. redrawn without a clear()
+            return True
+        if not self.occupancy.claim(bounding_box):
             return False
+        self.bounding_boxes[box_key] = bounding_box
+        return True
+
+    def _get_text_layout(self, layout_key: Tuple, build) -> TextLayout:
+        """Get a retained text layout, building (and remembering) it on a miss"""
+        layout = self.text_layouts.get(layout_key)
+        if layout is None:
+            layout = build()
+            self.text_layouts[layout_key] = layout
+            if len(self.text_layouts) > self.TEXT_LAYOUT_CACHE_SIZE:
+                self.text_layouts.popitem(last=False)
         else:
-            self.bounding_boxes[box_key] = bounding_box
-            return True
+            self.text_layouts.move_to_end(layout_key)
+        return layout
 
-    def draw_text(self, x: int, y: int, text: str, colour: graphics.Color):
-        """Draw text at x,y coords."""
-        box_key = (x, y, text)
-        width_available = (self.matrix.width - x) // self.font.CharacterWidth(ord("W"))
-        wrapped_text = textwrap.wrap(text, width=width_available)
+    def _layout_text(self, text: str, x: int, y: int) -> TextLayout:
+        """Work out the wrapping and bounding box of left aligned text"""
+        bounding_box, wrapped_text, _ = self.calculate_bounding_box(text, x, y)
+        line_height = self.font.height + self.LINE_SPACING
+        origins = [(x, y + i * line_height) for i in range(len(wrapped_text))]
+        return TextLayout(bounding_box, wrapped_text, origins)
 
-        if box_key in self.bounding_boxes:
-            bounding_box = self.bounding_boxes[box_key]
-        else:
-            bounding_box, wrapped_text, total_height = self.calculate_bounding_box(
-                text, x, y
+    def _layout_centered_text(self, text: str, start_y: int = None) -> TextLayout:
+        """Work out the wrapping, line positions and bounding box of centred text"""
+        line_height = self.font.height + self.LINE_SPACING
+        if start_y is None:
+            line_count = len(self.wrap_text(text, self.width))
+            start_y = (self.height - line_count * line_height) // 2 + self.font.height
+        bounding_box, wrapped_text, _ = self.calculate_bounding_box(
+            text, 0, start_y, centered=True
+        )
+        origins = [
+            (
+                (self.width - self.get_text_width(line)) // 2,
+                start_y + i * line_height,
             )
-            if not self.store_bounding_box(bounding_box, box_key):
-                # display red bounding box to indicate missing content
-                self._draw_bounding_box(bounding_box, colour=Colours.RED)
-                return
+            for i, line in enumerate(wrapped_text)
+        ]
+        return TextLayout(bounding_box, wrapped_text, origins)
+
+    def _draw_text_layout(
+        self, layout: TextLayout, box_key: Tuple, colour: graphics.Color
+    ) -> None:
+        """Place a text layout on the occupancy grid and draw it if it fits"""
+        if not self.store_bounding_box(layout.bounding_box, box_key):
+            # display red bounding box to indicate missing content
+            self._draw_bounding_box(layout.bounding_box, colour=Colours.RED)
+            return
 
         if self.DRAW_BOUNDING_BOXES:
-            self._draw_bounding_box(bounding_box)
+            self._draw_bounding_box(layout.bounding_box)
 
-        for line in wrapped_text:
-            graphics.DrawText(self.offscreen_canvas, self.font, x, y, colour, line)
-            y += self.font.height + self.LINE_SPACING
+        for line, (x, y) in zip(layout.lines, layout.origins):
+            self._draw_text_line(x, y, line, colour)
+
+    def draw_text(self, x: int, y: int, text: str, colour: graphics.Color):
+        """Draw text at x,y coords."""
+        box_key = (x, y, text)
+        layout = self._get_text_layout(
+            (self.font.name, *box_key), lambda: self._layout_text(text, x, y)
+        )
+        self._draw_text_layout(layout, box_key, colour)
 
     def draw_centered_text(self, text: str, color: graphics.Color, **kwargs) -> None:
         """Draw centered text to the matrix."""
-        wrapped_text = textwrap.wrap(text, self.max_chars_per_line)
-        start_y = kwargs.get(
-            "start_y",
-            (
-                self.matrix.height
-                - len(wrapped_text) * (self.font.height + self.LINE_SPACING)
-            )
-            // 2
-            + self.font.height,
+        start_y = kwargs.get("start_y")
+        box_key = ("c", start_y, text)
+        layout = self._get_text_layout(
+            (self.font.name, *box_key),
+            lambda: self._layout_centered_text(text, start_y),
         )
-        box_key = ("c", "c", text)
+        self._draw_text_layout(layout, box_key, color)
 
-        if box_key in self.bounding_boxes:
-            bounding_box = self.bounding_boxes[box_key]
-        else:
-            bounding_box, wrapped_text, total_height = self.calculate_bounding_box(
-                text, 0, start_y, centered=True
+    def draw_marquee(
+        self,
+        x: int,
+        y: int,
+        text: str,
+        colour: graphics.Color,
+        width: int = None,
+        speed: float = None,
+    ) -> None:
+        """Draw a single line of text at x,y which scrolls within width pixels (to
+        the right edge by default) if it is too long to fit. The scroll position
+        follows the clock, so it moves at the same speed whatever the frame rate"""
+        width = self.width - x if width is None else width
+        speed = self.MARQUEE_SPEED if speed is None else speed
+        rgb = (colour.red, colour.green, colour.blue)
+        marquee_key = (self.font.name, x, y, text, rgb, width, speed)
+        marquee = self.marquees.get(marquee_key)
+        if marquee is None:
+            marquee = Marquee(
+                self.text_cache.get(text, self.font, colour),
+                width,
+                speed,
+                self.MARQUEE_GAP,
+                self.MARQUEE_PAUSE_SECONDS,
+                time.monotonic(),
             )
-            if not self.store_bounding_box(bounding_box, box_key):
-                self._draw_bounding_box(bounding_box, colour=Colours.RED)
-                return
+            self.marquees[marquee_key] = marquee
+        self.drawn_marquees.add(marquee_key)
 
+        bounding_box = BoundingBox(
+            x1=x - 1,
+            y1=y - self.font.height - 1,
+            x2=x + min(width, marquee.text_width) - 1,
+            y2=y + 1,
+        )
+        if not self.store_bounding_box(bounding_box, ("m", x, y, text)):
+            self._draw_bounding_box(bounding_box, colour=Colours.RED)
+            return
         if self.DRAW_BOUNDING_BOXES:
             self._draw_bounding_box(bounding_box)
 
-        for line in wrapped_text:
-            text_width = self.get_text_width(line)
-            x = (self.matrix.width - text_width) // 2
-            graphics.DrawText(self.offscreen_canvas, self.font, x, start_y, color, line)
-            start_y += self.font.height + self.LINE_SPACING
+        pixels, mask = marquee.window(time.monotonic())
+        self.framebuffer.draw_text_bitmap(
+            RenderedText(pixels, mask),
+            x,
+            y - self.font.baseline + self.font.top,
+            colour,
+        )
+
+    def draw_centered_marquee(
+        self, text: str, colour: graphics.Color, start_y: int = None
+    ) -> None:
+        """Draw a single line of centred text, scrolling across the whole width of
+        the matrix instead if it doesn't fit"""
+        if self.get_text_width(text) <= self.width:
+            self.draw_centered_text(text, colour, start_y=start_y)
+            return
+        if start_y is None:
+            line_height = self.font.height + self.LINE_SPACING
+            start_y = (self.height - line_height) // 2 + self.font.height
+        # bounding boxes have to stay on screen, hence the 1 pixel margin
+        self.draw_marquee(1, start_y, text, colour, width=self.width - 2)
 
     def clear(self):
-        self.bounding_boxes.clear()
-        self.offscreen_canvas.Clear()
+        """Clear every layer which isn't static, ready for the next frame"""
+        for layer in self.layers.values():
+            if not layer.static:
+                layer.clear()
+        # marquees which weren't drawn last frame start again from the beginning
+        for marquee_key in self.marquees.keys() - self.drawn_marquees:
+            del self.marquees[marquee_key]
+        self.drawn_marquees.clear()
+
+    def compose(self) -> np.ndarray:
+        """The frame to show, every layer blended together in z order"""
+        return self.compositor.compose()
+
+    def frame_fingerprint(self, pixels: np.ndarray = None) -> bytes:
+        """Hash of the composed frame (and brightness, which is applied on write)"""
+        if pixels is None:
+            pixels = self.compose()
+        fingerprint = hashlib.blake2b(pixels, digest_size=16)
+        fingerprint.update(bytes([int(self.matrix.brightness)]))
+        return fingerprint.digest()
+
+    def present(self, force: bool = False) -> None:
+        """Push the composed layers to the canvas in a single blit and swap on vsync,
+        or hand them to the render thread if threaded.
+        If the frame is identical to the one already on the panel the swap is skipped"""
+        pixels = self.compose()
+        fingerprint = self.frame_fingerprint(pixels)
+        presented_time = time.monotonic()
+        self.latency_tracker.frame_presented(presented_time)
+        if not force and fingerprint == self.last_frame_fingerprint:
+            # whatever input there was is already reflected on the panel
+            self.latency_tracker.frame_shown(presented_time, presented_time)
+            self.frames_skipped += 1
+            time.sleep(self.SKIPPED_FRAME_SLEEP_SECONDS)
+            return
+        if self.render_thread:
+            self.render_thread.submit(self.tile_mapper.remap(pixels))
+            self._limit_present_rate()
+        else:
+            self.canvas.SetImage(Image.fromarray(self.tile_mapper.remap(pixels)), 0, 0)
+            self.canvas = self.matrix.SwapOnVSync(self.canvas)
+            self.latency_tracker.frame_shown(presented_time, time.monotonic())
+        self.last_frame_fingerprint = fingerprint
+        self.frames_presented += 1
+
+    def _limit_present_rate(self) -> None:
+        """Stop loops which redraw as fast as they can (they used to be held back by
+        vsync) presenting faster than the render thread can show the frames"""
+        now = time.monotonic()
+        if now < self.next_present_time:
+            time.sleep(self.next_present_time - now)
+            now = self.next_present_time
+        self.next_present_time = now + 1 / self.REFRESH_RATE
+
+    def invalidate(self) -> None:
+        """Forget what is on the panel, e.g. after clearing the matrix directly"""
+        self.last_frame_fingerprint = None
+
+    def frame_stats(self) -> Dict[str, int]:
+        """Counters of presented vs skipped (identical) frames, plus the render
+        thread's shown/dropped/late frames if threaded"""
+        stats = {"presented": self.frames_presented, "skipped": self.frames_skipped}
+        if self.render_thread:
+            stats.update(self.render_thread.stats())
+        return stats
+
+    def close(self) -> None:
+        """Stop the render thread, if there is one"""
+        if self.render_thread:
+            self.render_thread.stop()
 
     def show_message(
         self, message: str = "Loading...", message_type: str = "loading"
@@ -216,4 +558,4 @@ class MatrixDisplay:
 
         self.draw_centered_text(message, color)
 
-        self.offscreen_canvas = self.matrix.SwapOnVSync(self.offscreen_canvas)
+        self.present()
@@ -0,0 +1,37 @@
+"""Bitmap of which pixels are already claimed by something drawn this frame"""
+
+import numpy as np
+from matrix.bounding_box import BoundingBox
+
+
+class OccupancyGrid:
+    """Per-pixel occupancy, so an overlap test is one slice rather than a scan
+    over every box already on screen"""
+
+    def __init__(self, width: int, height: int) -> None:
+        """Initialise an empty grid for a width x height display"""
+        self.width = width
+        self.height = height
+        self.cells = np.zeros((height, width), dtype=bool)
+
+    def is_free(self, bounding_box: BoundingBox) -> bool:
+        """Check that the box is on screen and doesn't overlap anything claimed"""
+        if not bounding_box.is_within_screen_bounds(self.width, self.height):
+            return False
+        # boxes touching at an edge don't overlap, same as BoundingBox.overlaps
+        return not self.cells[
+            bounding_box.y1 : bounding_box.y2, bounding_box.x1 : bounding_box.x2
+        ].any()
+
+    def claim(self, bounding_box: BoundingBox) -> bool:
+        """Mark the box as occupied if it is free, returning whether it was"""
+        if not self.is_free(bounding_box):
+            return False
+        self.cells[
+            bounding_box.y1 : bounding_box.y2, bounding_box.x1 : bounding_box.x2
+        ] = True
+        return True
+
+    def clear(self) -> None:
+        """Release every claimed pixel"""
+        self.cells.fill(False)
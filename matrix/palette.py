@@ -0,0 +1,69 @@
+"""Colour palette for the indexed framebuffer mode, a lookup table of up to 255 colours"""
+
+from typing import Dict, Tuple
+import numpy as np
+from matrix.framebuffer import pixel_view
+
+RGB = Tuple[int, int, int]
+
+
+class Palette:
+    """Maps the colours applets draw with to 8-bit indices, and the indices to the
+    RGB values actually shown.
+
+    The shown values go through the current theme (a mapping of colour -> colour)
+    and brightness, so switching theme or dimming is just rebuilding the 256 entry
+    table. Index 0 is reserved: pixels with index 0 weren't drawn with a palette
+    colour (e.g. they came from an image).
+    """
+
+    SIZE = 256
+
+    def __init__(self) -> None:
+        """Initialise an empty palette"""
+        self.indices: Dict[RGB, int] = {}
+        self.colours = np.zeros((self.SIZE, 3), dtype=np.uint8)
+        self.lut = np.zeros((self.SIZE, 3), dtype=np.uint8)
+        self.lut_view = pixel_view(self.lut)
+        self.theme: Dict[RGB, RGB] = {}
+        self.brightness = 1.0
+        # bumped whenever the colour of an existing index changes
+        self.version = 0
+
+    def _shown(self, rgb: RGB) -> np.ndarray:
+        """The RGB value a colour is shown as with the current theme/brightness"""
+        themed = np.asarray(self.theme.get(rgb, rgb), dtype=np.float32)
+        return (themed * self.brightness).astype(np.uint8)
+
+    def index(self, rgb: RGB) -> int:
+        """Index of the given colour, adding it to the palette if there is room or
+        using the closest colour already in it if not"""
+        index = self.indices.get(rgb)
+        if index is not None:
+            return index
+        if len(self.indices) < self.SIZE - 1:
+            index = len(self.indices) + 1
+            self.colours[index] = rgb
+            self.lut[index] = self._shown(rgb)
+        else:
+            distances = ((self.colours[1:].astype(np.int32) - rgb) ** 2).sum(axis=1)
+            index = int(distances.argmin()) + 1
+        self.indices[rgb] = index
+        return index
+
+    def _rebuild(self) -> None:
+        """Recalculate every shown colour"""
+        for rgb, index in self.indices.items():
+            if tuple(self.colours[index]) == rgb:
+                self.lut[index] = self._shown(rgb)
+        self.version += 1
+
+    def set_theme(self, theme: Dict[RGB, RGB]) -> None:
+        """Show each colour in the theme as the colour it maps to"""
+        self.theme = dict(theme)
+        self._rebuild()
+
+    def set_brightness(self, brightness: float) -> None:
+        """Dim every palette colour, brightness is from 0 to 1"""
+        self.brightness = min(1.0, max(0.0, brightness))
+        self._rebuild()
@@ -0,0 +1,123 @@
+"""Panel geometry, loaded from JSON, and the mapping from the logical display onto it.
+
+Chained panels show up to rgbmatrix as one long strip (cols * chain_length wide,
+rows * parallel high). "tiles" arranges those panels into the wall applets draw
+on: a list of rows, each a list of panel numbers (position in the chain, counting
+along the chain then across the parallel chains). A panel can be given as
+{"panel": 3, "rotate": 180} for walls where every other row is mounted upside
+down. Without "tiles" the logical display is just the strip.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional, Union
+import numpy as np
+from matrix.framebuffer import pixel_view
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "panel_config.json")
+
+
+@dataclass
+class PanelConfig:
+    rows: int = 64
+    cols: int = 64
+    chain_length: int = 1
+    parallel: int = 1
+    hardware_mapping: str = "adafruit-hat-pwm"
+    gpio_slowdown: int = 1
+    tiles: Optional[List[List[Union[int, dict]]]] = field(default=None)
+
+    @property
+    def physical_width(self) -> int:
+        return self.cols * self.chain_length
+
+    @property
+    def physical_height(self) -> int:
+        return self.rows * self.parallel
+
+    @classmethod
+    def load(cls, path: str = None) -> "PanelConfig":
+        """Load the config from a JSON file, MATRIX_PANEL_CONFIG or the default one
+        next to this module if no path is given"""
+        path = path or os.environ.get("MATRIX_PANEL_CONFIG") or DEFAULT_CONFIG_PATH
+        with open(path, "r") as file:
+            return cls(**json.load(file))
+
+
+class TileMapper:
+    """Remaps logical frames onto the physical panel layout with a single gather.
+
+    The index of the logical pixel shown at every physical pixel is worked out
+    once, so remapping a frame is one np.take over the pixels - linear in the
+    number of pixels however the panels are arranged.
+    """
+
+    def __init__(self, config: PanelConfig) -> None:
+        """Work out the logical size and the pixel mapping for the given config"""
+        self.physical_width = config.physical_width
+        self.physical_height = config.physical_height
+        if not config.tiles:
+            self.width, self.height = self.physical_width, self.physical_height
+            self.source_indices = None
+            return
+
+        tile_rows = config.tiles
+        self.width = config.cols * max(len(tile_row) for tile_row in tile_rows)
+        self.height = config.rows * len(tile_rows)
+        panel_count = config.chain_length * config.parallel
+        # physical pixels no tile covers are left black
+        self.source_indices = np.full(
+            (self.physical_height, self.physical_width),
+            self.width * self.height,
+            dtype=np.intp,
+        )
+        logical_indices = np.arange(self.width * self.height, dtype=np.intp).reshape(
+            self.height, self.width
+        )
+        for tile_y, tile_row in enumerate(tile_rows):
+            for tile_x, tile in enumerate(tile_row):
+                panel, rotate = (
+                    (tile["panel"], tile.get("rotate", 0))
+                    if isinstance(tile, dict)
+                    else (tile, 0)
+                )
+                if not 0 <= panel < panel_count:
+                    raise ValueError(
+                        f"Tile panel {panel} is outside of the {panel_count} panels"
+                    )
+                if rotate not in (0, 180):
+                    raise ValueError(
+                        f"Tiles can only be rotated by 0 or 180, not {rotate}"
+                    )
+                block = logical_indices[
+                    tile_y * config.rows : (tile_y + 1) * config.rows,
+                    tile_x * config.cols : (tile_x + 1) * config.cols,
+                ]
+                if rotate == 180:
+                    block = block[::-1, ::-1]
+                physical_x = (panel % config.chain_length) * config.cols
+                physical_y = (panel // config.chain_length) * config.rows
+                self.source_indices[
+                    physical_y : physical_y + config.rows,
+                    physical_x : physical_x + config.cols,
+                ] = block
+
+        # logical frame plus one black pixel, which uncovered pixels point at
+        self.padded_source = np.zeros((self.width * self.height + 1, 3), np.uint8)
+        self.physical = np.zeros(
+            (self.physical_height, self.physical_width, 3), dtype=np.uint8
+        )
+
+    def remap(self, pixels: np.ndarray) -> np.ndarray:
+        """The physical frame for a logical (height x width x 3) one"""
+        if self.source_indices is None:
+            return pixels
+        self.padded_source[:-1] = pixels.reshape(-1, 3)
+        np.take(
+            pixel_view(self.padded_source),
+            self.source_indices,
+            out=pixel_view(self.physical),
+            mode="clip",
+        )
+        return self.physical
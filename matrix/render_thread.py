@@ -0,0 +1,103 @@
+"""Render thread which owns the matrix, so drawing never waits on the panel"""
+
+import threading
+import time
+from typing import Dict, Optional
+import numpy as np
+from PIL import Image
+from matrix.latency_tracker import LatencyTracker
+
+
+class RenderThread(threading.Thread):
+    """Shows frames submitted from other threads at a steady rate.
+
+    Frames go through three buffers: the one on the panel, the newest finished frame
+    waiting to be shown, and a free one for submit() to copy into, so submitting
+    never waits for a swap. A frame replaced before it was shown counts as dropped,
+    one which reached the panel more than a refresh interval after it could have
+    counts as late.
+    """
+
+    def __init__(
+        self,
+        matrix,
+        width: int,
+        height: int,
+        refresh_rate: int,
+        latency_tracker: LatencyTracker = None,
+    ) -> None:
+        """Initialise the thread for a width x height matrix, showing (at most)
+        refresh_rate frames a second. Only this thread touches the canvases"""
+        super().__init__(name="render", daemon=True)
+        self.matrix = matrix
+        self.latency_tracker = latency_tracker
+        self.canvas = matrix.CreateFrameCanvas()
+        self.frame_interval = 1 / refresh_rate
+        self.buffers = [np.zeros((height, width, 3), dtype=np.uint8) for _ in range(3)]
+        self.pending_buffer: Optional[int] = None
+        self.pending_time = 0.0
+        self.shown_buffer: Optional[int] = None
+        self.condition = threading.Condition()
+        self.running = True
+        self.frames_shown = 0
+        self.frames_dropped = 0
+        self.frames_late = 0
+
+    def submit(self, pixels: np.ndarray) -> None:
+        """Queue a (height x width x 3) frame to be shown, replacing any frame still
+        waiting. Only one thread should submit frames"""
+        with self.condition:
+            busy_buffers = (self.pending_buffer, self.shown_buffer)
+        # neither the render thread nor submit() will touch this one until it's
+        # handed over below, so it can be filled without holding the lock
+        buffer = next(index for index in range(3) if index not in busy_buffers)
+        np.copyto(self.buffers[buffer], pixels)
+        with self.condition:
+            if self.pending_buffer is not None:
+                self.frames_dropped += 1
+            self.pending_buffer = buffer
+            self.pending_time = time.monotonic()
+            self.condition.notify()
+
+    def run(self) -> None:
+        """Swap in the newest submitted frame, no more than once a refresh interval"""
+        next_swap_time = time.monotonic()
+        while True:
+            with self.condition:
+                while self.running and self.pending_buffer is None:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                self.shown_buffer, self.pending_buffer = self.pending_buffer, None
+                # the frame should be on the panel within an interval of either
+                # being submitted or the previous swap, whichever was later
+                submitted_time = self.pending_time
+                deadline = max(submitted_time, next_swap_time) + self.frame_interval
+            swap_start_time = time.monotonic()
+            self.canvas.SetImage(Image.fromarray(self.buffers[self.shown_buffer]), 0, 0)
+            self.canvas = self.matrix.SwapOnVSync(self.canvas)
+            self.frames_shown += 1
+            swapped_time = time.monotonic()
+            if self.latency_tracker:
+                self.latency_tracker.frame_shown(submitted_time, swapped_time)
+            if swapped_time > deadline:
+                self.frames_late += 1
+            # rgbmatrix already waits for vsync, this paces backends which don't
+            next_swap_time = swap_start_time + self.frame_interval
+            time.sleep(max(0.0, next_swap_time - time.monotonic()))
+
+    def stop(self) -> None:
+        """Stop the thread once it has finished the swap it is on"""
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.is_alive():
+            self.join()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters of shown, dropped (replaced while waiting) and late frames"""
+        return {
+            "shown": self.frames_shown,
+            "dropped": self.frames_dropped,
+            "late": self.frames_late,
+        }
@@ -0,0 +1,110 @@
+"""Frames shared between processes, so applets can run outside of the one owning the matrix.
+
+An applet process draws on a MatrixDisplay with the "shared_memory" backend, whose
+SwapOnVSync copies each frame into a SharedFrame. The process owning the real
+matrix copies new frames back out and presents them.
+"""
+
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from matrix.headless import HeadlessMatrix, RGBMatrixOptions
+
+# frames written, presents (including skipped, identical frames)
+HEADER_WORDS = 2
+
+
+class SharedFrame:
+    """One RGB frame plus counters, in a named block of shared memory.
+
+    Created (without a name) by the parent, and attached to by name in the applet
+    process - it's passed as an argument when the process is started. Frames are
+    written and read holding lock (from the same multiprocessing context as the
+    process), so one is never seen half written.
+    """
+
+    def __init__(self, width: int, height: int, lock, name: str = None) -> None:
+        """Create the shared memory for a width x height frame, or attach to the
+        existing block with the given name"""
+        self.width = width
+        self.height = height
+        self.lock = lock
+        header_bytes = HEADER_WORDS * np.dtype(np.uint64).itemsize
+        self.memory = shared_memory.SharedMemory(
+            name=name, create=name is None, size=header_bytes + width * height * 3
+        )
+        self.header = np.ndarray((HEADER_WORDS,), np.uint64, self.memory.buf)
+        self.pixels = np.ndarray(
+            (height, width, 3), np.uint8, self.memory.buf, offset=header_bytes
+        )
+        if name is None:
+            self.header.fill(0)
+
+    def __reduce__(self):
+        return SharedFrame, (self.width, self.height, self.lock, self.memory.name)
+
+    def write(self, pixels: np.ndarray) -> None:
+        """Replace the frame (applet process)"""
+        with self.lock:
+            np.copyto(self.pixels, pixels)
+            self.header[0] += 1
+
+    def read(self, out: np.ndarray, frame_count: int, timeout: float = 0.1) -> int:
+        """Copy the frame into out if it's newer than frame number frame_count,
+        returns the number of the frame now in out (parent process). A process
+        killed while writing can leave the lock held, hence the timeout"""
+        if not self.lock.acquire(timeout=timeout):
+            return frame_count
+        try:
+            latest_frame_count = int(self.header[0])
+            if latest_frame_count != frame_count:
+                np.copyto(out, self.pixels)
+            return latest_frame_count
+        finally:
+            self.lock.release()
+
+    @property
+    def presents(self) -> int:
+        """How many times the applet has presented, the parent watches this to
+        tell that the applet is still running"""
+        return int(self.header[1])
+
+    @presents.setter
+    def presents(self, presents: int) -> None:
+        self.header[1] = presents
+
+    def close(self) -> None:
+        """Detach from the shared memory, in each process using it"""
+        # numpy views hold on to the buffer, which has to be released first
+        self.header = self.pixels = None
+        self.memory.close()
+
+    def unlink(self) -> None:
+        """Free the shared memory once every process has closed it (parent)"""
+        self.memory.unlink()
+
+
+class SharedMemoryMatrix(HeadlessMatrix):
+    """Stand-in for rgbmatrix.RGBMatrix in applet processes, every frame swapped in
+    is written to a SharedFrame. Brightness is left to the parent's matrix"""
+
+    # swaps are paced like a panel refreshing at this rate
+    REFRESH_RATE = 60
+
+    def __init__(self, options: RGBMatrixOptions, shared_frame: SharedFrame) -> None:
+        """Initialise the matrix, writing its frames to shared_frame"""
+        super().__init__(options=options)
+        self.shared_frame = shared_frame
+        self.next_swap_time = 0.0
+
+    def SwapOnVSync(self, canvas, *args):
+        """Show the canvas, i.e. hand it to the parent, waiting for the next
+        'refresh' like the real thing"""
+        previous_canvas = super().SwapOnVSync(canvas)
+        self.shared_frame.write(canvas.pixels)
+        now = time.monotonic()
+        if now < self.next_swap_time:
+            time.sleep(self.next_swap_time - now)
+            now = self.next_swap_time
+        self.next_swap_time = now + 1 / self.REFRESH_RATE
+        return previous_canvas
@@ -0,0 +1,76 @@
+"""LRU cache of rendered strings, so unchanged text is a single blit per frame"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Tuple
+import numpy as np
+from matrix.bdf_font import BDFFont
+
+
+@dataclass
+class RenderedText:
+    # colour already applied, mask says which pixels are actually lit
+    pixels: np.ndarray
+    mask: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return self.pixels.nbytes + self.mask.nbytes
+
+
+class TextCache:
+    """Rendered string cache keyed by (text, font, colour), bounded by memory size.
+    Safe to share between threads"""
+
+    def __init__(self, max_bytes: int = 256 * 1024) -> None:
+        """Initialise an empty cache which holds at most max_bytes of bitmaps"""
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.entries: "OrderedDict[Tuple, RenderedText]" = OrderedDict()
+        # rendering is quick, so it's done holding the lock
+        self.lock = threading.Lock()
+
+    def get(self, text: str, font: BDFFont, colour) -> RenderedText:
+        """Get the rendered bitmap for a string, rendering it on a miss"""
+        key = (text, font.name, (colour.red, colour.green, colour.blue))
+        with self.lock:
+            rendered = self.entries.get(key)
+            if rendered is not None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return rendered
+
+            self.misses += 1
+            mask = font.render(text)
+            pixels = np.zeros(mask.shape + (3,), dtype=np.uint8)
+            pixels[mask] = key[2]
+            rendered = RenderedText(pixels, mask)
+            self.entries[key] = rendered
+            self.current_bytes += rendered.nbytes
+            # never evict the entry we've just added, even if it is huge by itself
+            while self.current_bytes > self.max_bytes and len(self.entries) > 1:
+                _, evicted = self.entries.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+                self.evictions += 1
+            return rendered
+
+    def clear(self) -> None:
+        """Drop every cached bitmap (counters are kept)"""
+        with self.lock:
+            self.entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size, handy for logging"""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.current_bytes,
+            }
@@ -0,0 +1,13 @@
+"""Retained layout of a piece of text - what it wraps to and where it goes"""
+
+from dataclasses import dataclass
+from typing import List, Tuple
+from matrix.bounding_box import BoundingBox
+
+
+@dataclass
+class TextLayout:
+    bounding_box: BoundingBox
+    lines: List[str]
+    # (x, baseline y) of each line in lines
+    origins: List[Tuple[int, int]]
@@ -0,0 +1,43 @@
+"""Colour themes for the indexed framebuffer mode, keyed by Colours attribute name"""
+
+from typing import Dict, Tuple
+from matrix.colours import Colours
+
+RGB = Tuple[int, int, int]
+
+THEMES: Dict[str, Dict[str, RGB]] = {
+    "default": {},
+    # everything in reds, easy on the eyes in a dark room
+    "night": {
+        "WHITE_BOLD": (200, 0, 0),
+        "WHITE_NORMAL": (150, 0, 0),
+        "WHITE_MUTED": (80, 0, 0),
+        "LIGHT_GRAY": (150, 0, 0),
+        "GRAY": (100, 0, 0),
+        "DARK_GRAY": (120, 0, 0),
+        "YELLOW": (220, 60, 0),
+        "ORANGE": (200, 40, 0),
+        "GREEN": (160, 50, 0),
+        "CYAN": (140, 30, 30),
+        "BLUE": (100, 0, 40),
+        "PURPLE": (110, 0, 50),
+    },
+    # muted text made brighter, for a panel behind a window or at low brightness
+    "high_contrast": {
+        "WHITE_NORMAL": (255, 255, 255),
+        "WHITE_MUTED": (200, 200, 200),
+        "GRAY": (200, 200, 200),
+        "DARK_GRAY": (220, 220, 220),
+    },
+}
+
+
+def theme_colours(theme_name: str) -> Dict[RGB, RGB]:
+    """The colour -> colour mapping of a theme, for Palette.set_theme"""
+    if theme_name not in THEMES:
+        raise ValueError(f"Unknown theme {theme_name}, expected one of {list(THEMES)}")
+    colours = {}
+    for colour_name, rgb in THEMES[theme_name].items():
+        colour = getattr(Colours, colour_name)
+        colours[(colour.red, colour.green, colour.blue)] = rgb
+    return colours
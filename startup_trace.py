@@ -0,0 +1,150 @@
+"""Timing of startup, from the process starting to the first frame of the menu.
+
+Import this before anything else. With MATRIX_STARTUP_TRACE=1 set, every import on
+the main thread is timed from then on, as are the phases of startup wrapped in
+startup_trace.phase(). The report is printed once the menu's first frame has been
+presented (startup_trace.first_frame()), after which tracing stops.
+"""
+
+import builtins
+import importlib.util
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+
+def process_age() -> Optional[float]:
+    """Seconds since this process started, None if the kernel won't say"""
+    try:
+        with open("/proc/self/stat", "r") as file:
+            # the command name can hold spaces, the fields after it can't
+            fields = file.read().rsplit(")", 1)[1].split()
+        start_ticks = int(fields[19])
+        return time.clock_gettime(time.CLOCK_BOOTTIME) - start_ticks / os.sysconf(
+            "SC_CLK_TCK"
+        )
+    except (OSError, IndexError, ValueError, AttributeError):
+        return None
+
+
+class StartupTrace:
+    """Import times per module and durations of named startup phases.
+
+    Imports are timed by wrapping builtins.__import__. Each import which loads
+    something gets its total time and its self time (without the imports it made),
+    like python -X importtime, but in-process so it covers what app.py does too.
+    """
+
+    # slowest imports listed in the report
+    IMPORTS_SHOWN = 15
+
+    def __init__(self) -> None:
+        # everything is relative to the process starting, or failing that to this
+        age = process_age()
+        self.start_time = time.perf_counter() - (age or 0.0)
+        self.enabled = False
+        self.original_import = builtins.__import__
+        self.main_thread_id = threading.get_ident()
+        # time spent in imports nested inside the imports being timed
+        self.nested_times: List[float] = []
+        # module -> (self seconds, total seconds)
+        self.import_times: Dict[str, Tuple[float, float]] = {}
+        # (phase name, start, end) in seconds since the process started
+        self.phases: List[Tuple[str, float, float]] = []
+        if age is not None:
+            self.phases.append(("python startup", 0.0, age))
+        self.first_frame_time: Optional[float] = None
+
+    def now(self) -> float:
+        """Seconds since the process started"""
+        return time.perf_counter() - self.start_time
+
+    def enable(self) -> None:
+        """Start timing imports"""
+        self.enabled = True
+        builtins.__import__ = self._timed_import
+
+    def disable(self) -> None:
+        """Stop timing imports"""
+        self.enabled = False
+        if builtins.__import__ == self._timed_import:
+            builtins.__import__ = self.original_import
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # imports on other threads (e.g. listeners) would interleave with these
+        if threading.get_ident() != self.main_thread_id:
+            return self.original_import(name, globals, locals, fromlist, level)
+        modules_before = len(sys.modules)
+        if level:
+            package = globals.get("__package__") or globals["__name__"]
+            name = importlib.util.resolve_name("." * level + name, package)
+            level = 0
+        already_loaded = name in sys.modules
+        self.nested_times.append(0.0)
+        start_time = time.perf_counter()
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            total_time = time.perf_counter() - start_time
+            self_time = total_time - self.nested_times.pop()
+            if self.nested_times:
+                self.nested_times[-1] += total_time
+            if len(sys.modules) != modules_before:
+                # from package import submodule only loads the submodule
+                if already_loaded and fromlist:
+                    name = f"{name}.{fromlist[0]}"
+                previous_self_time, previous_total_time = self.import_times.get(
+                    name, (0.0, 0.0)
+                )
+                self.import_times[name] = (
+                    previous_self_time + self_time,
+                    previous_total_time + total_time,
+                )
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the with block as a phase of startup"""
+        start_time = self.now()
+        try:
+            yield
+        finally:
+            if self.enabled:
+                self.phases.append((name, start_time, self.now()))
+
+    def first_frame(self) -> None:
+        """The menu is on the panel, so startup is over. Prints the report if
+        tracing, only the first call counts"""
+        if self.first_frame_time is not None:
+            return
+        self.first_frame_time = self.now()
+        if self.enabled:
+            self.disable()
+            print(self.report(), flush=True)
+
+    def report(self) -> str:
+        """Phases, slowest imports, and the time to the first frame"""
+        lines = ["Startup trace (ms since the process started)"]
+        for name, start_time, end_time in self.phases:
+            lines.append(
+                f"  {name:<40} {start_time * 1000:7.1f} -> {end_time * 1000:7.1f}"
+                f"  ({(end_time - start_time) * 1000:.1f} ms)"
+            )
+        slowest_imports = sorted(
+            self.import_times.items(), key=lambda item: item[1][0], reverse=True
+        )[: self.IMPORTS_SHOWN]
+        lines.append(f"  {'slowest imports':<40}    self      total")
+        for name, (self_time, total_time) in slowest_imports:
+            lines.append(
+                f"    {name:<38} {self_time * 1000:7.1f} ms {total_time * 1000:7.1f} ms"
+            )
+        if self.first_frame_time is not None:
+            lines.append(f"  first menu frame at {self.first_frame_time * 1000:.1f} ms")
+        return "\n".join(lines)
+
+
+startup_trace = StartupTrace()
+if os.environ.get("MATRIX_STARTUP_TRACE", "0") != "0":
+    startup_trace.enable()